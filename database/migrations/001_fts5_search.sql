@@ -0,0 +1,93 @@
+-- 001: FTS5 full-text search indexes for the repositories' search() methods.
+-- Same tables and triggers as database/schema.sql, then index existing rows.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS student_fts USING fts5(
+    name, content='student', content_rowid='student_id', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS student_fts_insert AFTER INSERT ON student BEGIN
+    INSERT INTO student_fts(rowid, name) VALUES (new.student_id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS student_fts_delete AFTER DELETE ON student BEGIN
+    INSERT INTO student_fts(student_fts, rowid, name) VALUES ('delete', old.student_id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS student_fts_update AFTER UPDATE OF name ON student BEGIN
+    INSERT INTO student_fts(student_fts, rowid, name) VALUES ('delete', old.student_id, old.name);
+    INSERT INTO student_fts(rowid, name) VALUES (new.student_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS lecturer_fts USING fts5(
+    name, content='lecturer', content_rowid='lecturer_id', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS lecturer_fts_insert AFTER INSERT ON lecturer BEGIN
+    INSERT INTO lecturer_fts(rowid, name) VALUES (new.lecturer_id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS lecturer_fts_delete AFTER DELETE ON lecturer BEGIN
+    INSERT INTO lecturer_fts(lecturer_fts, rowid, name) VALUES ('delete', old.lecturer_id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS lecturer_fts_update AFTER UPDATE OF name ON lecturer BEGIN
+    INSERT INTO lecturer_fts(lecturer_fts, rowid, name) VALUES ('delete', old.lecturer_id, old.name);
+    INSERT INTO lecturer_fts(rowid, name) VALUES (new.lecturer_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS course_fts USING fts5(
+    course_code, name, content='course', content_rowid='course_id', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS course_fts_insert AFTER INSERT ON course BEGIN
+    INSERT INTO course_fts(rowid, course_code, name) VALUES (new.course_id, new.course_code, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS course_fts_delete AFTER DELETE ON course BEGIN
+    INSERT INTO course_fts(course_fts, rowid, course_code, name) VALUES ('delete', old.course_id, old.course_code, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS course_fts_update AFTER UPDATE OF course_code, name ON course BEGIN
+    INSERT INTO course_fts(course_fts, rowid, course_code, name) VALUES ('delete', old.course_id, old.course_code, old.name);
+    INSERT INTO course_fts(rowid, course_code, name) VALUES (new.course_id, new.course_code, new.name);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS department_fts USING fts5(
+    name, content='department', content_rowid='dept_id', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS department_fts_insert AFTER INSERT ON department BEGIN
+    INSERT INTO department_fts(rowid, name) VALUES (new.dept_id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS department_fts_delete AFTER DELETE ON department BEGIN
+    INSERT INTO department_fts(department_fts, rowid, name) VALUES ('delete', old.dept_id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS department_fts_update AFTER UPDATE OF name ON department BEGIN
+    INSERT INTO department_fts(department_fts, rowid, name) VALUES ('delete', old.dept_id, old.name);
+    INSERT INTO department_fts(rowid, name) VALUES (new.dept_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS non_academic_staff_fts USING fts5(
+    name, content='non_academic_staff', content_rowid='staff_id', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS non_academic_staff_fts_insert AFTER INSERT ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_fts(rowid, name) VALUES (new.staff_id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS non_academic_staff_fts_delete AFTER DELETE ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_fts(non_academic_staff_fts, rowid, name) VALUES ('delete', old.staff_id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS non_academic_staff_fts_update AFTER UPDATE OF name ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_fts(non_academic_staff_fts, rowid, name) VALUES ('delete', old.staff_id, old.name);
+    INSERT INTO non_academic_staff_fts(rowid, name) VALUES (new.staff_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS research_project_fts USING fts5(
+    title, content='research_project', content_rowid='project_id', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS research_project_fts_insert AFTER INSERT ON research_project BEGIN
+    INSERT INTO research_project_fts(rowid, title) VALUES (new.project_id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS research_project_fts_delete AFTER DELETE ON research_project BEGIN
+    INSERT INTO research_project_fts(research_project_fts, rowid, title) VALUES ('delete', old.project_id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS research_project_fts_update AFTER UPDATE OF title ON research_project BEGIN
+    INSERT INTO research_project_fts(research_project_fts, rowid, title) VALUES ('delete', old.project_id, old.title);
+    INSERT INTO research_project_fts(rowid, title) VALUES (new.project_id, new.title);
+END;
+
+INSERT INTO student_fts(student_fts) VALUES ('rebuild');
+INSERT INTO lecturer_fts(lecturer_fts) VALUES ('rebuild');
+INSERT INTO course_fts(course_fts) VALUES ('rebuild');
+INSERT INTO department_fts(department_fts) VALUES ('rebuild');
+INSERT INTO non_academic_staff_fts(non_academic_staff_fts) VALUES ('rebuild');
+INSERT INTO research_project_fts(research_project_fts) VALUES ('rebuild');
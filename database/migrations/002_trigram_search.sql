@@ -0,0 +1,108 @@
+-- 002: FTS5 trigram indexes for substring search.
+-- Same tables and triggers as database/schema.sql, then index existing rows.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS student_trigram USING fts5(
+    name, content='student', content_rowid='student_id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS student_trigram_insert AFTER INSERT ON student BEGIN
+    INSERT INTO student_trigram(rowid, name) VALUES (new.student_id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS student_trigram_delete AFTER DELETE ON student BEGIN
+    INSERT INTO student_trigram(student_trigram, rowid, name) VALUES ('delete', old.student_id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS student_trigram_update AFTER UPDATE OF name ON student BEGIN
+    INSERT INTO student_trigram(student_trigram, rowid, name) VALUES ('delete', old.student_id, old.name);
+    INSERT INTO student_trigram(rowid, name) VALUES (new.student_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS lecturer_trigram USING fts5(
+    name, content='lecturer', content_rowid='lecturer_id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS lecturer_trigram_insert AFTER INSERT ON lecturer BEGIN
+    INSERT INTO lecturer_trigram(rowid, name) VALUES (new.lecturer_id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS lecturer_trigram_delete AFTER DELETE ON lecturer BEGIN
+    INSERT INTO lecturer_trigram(lecturer_trigram, rowid, name) VALUES ('delete', old.lecturer_id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS lecturer_trigram_update AFTER UPDATE OF name ON lecturer BEGIN
+    INSERT INTO lecturer_trigram(lecturer_trigram, rowid, name) VALUES ('delete', old.lecturer_id, old.name);
+    INSERT INTO lecturer_trigram(rowid, name) VALUES (new.lecturer_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS course_trigram USING fts5(
+    course_code, name, content='course', content_rowid='course_id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS course_trigram_insert AFTER INSERT ON course BEGIN
+    INSERT INTO course_trigram(rowid, course_code, name) VALUES (new.course_id, new.course_code, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS course_trigram_delete AFTER DELETE ON course BEGIN
+    INSERT INTO course_trigram(course_trigram, rowid, course_code, name) VALUES ('delete', old.course_id, old.course_code, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS course_trigram_update AFTER UPDATE OF course_code, name ON course BEGIN
+    INSERT INTO course_trigram(course_trigram, rowid, course_code, name) VALUES ('delete', old.course_id, old.course_code, old.name);
+    INSERT INTO course_trigram(rowid, course_code, name) VALUES (new.course_id, new.course_code, new.name);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS department_trigram USING fts5(
+    name, content='department', content_rowid='dept_id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS department_trigram_insert AFTER INSERT ON department BEGIN
+    INSERT INTO department_trigram(rowid, name) VALUES (new.dept_id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS department_trigram_delete AFTER DELETE ON department BEGIN
+    INSERT INTO department_trigram(department_trigram, rowid, name) VALUES ('delete', old.dept_id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS department_trigram_update AFTER UPDATE OF name ON department BEGIN
+    INSERT INTO department_trigram(department_trigram, rowid, name) VALUES ('delete', old.dept_id, old.name);
+    INSERT INTO department_trigram(rowid, name) VALUES (new.dept_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS non_academic_staff_trigram USING fts5(
+    name, job_title, content='non_academic_staff', content_rowid='staff_id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS non_academic_staff_trigram_insert AFTER INSERT ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_trigram(rowid, name, job_title) VALUES (new.staff_id, new.name, new.job_title);
+END;
+CREATE TRIGGER IF NOT EXISTS non_academic_staff_trigram_delete AFTER DELETE ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_trigram(non_academic_staff_trigram, rowid, name, job_title) VALUES ('delete', old.staff_id, old.name, old.job_title);
+END;
+CREATE TRIGGER IF NOT EXISTS non_academic_staff_trigram_update AFTER UPDATE OF name, job_title ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_trigram(non_academic_staff_trigram, rowid, name, job_title) VALUES ('delete', old.staff_id, old.name, old.job_title);
+    INSERT INTO non_academic_staff_trigram(rowid, name, job_title) VALUES (new.staff_id, new.name, new.job_title);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS research_project_trigram USING fts5(
+    title, content='research_project', content_rowid='project_id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS research_project_trigram_insert AFTER INSERT ON research_project BEGIN
+    INSERT INTO research_project_trigram(rowid, title) VALUES (new.project_id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS research_project_trigram_delete AFTER DELETE ON research_project BEGIN
+    INSERT INTO research_project_trigram(research_project_trigram, rowid, title) VALUES ('delete', old.project_id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS research_project_trigram_update AFTER UPDATE OF title ON research_project BEGIN
+    INSERT INTO research_project_trigram(research_project_trigram, rowid, title) VALUES ('delete', old.project_id, old.title);
+    INSERT INTO research_project_trigram(rowid, title) VALUES (new.project_id, new.title);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS lecturer_expertise_trigram USING fts5(
+    area, content='lecturer_expertise', content_rowid='expertise_id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS lecturer_expertise_trigram_insert AFTER INSERT ON lecturer_expertise BEGIN
+    INSERT INTO lecturer_expertise_trigram(rowid, area) VALUES (new.expertise_id, new.area);
+END;
+CREATE TRIGGER IF NOT EXISTS lecturer_expertise_trigram_delete AFTER DELETE ON lecturer_expertise BEGIN
+    INSERT INTO lecturer_expertise_trigram(lecturer_expertise_trigram, rowid, area) VALUES ('delete', old.expertise_id, old.area);
+END;
+CREATE TRIGGER IF NOT EXISTS lecturer_expertise_trigram_update AFTER UPDATE OF area ON lecturer_expertise BEGIN
+    INSERT INTO lecturer_expertise_trigram(lecturer_expertise_trigram, rowid, area) VALUES ('delete', old.expertise_id, old.area);
+    INSERT INTO lecturer_expertise_trigram(rowid, area) VALUES (new.expertise_id, new.area);
+END;
+
+INSERT INTO student_trigram(student_trigram) VALUES ('rebuild');
+INSERT INTO lecturer_trigram(lecturer_trigram) VALUES ('rebuild');
+INSERT INTO course_trigram(course_trigram) VALUES ('rebuild');
+INSERT INTO department_trigram(department_trigram) VALUES ('rebuild');
+INSERT INTO non_academic_staff_trigram(non_academic_staff_trigram) VALUES ('rebuild');
+INSERT INTO research_project_trigram(research_project_trigram) VALUES ('rebuild');
+INSERT INTO lecturer_expertise_trigram(lecturer_expertise_trigram) VALUES ('rebuild');
@@ -0,0 +1,5 @@
+-- 003: Index research project members by student, for project lookups by
+-- student (the primary key only covers lookups by project).
+
+CREATE INDEX IF NOT EXISTS idx_research_project_member_student
+    ON research_project_member(student_id);
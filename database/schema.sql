@@ -2,6 +2,19 @@
 -- CSCK542 Databases and Information Systems
 
 -- Drop existing tables
+DROP TABLE IF EXISTS student_trigram;
+DROP TABLE IF EXISTS lecturer_trigram;
+DROP TABLE IF EXISTS course_trigram;
+DROP TABLE IF EXISTS department_trigram;
+DROP TABLE IF EXISTS non_academic_staff_trigram;
+DROP TABLE IF EXISTS research_project_trigram;
+DROP TABLE IF EXISTS lecturer_expertise_trigram;
+DROP TABLE IF EXISTS student_fts;
+DROP TABLE IF EXISTS lecturer_fts;
+DROP TABLE IF EXISTS course_fts;
+DROP TABLE IF EXISTS department_fts;
+DROP TABLE IF EXISTS non_academic_staff_fts;
+DROP TABLE IF EXISTS research_project_fts;
 DROP TABLE IF EXISTS research_project_member;
 DROP TABLE IF EXISTS programme_course;
 DROP TABLE IF EXISTS course_prerequisite;
@@ -243,3 +256,196 @@ CREATE INDEX idx_student_grade_student ON student_grade(student_id);
 CREATE INDEX idx_student_grade_course ON student_grade(course_id);
 CREATE INDEX idx_publication_lecturer ON publication(lecturer_id);
 CREATE INDEX idx_research_project_dept ON research_project(dept_id);
+CREATE INDEX idx_research_project_member_student ON research_project_member(student_id);
+
+-- Full-text search indexes backing the repositories' search() methods.
+-- External-content FTS5 tables store only the index; triggers keep them in
+-- sync with the base tables.
+
+CREATE VIRTUAL TABLE student_fts USING fts5(
+    name, content='student', content_rowid='student_id', prefix='2 3'
+);
+CREATE TRIGGER student_fts_insert AFTER INSERT ON student BEGIN
+    INSERT INTO student_fts(rowid, name) VALUES (new.student_id, new.name);
+END;
+CREATE TRIGGER student_fts_delete AFTER DELETE ON student BEGIN
+    INSERT INTO student_fts(student_fts, rowid, name) VALUES ('delete', old.student_id, old.name);
+END;
+CREATE TRIGGER student_fts_update AFTER UPDATE OF name ON student BEGIN
+    INSERT INTO student_fts(student_fts, rowid, name) VALUES ('delete', old.student_id, old.name);
+    INSERT INTO student_fts(rowid, name) VALUES (new.student_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE lecturer_fts USING fts5(
+    name, content='lecturer', content_rowid='lecturer_id', prefix='2 3'
+);
+CREATE TRIGGER lecturer_fts_insert AFTER INSERT ON lecturer BEGIN
+    INSERT INTO lecturer_fts(rowid, name) VALUES (new.lecturer_id, new.name);
+END;
+CREATE TRIGGER lecturer_fts_delete AFTER DELETE ON lecturer BEGIN
+    INSERT INTO lecturer_fts(lecturer_fts, rowid, name) VALUES ('delete', old.lecturer_id, old.name);
+END;
+CREATE TRIGGER lecturer_fts_update AFTER UPDATE OF name ON lecturer BEGIN
+    INSERT INTO lecturer_fts(lecturer_fts, rowid, name) VALUES ('delete', old.lecturer_id, old.name);
+    INSERT INTO lecturer_fts(rowid, name) VALUES (new.lecturer_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE course_fts USING fts5(
+    course_code, name, content='course', content_rowid='course_id', prefix='2 3'
+);
+CREATE TRIGGER course_fts_insert AFTER INSERT ON course BEGIN
+    INSERT INTO course_fts(rowid, course_code, name) VALUES (new.course_id, new.course_code, new.name);
+END;
+CREATE TRIGGER course_fts_delete AFTER DELETE ON course BEGIN
+    INSERT INTO course_fts(course_fts, rowid, course_code, name) VALUES ('delete', old.course_id, old.course_code, old.name);
+END;
+CREATE TRIGGER course_fts_update AFTER UPDATE OF course_code, name ON course BEGIN
+    INSERT INTO course_fts(course_fts, rowid, course_code, name) VALUES ('delete', old.course_id, old.course_code, old.name);
+    INSERT INTO course_fts(rowid, course_code, name) VALUES (new.course_id, new.course_code, new.name);
+END;
+
+CREATE VIRTUAL TABLE department_fts USING fts5(
+    name, content='department', content_rowid='dept_id', prefix='2 3'
+);
+CREATE TRIGGER department_fts_insert AFTER INSERT ON department BEGIN
+    INSERT INTO department_fts(rowid, name) VALUES (new.dept_id, new.name);
+END;
+CREATE TRIGGER department_fts_delete AFTER DELETE ON department BEGIN
+    INSERT INTO department_fts(department_fts, rowid, name) VALUES ('delete', old.dept_id, old.name);
+END;
+CREATE TRIGGER department_fts_update AFTER UPDATE OF name ON department BEGIN
+    INSERT INTO department_fts(department_fts, rowid, name) VALUES ('delete', old.dept_id, old.name);
+    INSERT INTO department_fts(rowid, name) VALUES (new.dept_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE non_academic_staff_fts USING fts5(
+    name, content='non_academic_staff', content_rowid='staff_id', prefix='2 3'
+);
+CREATE TRIGGER non_academic_staff_fts_insert AFTER INSERT ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_fts(rowid, name) VALUES (new.staff_id, new.name);
+END;
+CREATE TRIGGER non_academic_staff_fts_delete AFTER DELETE ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_fts(non_academic_staff_fts, rowid, name) VALUES ('delete', old.staff_id, old.name);
+END;
+CREATE TRIGGER non_academic_staff_fts_update AFTER UPDATE OF name ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_fts(non_academic_staff_fts, rowid, name) VALUES ('delete', old.staff_id, old.name);
+    INSERT INTO non_academic_staff_fts(rowid, name) VALUES (new.staff_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE research_project_fts USING fts5(
+    title, content='research_project', content_rowid='project_id', prefix='2 3'
+);
+CREATE TRIGGER research_project_fts_insert AFTER INSERT ON research_project BEGIN
+    INSERT INTO research_project_fts(rowid, title) VALUES (new.project_id, new.title);
+END;
+CREATE TRIGGER research_project_fts_delete AFTER DELETE ON research_project BEGIN
+    INSERT INTO research_project_fts(research_project_fts, rowid, title) VALUES ('delete', old.project_id, old.title);
+END;
+CREATE TRIGGER research_project_fts_update AFTER UPDATE OF title ON research_project BEGIN
+    INSERT INTO research_project_fts(research_project_fts, rowid, title) VALUES ('delete', old.project_id, old.title);
+    INSERT INTO research_project_fts(rowid, title) VALUES (new.project_id, new.title);
+END;
+
+-- Trigram indexes for substring (infix) matching: search(mode="substring"),
+-- get_by_expertise and get_by_job_title. Requires SQLite 3.34+.
+
+CREATE VIRTUAL TABLE student_trigram USING fts5(
+    name, content='student', content_rowid='student_id', tokenize='trigram'
+);
+CREATE TRIGGER student_trigram_insert AFTER INSERT ON student BEGIN
+    INSERT INTO student_trigram(rowid, name) VALUES (new.student_id, new.name);
+END;
+CREATE TRIGGER student_trigram_delete AFTER DELETE ON student BEGIN
+    INSERT INTO student_trigram(student_trigram, rowid, name) VALUES ('delete', old.student_id, old.name);
+END;
+CREATE TRIGGER student_trigram_update AFTER UPDATE OF name ON student BEGIN
+    INSERT INTO student_trigram(student_trigram, rowid, name) VALUES ('delete', old.student_id, old.name);
+    INSERT INTO student_trigram(rowid, name) VALUES (new.student_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE lecturer_trigram USING fts5(
+    name, content='lecturer', content_rowid='lecturer_id', tokenize='trigram'
+);
+CREATE TRIGGER lecturer_trigram_insert AFTER INSERT ON lecturer BEGIN
+    INSERT INTO lecturer_trigram(rowid, name) VALUES (new.lecturer_id, new.name);
+END;
+CREATE TRIGGER lecturer_trigram_delete AFTER DELETE ON lecturer BEGIN
+    INSERT INTO lecturer_trigram(lecturer_trigram, rowid, name) VALUES ('delete', old.lecturer_id, old.name);
+END;
+CREATE TRIGGER lecturer_trigram_update AFTER UPDATE OF name ON lecturer BEGIN
+    INSERT INTO lecturer_trigram(lecturer_trigram, rowid, name) VALUES ('delete', old.lecturer_id, old.name);
+    INSERT INTO lecturer_trigram(rowid, name) VALUES (new.lecturer_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE course_trigram USING fts5(
+    course_code, name, content='course', content_rowid='course_id', tokenize='trigram'
+);
+CREATE TRIGGER course_trigram_insert AFTER INSERT ON course BEGIN
+    INSERT INTO course_trigram(rowid, course_code, name) VALUES (new.course_id, new.course_code, new.name);
+END;
+CREATE TRIGGER course_trigram_delete AFTER DELETE ON course BEGIN
+    INSERT INTO course_trigram(course_trigram, rowid, course_code, name) VALUES ('delete', old.course_id, old.course_code, old.name);
+END;
+CREATE TRIGGER course_trigram_update AFTER UPDATE OF course_code, name ON course BEGIN
+    INSERT INTO course_trigram(course_trigram, rowid, course_code, name) VALUES ('delete', old.course_id, old.course_code, old.name);
+    INSERT INTO course_trigram(rowid, course_code, name) VALUES (new.course_id, new.course_code, new.name);
+END;
+
+CREATE VIRTUAL TABLE department_trigram USING fts5(
+    name, content='department', content_rowid='dept_id', tokenize='trigram'
+);
+CREATE TRIGGER department_trigram_insert AFTER INSERT ON department BEGIN
+    INSERT INTO department_trigram(rowid, name) VALUES (new.dept_id, new.name);
+END;
+CREATE TRIGGER department_trigram_delete AFTER DELETE ON department BEGIN
+    INSERT INTO department_trigram(department_trigram, rowid, name) VALUES ('delete', old.dept_id, old.name);
+END;
+CREATE TRIGGER department_trigram_update AFTER UPDATE OF name ON department BEGIN
+    INSERT INTO department_trigram(department_trigram, rowid, name) VALUES ('delete', old.dept_id, old.name);
+    INSERT INTO department_trigram(rowid, name) VALUES (new.dept_id, new.name);
+END;
+
+CREATE VIRTUAL TABLE non_academic_staff_trigram USING fts5(
+    name, job_title, content='non_academic_staff', content_rowid='staff_id', tokenize='trigram'
+);
+CREATE TRIGGER non_academic_staff_trigram_insert AFTER INSERT ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_trigram(rowid, name, job_title) VALUES (new.staff_id, new.name, new.job_title);
+END;
+CREATE TRIGGER non_academic_staff_trigram_delete AFTER DELETE ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_trigram(non_academic_staff_trigram, rowid, name, job_title) VALUES ('delete', old.staff_id, old.name, old.job_title);
+END;
+CREATE TRIGGER non_academic_staff_trigram_update AFTER UPDATE OF name, job_title ON non_academic_staff BEGIN
+    INSERT INTO non_academic_staff_trigram(non_academic_staff_trigram, rowid, name, job_title) VALUES ('delete', old.staff_id, old.name, old.job_title);
+    INSERT INTO non_academic_staff_trigram(rowid, name, job_title) VALUES (new.staff_id, new.name, new.job_title);
+END;
+
+CREATE VIRTUAL TABLE research_project_trigram USING fts5(
+    title, content='research_project', content_rowid='project_id', tokenize='trigram'
+);
+CREATE TRIGGER research_project_trigram_insert AFTER INSERT ON research_project BEGIN
+    INSERT INTO research_project_trigram(rowid, title) VALUES (new.project_id, new.title);
+END;
+CREATE TRIGGER research_project_trigram_delete AFTER DELETE ON research_project BEGIN
+    INSERT INTO research_project_trigram(research_project_trigram, rowid, title) VALUES ('delete', old.project_id, old.title);
+END;
+CREATE TRIGGER research_project_trigram_update AFTER UPDATE OF title ON research_project BEGIN
+    INSERT INTO research_project_trigram(research_project_trigram, rowid, title) VALUES ('delete', old.project_id, old.title);
+    INSERT INTO research_project_trigram(rowid, title) VALUES (new.project_id, new.title);
+END;
+
+CREATE VIRTUAL TABLE lecturer_expertise_trigram USING fts5(
+    area, content='lecturer_expertise', content_rowid='expertise_id', tokenize='trigram'
+);
+CREATE TRIGGER lecturer_expertise_trigram_insert AFTER INSERT ON lecturer_expertise BEGIN
+    INSERT INTO lecturer_expertise_trigram(rowid, area) VALUES (new.expertise_id, new.area);
+END;
+CREATE TRIGGER lecturer_expertise_trigram_delete AFTER DELETE ON lecturer_expertise BEGIN
+    INSERT INTO lecturer_expertise_trigram(lecturer_expertise_trigram, rowid, area) VALUES ('delete', old.expertise_id, old.area);
+END;
+CREATE TRIGGER lecturer_expertise_trigram_update AFTER UPDATE OF area ON lecturer_expertise BEGIN
+    INSERT INTO lecturer_expertise_trigram(lecturer_expertise_trigram, rowid, area) VALUES ('delete', old.expertise_id, old.area);
+    INSERT INTO lecturer_expertise_trigram(rowid, area) VALUES (new.expertise_id, new.area);
+END;
+
+-- Schema version; database/migrations/*.sql upgrade older databases
+PRAGMA user_version = 3;
@@ -1,8 +1,20 @@
 from nicegui import app, ui
 import pandas as pd
 
-from src.database import encrypt_database, get_engine
-from src.models import Base
+from src.database import (
+    Checkpointer,
+    async_session_scope,
+    dispose_async_engine,
+    encrypt_database,
+    get_engine,
+)
+from src.models import Base, Course, Publication, Student
+from src.repositories import (
+    AsyncCourseRepository,
+    AsyncDepartmentRepository,
+    AsyncLecturerRepository,
+    AsyncStudentRepository,
+)
 from src.services import APIService
 
 
@@ -14,44 +26,40 @@ if  __name__ == '__main__':
     init_database()
 
 api = APIService()
+checkpointer = Checkpointer()
 
 
-def _shutdown_cleanup() -> None:
-    """Clean up on application shutdown - close API and encrypt database."""
+async def _shutdown_cleanup() -> None:
+    """Clean up on application shutdown - stop checkpoints, close API and encrypt database."""
+    checkpointer.stop()
     api.close()
+    await dispose_async_engine()
     encrypt_database()
 
 
+app.on_startup(checkpointer.start)
 app.on_shutdown(_shutdown_cleanup)
 
-# Load all data from repositories
+# Load all data from repositories straight into typed DataFrame columns (no ORM objects)
+all_students_df = api.student_repo.to_dataframe()
 
-students = api.student_repo.get_all()
-all_students_df = pd.DataFrame([student.as_dict for student in students])
+all_lecturers_df = api.lecturer_repo.to_dataframe()
 
-lecturers = api.lecturer_repo.get_all()
-all_lecturers_df = pd.DataFrame([lecturer.as_dict for lecturer in lecturers])
+all_staff_df = api.staff_repo.to_dataframe()
 
-staff = api.staff_repo.get_all()
-all_staff_df = pd.DataFrame([staff.as_dict for staff in staff])
+all_courses_df = api.course_repo.to_dataframe()
 
-courses = api.course_repo.get_all()
-all_courses_df = pd.DataFrame([course.as_dict for course in courses])
+all_departments_df = api.department_repo.to_dataframe()
 
-departments = api.department_repo.get_all()
-all_departments_df = pd.DataFrame([department.as_dict for department in departments])
+all_projects_df = api.research_project_repo.to_dataframe()
 
-research_projects = api.research_project_repo.get_all()
-all_projects_df = pd.DataFrame([rp.as_dict for rp in research_projects])
-
-programmes = api.programme_repo.get_all()
-all_programmes_df = pd.DataFrame([prog.as_dict for prog in programmes])
+all_programmes_df = api.programme_repo.to_dataframe()
 
 # Load publications data - special case as publication data is stored in parent repositories
 all_publications = []
 for lecturer in api.lecturer_repo.get_all():
     pubs = api.lecturer_repo.get_publications(lecturer.lecturer_id)
-    all_publications.extend([pub.as_dict for pub in pubs])
+    all_publications.extend(Publication.to_records(pubs))
 all_publications_df = pd.DataFrame(all_publications) if all_publications else pd.DataFrame(columns=['publication_id', 'lecturer_id', 'title', 'journal', 'publication_date'])
 
 
@@ -72,6 +80,37 @@ def get_next_id(df, id_column):
         return 1
     return int(df[id_column].max())+1
 
+def dataframe_rows(df):
+    """
+        Converts an entity dataframe to table rows, with missing values (NaN/NA) as None
+        Arguments: entity dataframe
+        Returns: list of row dictionaries
+    """
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+def display_value(value):
+    """
+        Formats a dataframe cell for an input field, showing missing values as blank
+        Arguments: cell value
+        Returns: string
+    """
+    return '' if pd.isna(value) else str(value)
+
+def upsert_rows(df, rows, id_column):
+    """
+        Replaces or adds rows in an entity dataframe, keeping it in ID order and its column dtypes
+        Arguments: entity dataframe, dataframe of new/changed rows, entity id column
+        Returns: updated entity dataframe
+    """
+    df = df[~df[id_column].isin(rows[id_column])]
+    for col in df.columns:
+        # Categories must match for the concatenated column to stay categorical
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            categories = df[col].cat.categories.union(rows[col].cat.categories)
+            df[col] = df[col].cat.set_categories(categories)
+            rows[col] = rows[col].cat.set_categories(categories)
+    return pd.concat([df, rows]).sort_values(id_column, ignore_index=True)
+
 def validate_fields(data, id_column):
     """
         Validates that fields are not empty
@@ -182,7 +221,8 @@ class CRUDService:
         entity = self.repo.create(**data)
         api.commit()
 
-        self.df = pd.concat([self.df, pd.DataFrame([entity.as_dict])], ignore_index=True)
+        id_value = getattr(entity, self.id_column)
+        self.df = upsert_rows(self.df, self.repo.to_dataframe(filters={self.id_column: id_value}), self.id_column)
         self.update_table()
         self.refresh_dropdowns()
 
@@ -199,9 +239,7 @@ class CRUDService:
         entity = self.repo.update(id_value, **data)
         api.commit()
 
-        idx = self.df[self.df[self.id_column] == id_value].index[0]
-        for col, value in data.items():
-            self.df.at[idx, col] = type(self.df[col].iloc[0])(value)
+        self.df = upsert_rows(self.df, self.repo.to_dataframe(filters={self.id_column: id_value}), self.id_column)
         self.update_table()
         ui.notify(f'{self.entity_name} updated', type = 'positive')
 
@@ -213,7 +251,7 @@ class CRUDService:
             Arguments: self
             Returns: entity
         """
-        self.table_widget.rows = self.df.to_dict('records')
+        self.table_widget.rows = dataframe_rows(self.df)
         self.table_widget.update()
 
     def delete(self, id_value):
@@ -349,7 +387,7 @@ def create_edit_dialog(service):
                     inputs[col].options = {l.lecturer_id: f"{l.lecturer_id}: {l.name}" for l in available}
                     inputs[col].value = current_head
                 else:
-                    inputs[col].value = str(entity_row[col])
+                    inputs[col].value = display_value(entity_row[col])
 
             ui.notify(f'Loaded {service.entity_name} {id_int}', type='positive')
 
@@ -463,7 +501,7 @@ def create_delete_dialog(service):
 
             for col in service.get_df().columns:
                 if col != service.id_column:
-                    inputs[col].value = str(entity_row[col])
+                    inputs[col].value = display_value(entity_row[col])
 
             ui.notify(f'Loaded {service.entity_name} {id_int}', type='positive')
 
@@ -548,7 +586,7 @@ def create_entity_panel(config):
 
         # Table
         columns = create_table_columns(config['df'])
-        rows = config['df'].to_dict(orient='records')
+        rows = dataframe_rows(config['df'])
 
         table = ui.table(
             columns=columns,
@@ -583,7 +621,7 @@ def create_entity_panel(config):
             filtered_df = filter_dataframe(config['df'], filters)
 
             # Update table
-            table.rows = filtered_df.to_dict('records')
+            table.rows = dataframe_rows(filtered_df)
             table.update()
 
             row_count = len(filtered_df)
@@ -601,7 +639,7 @@ def create_entity_panel(config):
                 inp.value = ''
 
             # Reset table to show all data
-            table.rows = config['df'].to_dict('records')
+            table.rows = dataframe_rows(config['df'])
             table.update()
             ui.notify('Filters cleared', type='info')
 
@@ -769,7 +807,7 @@ def index_page():
                         ).classes('w-full')
 
 
-                        def run_query_students_advised_by_lecturer():
+                        async def run_query_students_advised_by_lecturer():
                             """
                                 Runs query for students advised by selected lecturer
                                 Arguments: None
@@ -780,9 +818,10 @@ def index_page():
                                 return
 
                             lecturer_id = int(lecturer_select.value.split(':')[0])
-                            students = api.student_repo.get_by_advisor(lecturer_id)
+                            async with async_session_scope() as session:
+                                students = await AsyncStudentRepository(session).get_by_advisor(lecturer_id)
 
-                            query_students_advised_by_lecturer_result.rows = [s.as_dict for s in students]
+                            query_students_advised_by_lecturer_result.rows = Student.to_records(students)
                             query_students_advised_by_lecturer_result.update()
                             ui.notify(f'Found {len(students)} student(s)', type='positive')
 
@@ -812,7 +851,7 @@ def index_page():
                         ).classes('w-full')
 
 
-                        def query_courses_by_department():
+                        async def query_courses_by_department():
                             """
                                 Runs query for courses offered by selected department
                                 Arguments: None
@@ -823,9 +862,10 @@ def index_page():
                                 return
 
                             dept_id = int(dept_select.value.split(':')[0])
-                            courses = api.course_repo.get_by_department_lecturers(dept_id)
+                            async with async_session_scope() as session:
+                                courses = await AsyncCourseRepository(session).get_by_department_lecturers(dept_id)
 
-                            query_courses_by_department_result.rows = [c.as_dict for c in courses]
+                            query_courses_by_department_result.rows = Course.to_records(courses)
                             query_courses_by_department_result.update()
                             ui.notify(f'Found {len(courses)} course(s)', type='positive')
 
@@ -845,7 +885,7 @@ def index_page():
 
                         profile_container = ui.column().classes('w-full gap-4')
 
-                        def run_query_student_profile():
+                        async def run_query_student_profile():
                             """
                                 Runs a series of queries to gather a complete picture of a student's performance
                                 Arguments: None
@@ -856,40 +896,42 @@ def index_page():
                                 return
 
                             student_id = int(student_select_profile.value.split(':')[0])
-                            student = api.student_repo.get_by_id(student_id)
-
-                            # Clear previous profile
-                            profile_container.clear()
-
-                            with profile_container:
-                                # Basic Information Card
-                                with ui.card().classes('w-full'):
-                                    ui.label('Basic Information').classes('text-lg font-bold mb-2')
-                                    with ui.grid(columns=2).classes('w-full gap-2'):
-                                        ui.label('Student ID:').classes('font-semibold')
-                                        ui.label(str(student.student_id))
-
-                                        ui.label('Name:').classes('font-semibold')
-                                        ui.label(student.name)
-
-                                        ui.label('Date of Birth:').classes('font-semibold')
-                                        ui.label(student.date_of_birth or 'N/A')
-
-                                        ui.label('Contact Info:').classes('font-semibold')
-                                        ui.label(student.contact_info or 'N/A')
-
-                                        ui.label('Year of Study:').classes('font-semibold')
-                                        ui.label(str(student.year_of_study) if student.year_of_study else 'N/A')
-
-                                        ui.label('Graduation Status:').classes('font-semibold')
-                                        ui.label(student.graduation_status or 'N/A')
-
-                                # Programme Information Card
-                                with ui.card().classes('w-full'):
-                                    ui.label('Programme Information').classes('text-lg font-bold mb-2')
-                                    if student.programme_id:
-                                        try:
-                                            programme = api.programme_repo.get_by_id(student.programme_id)
+                            async with async_session_scope() as session:
+                                # Student, programme, advisor, grades, records and projects in one load
+                                profile = await AsyncStudentRepository(session).get_profile(student_id)
+                                student = profile.student
+
+                                # Clear previous profile
+                                profile_container.clear()
+
+                                with profile_container:
+                                    # Basic Information Card
+                                    with ui.card().classes('w-full'):
+                                        ui.label('Basic Information').classes('text-lg font-bold mb-2')
+                                        with ui.grid(columns=2).classes('w-full gap-2'):
+                                            ui.label('Student ID:').classes('font-semibold')
+                                            ui.label(str(student.student_id))
+
+                                            ui.label('Name:').classes('font-semibold')
+                                            ui.label(student.name)
+
+                                            ui.label('Date of Birth:').classes('font-semibold')
+                                            ui.label(student.date_of_birth or 'N/A')
+
+                                            ui.label('Contact Info:').classes('font-semibold')
+                                            ui.label(student.contact_info or 'N/A')
+
+                                            ui.label('Year of Study:').classes('font-semibold')
+                                            ui.label(str(student.year_of_study) if student.year_of_study else 'N/A')
+
+                                            ui.label('Graduation Status:').classes('font-semibold')
+                                            ui.label(student.graduation_status or 'N/A')
+
+                                    # Programme Information Card
+                                    with ui.card().classes('w-full'):
+                                        ui.label('Programme Information').classes('text-lg font-bold mb-2')
+                                        programme = profile.programme
+                                        if programme:
                                             with ui.grid(columns=2).classes('w-full gap-2'):
                                                 ui.label('Programme:').classes('font-semibold')
                                                 ui.label(programme.name)
@@ -903,166 +945,118 @@ def index_page():
 
                                                 ui.label('Enrolment Details:').classes('font-semibold')
                                                 ui.label(programme.enrolment_details or 'N/A')
-                                        except:
-                                            ui.label('Programme information not available')
-                                    else:
-                                        ui.label('No programme assigned')
-
-                                # Advisor Information Card
-                                with ui.card().classes('w-full'):
-                                    ui.label('Advisor Information').classes('text-lg font-bold mb-2')
-                                    if student.advisor_id:
-                                        try:
-                                            advisor = api.lecturer_repo.get_by_id(student.advisor_id)
+                                        else:
+                                            ui.label('No programme assigned')
+
+                                    # Advisor Information Card
+                                    with ui.card().classes('w-full'):
+                                        ui.label('Advisor Information').classes('text-lg font-bold mb-2')
+                                        advisor = profile.advisor
+                                        if advisor:
                                             with ui.grid(columns=2).classes('w-full gap-2'):
                                                 ui.label('Advisor:').classes('font-semibold')
                                                 ui.label(advisor.name)
 
-                                                if advisor.dept_id:
-                                                    try:
-                                                        dept = api.department_repo.get_by_id(advisor.dept_id)
-                                                        ui.label('Department:').classes('font-semibold')
-                                                        ui.label(dept.name)
-                                                    except:
-                                                        pass
-                                        except:
-                                            ui.label('Advisor information not available')
-                                    else:
-                                        ui.label('No advisor assigned')
-
-                                # Courses and Grades Card
-                                with ui.card().classes('w-full'):
-                                    ui.label('Courses and Grades').classes('text-lg font-bold mb-2')
-
-                                    # Get all grades for the student
-                                    grades = api.student_repo.get_grades(student_id)
-
-                                    if grades:
-                                        # Group grades by course
-                                        course_grades = {}
-                                        for grade in grades:
-                                            if grade.course_id not in course_grades:
-                                                course_grades[grade.course_id] = []
-                                            course_grades[grade.course_id].append(grade)
-
-                                        course_data = []
-                                        overall_grades = []
-
-                                        for course_id, grade_list in course_grades.items():
-                                            try:
-                                                course = api.course_repo.get_by_id(course_id)
-                                                grade_values = [g.grade for g in grade_list if g.grade is not None]
-
-                                                if grade_values:
-                                                    avg_grade = sum(grade_values) / len(grade_values)
-                                                    overall_grades.append(avg_grade)
-
-                                                    course_data.append({
-                                                        'course_code': course.course_code,
-                                                        'course_name': course.name,
-                                                        'num_assessments': len(grade_values),
-                                                        'average_grade': f"{avg_grade:.2f}%",
-                                                        'credits': course.credits or 'N/A'
-                                                    })
-                                            except:
-                                                pass
-
-                                        # Display overall average
-                                        if overall_grades:
-                                            overall_avg = sum(overall_grades) / len(overall_grades)
-                                            ui.label(f'Overall Average Grade: {overall_avg:.2f}%').classes(
-                                                'text-lg font-semibold text-blue-600 mb-3')
-
-                                        # Display course table
-                                        ui.table(
-                                            columns=[
-                                                {'name': 'course_code', 'label': 'Code', 'field': 'course_code',
-                                                 'sortable': True},
-                                                {'name': 'course_name', 'label': 'Course', 'field': 'course_name',
-                                                 'sortable': True},
-                                                {'name': 'num_assessments', 'label': 'Assessments',
-                                                 'field': 'num_assessments', 'sortable': True},
-                                                {'name': 'average_grade', 'label': 'Average',
-                                                 'field': 'average_grade', 'sortable': True},
-                                                {'name': 'credits', 'label': 'Credits', 'field': 'credits',
-                                                 'sortable': True},
-                                            ],
-                                            rows=course_data,
-                                            row_key='course_code'
-                                        ).classes('w-full')
-                                    else:
-                                        ui.label('No grades recorded')
-
-                                # Disciplinary Records Card
-                                with ui.card().classes('w-full'):
-                                    ui.label('Disciplinary Records').classes('text-lg font-bold mb-2')
-
-                                    disciplinary_records = api.student_repo.get_disciplinary_records(student_id)
-
-                                    if disciplinary_records:
-                                        records_data = [{
-                                            'incident_date': r.incident_date or 'N/A',
-                                            'description': r.description or 'N/A',
-                                            'action_taken': r.action_taken or 'N/A'
-                                        } for r in disciplinary_records]
-
-                                        ui.table(
-                                            columns=[
-                                                {'name': 'incident_date', 'label': 'Date', 'field': 'incident_date',
-                                                 'sortable': True},
-                                                {'name': 'description', 'label': 'Description',
-                                                 'field': 'description', 'sortable': True},
-                                                {'name': 'action_taken', 'label': 'Action Taken',
-                                                 'field': 'action_taken', 'sortable': True},
-                                            ],
-                                            rows=records_data,
-                                            row_key='incident_date'
-                                        ).classes('w-full')
-                                    else:
-                                        ui.label('No disciplinary records').classes('text-green-600')
-
-                                # Research Projects Card
-                                with ui.card().classes('w-full'):
-                                    ui.label('Research Projects').classes('text-lg font-bold mb-2')
-
-                                    # Get all projects and check if student is a member
-                                    all_projects = api.research_project_repo.get_all()
-                                    student_projects = []
-
-                                    for project in all_projects:
-                                        # Check if student is in this project
-                                        project_students = api.student_repo.get_by_research_project(
-                                            project.project_id)
-                                        if any(s.student_id == student_id for s in project_students):
-                                            try:
-                                                head_lecturer = api.lecturer_repo.get_by_id(
-                                                    project.head_lecturer_id)
-                                                student_projects.append({
-                                                    'title': project.title,
-                                                    'head_lecturer': head_lecturer.name,
-                                                    'start_date': project.start_date or 'N/A',
-                                                    'end_date': project.end_date or 'N/A'
-                                                })
-                                            except:
-                                                pass
-
-                                    if student_projects:
-                                        ui.table(
-                                            columns=[
-                                                {'name': 'title', 'label': 'Project Title', 'field': 'title',
-                                                 'sortable': True},
-                                                {'name': 'head_lecturer', 'label': 'Head Lecturer',
-                                                 'field': 'head_lecturer', 'sortable': True},
-                                                {'name': 'start_date', 'label': 'Start Date', 'field': 'start_date',
-                                                 'sortable': True},
-                                                {'name': 'end_date', 'label': 'End Date', 'field': 'end_date',
-                                                 'sortable': True},
-                                            ],
-                                            rows=student_projects,
-                                            row_key='title'
-                                        ).classes('w-full')
-                                    else:
-                                        ui.label('Not involved in any research projects')
+                                                if profile.advisor_department:
+                                                    ui.label('Department:').classes('font-semibold')
+                                                    ui.label(profile.advisor_department.name)
+                                        else:
+                                            ui.label('No advisor assigned')
+
+                                    # Courses and Grades Card
+                                    with ui.card().classes('w-full'):
+                                        ui.label('Courses and Grades').classes('text-lg font-bold mb-2')
+
+                                        if profile.grades:
+                                            course_data = [{
+                                                'course_code': result.course.course_code,
+                                                'course_name': result.course.name,
+                                                'num_assessments': result.assessments,
+                                                'average_grade': f"{result.average_grade:.2f}%",
+                                                'credits': result.course.credits or 'N/A'
+                                            } for result in profile.course_averages]
+
+                                            # Display overall average
+                                            if profile.overall_average is not None:
+                                                ui.label(f'Overall Average Grade: {profile.overall_average:.2f}%').classes(
+                                                    'text-lg font-semibold text-blue-600 mb-3')
+
+                                            # Display course table
+                                            ui.table(
+                                                columns=[
+                                                    {'name': 'course_code', 'label': 'Code', 'field': 'course_code',
+                                                     'sortable': True},
+                                                    {'name': 'course_name', 'label': 'Course', 'field': 'course_name',
+                                                     'sortable': True},
+                                                    {'name': 'num_assessments', 'label': 'Assessments',
+                                                     'field': 'num_assessments', 'sortable': True},
+                                                    {'name': 'average_grade', 'label': 'Average',
+                                                     'field': 'average_grade', 'sortable': True},
+                                                    {'name': 'credits', 'label': 'Credits', 'field': 'credits',
+                                                     'sortable': True},
+                                                ],
+                                                rows=course_data,
+                                                row_key='course_code'
+                                            ).classes('w-full')
+                                        else:
+                                            ui.label('No grades recorded')
+
+                                    # Disciplinary Records Card
+                                    with ui.card().classes('w-full'):
+                                        ui.label('Disciplinary Records').classes('text-lg font-bold mb-2')
+
+                                        disciplinary_records = profile.disciplinary_records
+
+                                        if disciplinary_records:
+                                            records_data = [{
+                                                'incident_date': r.incident_date or 'N/A',
+                                                'description': r.description or 'N/A',
+                                                'action_taken': r.action_taken or 'N/A'
+                                            } for r in disciplinary_records]
+
+                                            ui.table(
+                                                columns=[
+                                                    {'name': 'incident_date', 'label': 'Date', 'field': 'incident_date',
+                                                     'sortable': True},
+                                                    {'name': 'description', 'label': 'Description',
+                                                     'field': 'description', 'sortable': True},
+                                                    {'name': 'action_taken', 'label': 'Action Taken',
+                                                     'field': 'action_taken', 'sortable': True},
+                                                ],
+                                                rows=records_data,
+                                                row_key='incident_date'
+                                            ).classes('w-full')
+                                        else:
+                                            ui.label('No disciplinary records').classes('text-green-600')
+
+                                    # Research Projects Card
+                                    with ui.card().classes('w-full'):
+                                        ui.label('Research Projects').classes('text-lg font-bold mb-2')
+
+                                        student_projects = [{
+                                            'title': project.title,
+                                            'head_lecturer': project.head_lecturer.name,
+                                            'start_date': project.start_date or 'N/A',
+                                            'end_date': project.end_date or 'N/A'
+                                        } for project in profile.research_projects]
+
+                                        if student_projects:
+                                            ui.table(
+                                                columns=[
+                                                    {'name': 'title', 'label': 'Project Title', 'field': 'title',
+                                                     'sortable': True},
+                                                    {'name': 'head_lecturer', 'label': 'Head Lecturer',
+                                                     'field': 'head_lecturer', 'sortable': True},
+                                                    {'name': 'start_date', 'label': 'Start Date', 'field': 'start_date',
+                                                     'sortable': True},
+                                                    {'name': 'end_date', 'label': 'End Date', 'field': 'end_date',
+                                                     'sortable': True},
+                                                ],
+                                                rows=student_projects,
+                                                row_key='title'
+                                            ).classes('w-full')
+                                        else:
+                                            ui.label('Not involved in any research projects')
 
                             ui.notify('Student profile loaded', type='positive')
 
@@ -1081,7 +1075,7 @@ def index_page():
                         publications_container = ui.column().classes('w-full gap-4')
 
 
-                        def run_query_publications():
+                        async def run_query_publications():
                             """
                                 Runs a series of queries to gather a complete picture of a lecturer's publications.
                                 Arguments: None
@@ -1092,68 +1086,71 @@ def index_page():
                                 return
 
                             lecturer_id = int(lecturer_select_pubs.value.split(':')[0])
-                            lecturer = api.lecturer_repo.get_by_id(lecturer_id)
-                            publications = api.lecturer_repo.get_publications(lecturer_id)
-
-                            # Clear previous content
-                            publications_container.clear()
-
-                            with publications_container:
-                                # Lecturer Info Card
-                                with ui.card().classes('w-full'):
-                                    ui.label(f'{lecturer.name}').classes('text-xl font-bold mb-2')
-                                    with ui.grid(columns=2).classes('w-full gap-2'):
-                                        ui.label('Lecturer ID:').classes('font-semibold')
-                                        ui.label(str(lecturer.lecturer_id))
-
-                                        if lecturer.dept_id:
-                                            try:
-                                                dept = api.department_repo.get_by_id(lecturer.dept_id)
-                                                ui.label('Department:').classes('font-semibold')
-                                                ui.label(dept.name)
-                                            except:
-                                                pass
-
-                                        ui.label('Course Load:').classes('font-semibold')
-                                        ui.label(str(lecturer.course_load) if lecturer.course_load else 'N/A')
-
-                                        ui.label('Total Publications:').classes('font-semibold')
-                                        ui.label(str(len(publications))).classes('text-blue-600 font-bold')
-
-                                # Publications Card
-                                with ui.card().classes('w-full'):
-                                    ui.label('Publications').classes('text-lg font-bold mb-2')
-
-                                    if publications:
-                                        # Create table data
-                                        pubs_data = []
-                                        for pub in publications:
-                                            pubs_data.append({
-                                                'title': pub.title,
-                                                'journal': pub.journal or 'N/A',
-                                                'publication_date': pub.publication_date or 'N/A',
-                                                'publication_id': pub.publication_id
-                                            })
-
-                                        # Sort by date (most recent first)
-                                        pubs_data.sort(
-                                            key=lambda x: x['publication_date'] if x['publication_date'] != 'N/A' else '',
-                                            reverse=True)
-
-                                        ui.table(
-                                            columns=[
-                                                {'name': 'title', 'label': 'Title', 'field': 'title', 'sortable': True,
-                                                 'align': 'left'},
-                                                {'name': 'journal', 'label': 'Journal', 'field': 'journal',
-                                                 'sortable': True, 'align': 'left'},
-                                                {'name': 'publication_date', 'label': 'Publication Date',
-                                                 'field': 'publication_date', 'sortable': True, 'align': 'left'},
-                                            ],
-                                            rows=pubs_data,
-                                            row_key='publication_id'
-                                        ).classes('w-full').props('dense flat bordered')
-                                    else:
-                                        ui.label('No publications recorded').classes('text-gray-500')
+                            async with async_session_scope() as session:
+                                lecturer_repo = AsyncLecturerRepository(session)
+                                department_repo = AsyncDepartmentRepository(session)
+                                lecturer = await lecturer_repo.get_by_id(lecturer_id)
+                                publications = await lecturer_repo.get_publications(lecturer_id)
+
+                                # Clear previous content
+                                publications_container.clear()
+
+                                with publications_container:
+                                    # Lecturer Info Card
+                                    with ui.card().classes('w-full'):
+                                        ui.label(f'{lecturer.name}').classes('text-xl font-bold mb-2')
+                                        with ui.grid(columns=2).classes('w-full gap-2'):
+                                            ui.label('Lecturer ID:').classes('font-semibold')
+                                            ui.label(str(lecturer.lecturer_id))
+
+                                            if lecturer.dept_id:
+                                                try:
+                                                    dept = await department_repo.get_by_id(lecturer.dept_id)
+                                                    ui.label('Department:').classes('font-semibold')
+                                                    ui.label(dept.name)
+                                                except:
+                                                    pass
+
+                                            ui.label('Course Load:').classes('font-semibold')
+                                            ui.label(str(lecturer.course_load) if lecturer.course_load else 'N/A')
+
+                                            ui.label('Total Publications:').classes('font-semibold')
+                                            ui.label(str(len(publications))).classes('text-blue-600 font-bold')
+
+                                    # Publications Card
+                                    with ui.card().classes('w-full'):
+                                        ui.label('Publications').classes('text-lg font-bold mb-2')
+
+                                        if publications:
+                                            # Create table data
+                                            pubs_data = []
+                                            for pub in publications:
+                                                pubs_data.append({
+                                                    'title': pub.title,
+                                                    'journal': pub.journal or 'N/A',
+                                                    'publication_date': pub.publication_date or 'N/A',
+                                                    'publication_id': pub.publication_id
+                                                })
+
+                                            # Sort by date (most recent first)
+                                            pubs_data.sort(
+                                                key=lambda x: x['publication_date'] if x['publication_date'] != 'N/A' else '',
+                                                reverse=True)
+
+                                            ui.table(
+                                                columns=[
+                                                    {'name': 'title', 'label': 'Title', 'field': 'title', 'sortable': True,
+                                                     'align': 'left'},
+                                                    {'name': 'journal', 'label': 'Journal', 'field': 'journal',
+                                                     'sortable': True, 'align': 'left'},
+                                                    {'name': 'publication_date', 'label': 'Publication Date',
+                                                     'field': 'publication_date', 'sortable': True, 'align': 'left'},
+                                                ],
+                                                rows=pubs_data,
+                                                row_key='publication_id'
+                                            ).classes('w-full').props('dense flat bordered')
+                                        else:
+                                            ui.label('No publications recorded').classes('text-gray-500')
 
                             ui.notify(f'Found {len(publications)} publication(s)', type='positive')
 
@@ -1189,35 +1186,17 @@ def index_page():
                         ).classes('w-full')
 
 
-                        def run_query_high_performance():
+                        async def run_query_high_performance():
                             threshold = threshold_input.value
-                            all_students = api.student_repo.get_all()
-
-                            # Get programmes to determine final year
-                            programmes = {p.programme_id: p for p in api.programme_repo.get_all()}
-
-                            results = []
-                            for student in all_students:
-                                # Check if student is in final year
-                                if student.programme_id and student.year_of_study:
-                                    programme = programmes.get(student.programme_id)
-                                    if programme and programme.duration_years:
-                                        is_final_year = student.year_of_study == programme.duration_years
-                                    else:
-                                        # Assume 4 years if duration not specified
-                                        is_final_year = student.year_of_study == 4
-
-                                    if is_final_year:
-                                        # Calculate average grade
-                                        grades = api.student_repo.get_grades(student.student_id)
-                                        if grades:
-                                            grade_values = [g.grade for g in grades if g.grade is not None]
-                                            if grade_values:
-                                                avg_grade = sum(grade_values) / len(grade_values)
-                                                if avg_grade >= threshold:
-                                                    student_dict = student.as_dict
-                                                    student_dict['average_grade'] = f"{avg_grade:.2f}%"
-                                                    results.append(student_dict)
+                            async with async_session_scope() as session:
+                                students = await AsyncStudentRepository(
+                                    session
+                                ).get_high_performing_final_year(threshold)
+
+                            results = [
+                                {**student._asdict(), 'average_grade': f"{student.average_grade:.2f}%"}
+                                for student in students
+                            ]
 
                             query4_result.rows = results
                             query4_result.update()
@@ -0,0 +1,72 @@
+"""Benchmark database encryption throughput.
+
+Compares the legacy single-shot Fernet token against the chunked
+container format, both single-threaded and spread over a thread pool.
+
+Usage:
+    python scripts/benchmark_encryption.py [size_mb]
+"""
+
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import get_settings  # noqa: E402
+from src.database.encryption import (  # noqa: E402
+    SALT_SIZE,
+    KeyParams,
+    decrypt_stream,
+    derive_key,
+    encrypt_stream,
+    get_fernet,
+)
+
+
+def _timed(label: str, size_mb: int, func) -> object:  # noqa: ANN001
+    """Run ``func`` once and print wall-clock time and throughput."""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s {size_mb / elapsed:10.1f} MB/s")
+    return result
+
+
+def main() -> None:
+    """Encrypt and decrypt a random payload with each strategy."""
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    chunk_size = get_settings().encryption_chunk_size
+    workers = os.cpu_count() or 1
+    password = "benchmark"
+    payload = os.urandom(size_mb * 1024 * 1024)
+
+    print(f"Payload: {size_mb} MB, chunk size: {chunk_size} bytes, CPUs: {workers}\n")
+
+    fernet = get_fernet(password)
+    token = _timed("Fernet.encrypt (legacy)", size_mb, lambda: fernet.encrypt(payload))
+    _timed("Fernet.decrypt (legacy)", size_mb, lambda: fernet.decrypt(token))
+
+    params = KeyParams(salt=os.urandom(SALT_SIZE), iterations=get_settings().kdf_iterations)
+    key = derive_key(password, params)
+    for count in sorted({1, workers}):
+        container = io.BytesIO()
+        _timed(
+            f"Container encrypt ({count} worker(s))",
+            size_mb,
+            lambda: encrypt_stream(
+                io.BytesIO(payload), container, key, params, chunk_size, count
+            ),
+        )
+        container.seek(0)
+        _timed(
+            f"Container decrypt ({count} worker(s))",
+            size_mb,
+            lambda: decrypt_stream(container, io.BytesIO(), key, count),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark read and write throughput under each SQLite PRAGMA profile.
+
+Each profile gets a fresh database built from schema.sql, then runs:
+- single-row inserts, each in its own transaction (GUI-style commits)
+- one large batched insert transaction (import-style)
+- primary key lookups and full table scans
+
+Usage:
+    python scripts/benchmark_pragmas.py [rows]
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import PRAGMA_PROFILES  # noqa: E402
+from src.database.pragmas import apply_pragmas  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def _rate(count: int, elapsed: float) -> str:
+    """Format an operations-per-second figure."""
+    return f"{count / elapsed:>12,.0f}/s"
+
+
+def benchmark_profile(profile: str, db_path: Path, rows: int) -> dict[str, str]:
+    """Run the workload against ``db_path`` using ``profile``."""
+    connection = sqlite3.connect(db_path)
+    connection.executescript((PROJECT_ROOT / "database" / "schema.sql").read_text())
+    apply_pragmas(connection, profile)
+    connection.execute("INSERT INTO programme (name, duration_years) VALUES ('Bench', 3)")
+    connection.commit()
+    results = {}
+
+    commit_rows = max(rows // 20, 1)
+    start = time.perf_counter()
+    for i in range(commit_rows):
+        connection.execute(
+            "INSERT INTO student (programme_id, name, year_of_study) VALUES (1, ?, 1)",
+            (f"Student {i}",),
+        )
+        connection.commit()
+    results["insert+commit"] = _rate(commit_rows, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    connection.executemany(
+        "INSERT INTO student (programme_id, name, year_of_study) VALUES (1, ?, 2)",
+        ((f"Student {i}",) for i in range(rows)),
+    )
+    connection.commit()
+    results["batch insert"] = _rate(rows, time.perf_counter() - start)
+
+    total = commit_rows + rows
+    start = time.perf_counter()
+    for i in range(rows):
+        connection.execute(
+            "SELECT * FROM student WHERE student_id = ?", (i % total + 1,)
+        ).fetchone()
+    results["pk lookup"] = _rate(rows, time.perf_counter() - start)
+
+    scans = 20
+    start = time.perf_counter()
+    for _ in range(scans):
+        connection.execute("SELECT * FROM student ORDER BY name").fetchall()
+    results["full scan"] = _rate(scans * total, time.perf_counter() - start) + " rows"
+
+    connection.close()
+    return results
+
+
+def main() -> None:
+    """Benchmark every profile and print a comparison table."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results = {
+            profile: benchmark_profile(profile, Path(temp_dir) / f"{profile}.db", rows)
+            for profile in PRAGMA_PROFILES
+        }
+
+    metrics = list(next(iter(results.values())))
+    print(f"{'profile':<12}" + "".join(f"{metric:>22}" for metric in metrics))
+    for profile, values in results.items():
+        print(f"{profile:<12}" + "".join(f"{values[metric]:>22}" for metric in metrics))
+
+
+if __name__ == "__main__":
+    main()
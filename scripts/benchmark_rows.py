@@ -0,0 +1,91 @@
+"""Benchmark listing a large table as ORM entities, row records or columns.
+
+Builds a temporary database with ``rows`` students, then lists them with:
+- ``get_all()`` followed by ``as_dict``
+- ``get_all_rows()`` (named tuple records)
+- ``iter_rows()`` (records streamed in batches, counted without keeping them)
+- a DataFrame built from ``as_dict`` (what the GUI tables did) versus
+  ``to_dataframe()`` (rows streamed into typed columns)
+
+Each run uses a fresh session and reports wall-clock time and peak Python
+memory (tracemalloc).
+
+Usage:
+    python scripts/benchmark_rows.py [rows]
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd  # noqa: E402
+
+from src.config.settings import Settings  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def _create_database(db_path: Path, rows: int) -> None:
+    """Create the schema and ``rows`` students."""
+    connection = sqlite3.connect(db_path)
+    connection.executescript((PROJECT_ROOT / "database" / "schema.sql").read_text())
+    connection.execute("INSERT INTO programme (name, duration_years) VALUES ('Bench', 3)")
+    connection.executemany(
+        "INSERT INTO student (programme_id, name, date_of_birth, contact_info, "
+        "year_of_study, graduation_status) VALUES (1, ?, '2000-01-01', ?, 2, 'Enrolled')",
+        ((f"Student {i}", f"student{i}@example.com") for i in range(rows)),
+    )
+    connection.commit()
+    connection.close()
+
+
+def _measure(label: str, func) -> None:  # noqa: ANN001
+    """Run ``func`` once and print time and peak traced memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.3f}s {peak / 1024 / 1024:10.1f} MB  ({result:,} rows)")
+
+
+def main() -> None:
+    """Compare the listing strategies on a temporary database."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "bench.db"
+        _create_database(db_path, rows)
+        Settings._instance = Settings(database_path=db_path)
+
+        from src.database import encrypt_database
+        from src.repositories import StudentRepository
+
+        def repository() -> StudentRepository:
+            return StudentRepository()
+
+        print(f"{'method':<28} {'time':>9} {'peak memory':>13}")
+        _measure(
+            "get_all() + as_dict",
+            lambda: len([student.as_dict for student in repository().get_all()]),
+        )
+        _measure("get_all_rows()", lambda: len(repository().get_all_rows()))
+        _measure("iter_rows()", lambda: sum(1 for _ in repository().iter_rows()))
+        _measure(
+            "DataFrame from as_dict",
+            lambda: len(pd.DataFrame([student.as_dict for student in repository().get_all()])),
+        )
+        _measure("to_dataframe()", lambda: len(repository().to_dataframe()))
+
+        # Release the engine's connections before the directory is removed
+        encrypt_database()
+
+
+if __name__ == "__main__":
+    main()
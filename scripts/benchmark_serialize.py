@@ -0,0 +1,73 @@
+"""Benchmark serializing model instances to dictionaries and JSON.
+
+For every mapped model, builds ``rows`` transient instances and times:
+- the previous ``as_dict`` (a ``getattr`` per column on each call)
+- ``as_dict`` using the cached per-class ``attrgetter``
+- ``Model.to_records()`` over the whole list
+- ``json.dumps`` of the old dictionaries versus ``Model.to_json()`` (orjson
+  when installed)
+
+Usage:
+    python scripts/benchmark_serialize.py [rows]
+"""
+
+import json
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import Integer, Numeric  # noqa: E402
+
+from src.models import Base  # noqa: E402
+from src.models import base as models_base  # noqa: E402
+
+
+def _legacy_as_dict(entity: Base) -> dict:
+    """``as_dict`` as it was before the cached serializer."""
+    return {c.name: getattr(entity, c.name) for c in entity.__table__.columns}
+
+
+def _sample_value(column, index: int):  # noqa: ANN001, ANN202
+    """Return a plausible value for ``column`` in row ``index``."""
+    if isinstance(column.type, Integer):
+        return index
+    if isinstance(column.type, Numeric):
+        return Decimal("1234.50")
+    return f"{column.name} {index}"
+
+
+def _timed(func) -> float:  # noqa: ANN001
+    """Return the wall-clock seconds taken by ``func()``."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Time each serialization path for every model."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    encoder = "orjson" if models_base.orjson is not None else "json"
+
+    headers = ("legacy dict", "as_dict", "to_records", "json.dumps", f"to_json ({encoder})")
+    print(f"{'model':<26}" + "".join(f"{h:>20}" for h in headers))
+    for mapper in sorted(Base.registry.mappers, key=lambda m: m.class_.__name__):
+        model = mapper.class_
+        columns = list(model.__table__.columns)
+        entities = [
+            model(**{c.name: _sample_value(c, i) for c in columns}) for i in range(rows)
+        ]
+        timings = (
+            _timed(lambda: [_legacy_as_dict(e) for e in entities]),
+            _timed(lambda: [e.as_dict for e in entities]),
+            _timed(lambda: model.to_records(entities)),
+            _timed(lambda: json.dumps([_legacy_as_dict(e) for e in entities], default=str)),
+            _timed(lambda: model.to_json(entities)),
+        )
+        print(f"{model.__name__:<26}" + "".join(f"{t:>19.3f}s" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
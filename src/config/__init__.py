@@ -1,5 +1,5 @@
 """Configuration module."""
 
-from src.config.settings import Settings, get_settings
+from src.config.settings import PRAGMA_PROFILES, Settings, get_settings
 
-__all__ = ["Settings", "get_settings"]
+__all__ = ["PRAGMA_PROFILES", "Settings", "get_settings"]
@@ -18,6 +18,52 @@ from typing import ClassVar
 from src.exceptions import ConfigurationError
 
 
+# SQLite PRAGMAs applied to every new connection, by profile name.
+# All profiles use WAL so readers never block the writer.
+PRAGMA_PROFILES: dict[str, dict[str, str | int]] = {
+    # Durable commits, modest memory use
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    # Durable except for the last commits before a power loss; the default
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Imports and seeding: no fsync, large cache; not crash safe
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+}
+
+
+def _parse_entity_cache(value: str) -> dict[str, tuple[int, float | None]]:
+    """Parse ``table:size[:ttl],...`` into ``{table: (size, ttl)}``."""
+    config: dict[str, tuple[int, float | None]] = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        table, _, rest = item.partition(":")
+        size, _, ttl = rest.partition(":")
+        try:
+            config[table] = (int(size or 1000), float(ttl) if ttl else None)
+        except ValueError as e:
+            raise ConfigurationError(f"Invalid DB_ENTITY_CACHE entry: {item}") from e
+    return config
+
+
 def _get_default_db_path() -> Path:
     """Return the default database path (database/university.db)."""
     project_root = Path(__file__).parent.parent.parent
@@ -31,7 +77,47 @@ class Settings:
     database_path: Path = field(default_factory=_get_default_db_path)
     foreign_keys_enabled: bool = True
     echo_sql: bool = False
+    pragma_profile: str = field(
+        default_factory=lambda: os.environ.get("DB_PRAGMA_PROFILE", "balanced")
+    )
+    read_pool_size: int = field(
+        default_factory=lambda: int(os.environ.get("DB_READ_POOL_SIZE", "4"))
+    )
+    connection_pool_size: int = field(
+        default_factory=lambda: int(os.environ.get("DB_CONNECTION_POOL_SIZE", "5"))
+    )
+    connection_pool_timeout: float = field(
+        default_factory=lambda: float(os.environ.get("DB_CONNECTION_POOL_TIMEOUT", "30"))
+    )
+    entity_cache: dict[str, tuple[int, float | None]] = field(
+        default_factory=lambda: _parse_entity_cache(os.environ.get("DB_ENTITY_CACHE", ""))
+    )
+    query_cache_size: int = field(
+        default_factory=lambda: int(os.environ.get("DB_QUERY_CACHE_SIZE", "0"))
+    )
+    strict_loading: str = field(
+        default_factory=lambda: os.environ.get("DB_STRICT_LOADING", "off").lower()
+    )
     encryption_key: str | None = field(default_factory=lambda: os.environ.get("DB_ENCRYPTION_KEY"))
+    kdf_iterations: int = field(
+        default_factory=lambda: int(os.environ.get("DB_KDF_ITERATIONS", "100000"))
+    )
+    key_cache_path: Path | None = field(
+        default_factory=lambda: Path(os.environ["DB_KEY_CACHE"]) if os.environ.get("DB_KEY_CACHE") else None
+    )
+    encryption_chunk_size: int = 1024 * 1024
+    encryption_workers: int = field(
+        default_factory=lambda: int(os.environ.get("DB_ENCRYPTION_WORKERS") or os.cpu_count() or 1)
+    )
+    checkpoint_interval: float | None = field(
+        default_factory=lambda: float(os.environ.get("DB_CHECKPOINT_INTERVAL", "300")) or None
+    )
+    checkpoint_commits: int | None = field(
+        default_factory=lambda: int(os.environ.get("DB_CHECKPOINT_COMMITS", "0")) or None
+    )
+    in_memory: bool = field(
+        default_factory=lambda: os.environ.get("DB_IN_MEMORY", "").lower() in {"1", "true", "yes"}
+    )
 
     _instance: ClassVar["Settings | None"] = None
 
@@ -47,6 +133,11 @@ class Settings:
         """Return SQLAlchemy-compatible database URL."""
         return f"sqlite:///{self.database_path}"
 
+    @property
+    def read_only_database_url(self) -> str:
+        """Return a database URL that opens the file read-only."""
+        return f"sqlite:///file:{self.database_path.as_posix()}?mode=ro&uri=true"
+
     def validate(self) -> bool:
         """Validate the configuration settings."""
         if not self.database_path.parent.exists():
@@ -54,6 +145,44 @@ class Settings:
                 f"Database directory does not exist: {self.database_path.parent}"
             )
 
+        if self.pragma_profile not in PRAGMA_PROFILES:
+            raise ConfigurationError(
+                f"Unknown PRAGMA profile: {self.pragma_profile} "
+                f"(expected one of {', '.join(PRAGMA_PROFILES)})"
+            )
+
+        if self.read_pool_size <= 0:
+            raise ConfigurationError(
+                f"Read pool size must be positive: {self.read_pool_size}"
+            )
+
+        if self.connection_pool_size <= 0:
+            raise ConfigurationError(
+                f"Connection pool size must be positive: {self.connection_pool_size}"
+            )
+
+        for table, (max_size, ttl) in self.entity_cache.items():
+            if max_size <= 0 or (ttl is not None and ttl <= 0):
+                raise ConfigurationError(
+                    f"Entity cache size and TTL must be positive: {table}"
+                )
+
+        if self.query_cache_size < 0:
+            raise ConfigurationError(
+                f"Query cache size must not be negative: {self.query_cache_size}"
+            )
+
+        if self.strict_loading not in {"off", "warn", "raise"}:
+            raise ConfigurationError(
+                f"Unknown strict loading mode: {self.strict_loading} "
+                "(expected off, warn or raise)"
+            )
+
+        if self.encryption_chunk_size <= 0:
+            raise ConfigurationError(
+                f"Encryption chunk size must be positive: {self.encryption_chunk_size}"
+            )
+
         if self.database_path.exists():
             if not os.access(self.database_path, os.R_OK):
                 raise ConfigurationError(
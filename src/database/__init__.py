@@ -1,21 +1,42 @@
 """Database module."""
 
-from src.database.connection import DatabaseConnection, get_connection
+from src.database.async_engine import (
+    async_session_scope,
+    dispose_async_engine,
+    get_async_engine,
+    get_async_session,
+)
+from src.database.checkpoint import Checkpointer
+from src.database.connection import DatabaseConnection, PoolStats, get_connection
 from src.database.engine import (
+    checkpoint_database,
     decrypt_database,
     encrypt_database,
     get_engine,
+    get_read_engine,
+    get_read_session,
     get_session,
     get_session_factory,
     session_scope,
 )
+from src.database.migrations import apply_migrations
 
 __all__ = [
+    "Checkpointer",
     "DatabaseConnection",
+    "PoolStats",
+    "apply_migrations",
+    "async_session_scope",
+    "checkpoint_database",
     "decrypt_database",
+    "dispose_async_engine",
     "encrypt_database",
+    "get_async_engine",
+    "get_async_session",
     "get_connection",
     "get_engine",
+    "get_read_engine",
+    "get_read_session",
     "get_session",
     "get_session_factory",
     "session_scope",
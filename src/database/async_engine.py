@@ -0,0 +1,127 @@
+"""Async SQLAlchemy engine and session management.
+
+An aiosqlite-backed counterpart of ``src.database.engine`` for code running
+on an event loop (the NiceGUI handlers). Queries run on aiosqlite's worker
+threads, so awaiting them leaves the loop free to serve other clients.
+
+The async engine opens the decrypted database file alongside the sync
+engine; WAL mode lets both read while either writes. In-memory mode keeps
+the database in a single sqlite3 connection owned by the sync engine, so
+there is no async engine; ``async_session_scope`` then yields a sync
+session, which the async repositories run on a worker thread
+(``asyncio.to_thread``) so the loop still isn't blocked.
+
+Example:
+    from src.database import async_session_scope
+    from src.repositories import AsyncStudentRepository
+
+    async with async_session_scope() as session:
+        students = await AsyncStudentRepository(session).get_all()
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.database.engine import get_engine, get_session
+from src.database.pragmas import apply_pragmas
+from src.exceptions import ConfigurationError
+
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def _configure_connection(dbapi_conn, connection_record) -> None:  # noqa: ANN001
+    """Configure SQLite connection (foreign keys and PRAGMA profile)."""
+    apply_pragmas(dbapi_conn)
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get or create the async engine singleton."""
+    global _async_engine
+
+    if _async_engine is None:
+        settings = get_settings()
+        if settings.in_memory:
+            raise ConfigurationError(
+                "The async engine is not available with DB_IN_MEMORY enabled"
+            )
+        # The sync engine migrates the schema and switches the file to WAL
+        get_engine()
+        _async_engine = create_async_engine(
+            f"sqlite+aiosqlite:///{settings.database_path}",
+            echo=settings.echo_sql,
+        )
+        event.listen(_async_engine.sync_engine, "connect", _configure_connection)
+
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get or create the async session factory singleton."""
+    global _async_session_factory
+
+    if _async_session_factory is None:
+        # Attributes can't lazy-load outside the session's greenlet, so keep
+        # them loaded after commit
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), expire_on_commit=False
+        )
+
+    return _async_session_factory
+
+
+def get_async_session() -> AsyncSession:
+    """Create a new async database session."""
+    return get_async_session_factory()()
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncGenerator[AsyncSession | Session, None]:
+    """Provide a transactional scope around a series of async operations.
+
+    Yields a sync session instead in in-memory mode; its commit, rollback
+    and close run on a worker thread.
+    """
+    if get_settings().in_memory:
+        sync_session = get_session()
+        try:
+            yield sync_session
+            await asyncio.to_thread(sync_session.commit)
+        except Exception:
+            await asyncio.to_thread(sync_session.rollback)
+            raise
+        finally:
+            await asyncio.to_thread(sync_session.close)
+        return
+
+    session = get_async_session()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+async def dispose_async_engine() -> None:
+    """Close all async connections (call before ``encrypt_database``)."""
+    global _async_engine, _async_session_factory
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
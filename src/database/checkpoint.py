@@ -0,0 +1,175 @@
+"""Background encrypted checkpoints of the live database.
+
+Without checkpoints the database is only encrypted at shutdown, so a crash
+loses every change made since startup and a clean shutdown has to encrypt
+everything at once. The checkpointer runs on its own thread and calls
+``checkpoint_database`` every ``Settings.checkpoint_interval`` seconds
+and/or after ``Settings.checkpoint_commits`` commits, leaving only the tail
+of changes for ``encrypt_database`` to flush at shutdown. Only commits that
+wrote to the database count: reads, empty commits and sessions on other
+databases are ignored.
+
+Example:
+    from src.database import Checkpointer
+
+    checkpointer = Checkpointer()
+    checkpointer.start()
+    ...
+    checkpointer.stop()
+"""
+
+import logging
+import threading
+import time
+
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from src.config import get_settings
+from src.database.engine import checkpoint_database, get_engine
+
+logger = logging.getLogger(__name__)
+
+# How often to retry when a checkpoint was skipped (e.g. open transaction)
+_RETRY_SECONDS = 1.0
+
+# Session.info flag: the current transaction wrote rows
+_WRITES_KEY = "checkpoint_writes"
+
+
+def _mark_flush(session: Session, flush_context: Any) -> None:
+    """Record that a flush wrote rows in the session's transaction."""
+    session.info[_WRITES_KEY] = True
+
+
+def _mark_execute(orm_execute_state: ORMExecuteState) -> None:
+    """Record INSERT/UPDATE/DELETE statements run through the session."""
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WRITES_KEY] = True
+
+
+def _clear_writes(session: Session, *args: Any) -> None:
+    """Forget recorded writes when the transaction rolls back."""
+    session.info.pop(_WRITES_KEY, None)
+
+
+def _writes_database(session: Session) -> bool:
+    """Whether ``session`` is bound to an engine writing the application database."""
+    bind = session.get_bind()
+    engine = get_engine()
+    if bind is engine:
+        return True
+    # The async engine (aiosqlite) opens the same file as the writer
+    return not get_settings().in_memory and bind.url.database == engine.url.database
+
+
+class Checkpointer:
+    """Periodically writes encrypted snapshots on a background thread."""
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        commit_threshold: int | None = None,
+    ) -> None:
+        """Initialise from explicit values or fall back to settings."""
+        settings = get_settings()
+        self._interval = interval if interval is not None else settings.checkpoint_interval
+        self._commit_threshold = (
+            commit_threshold if commit_threshold is not None else settings.checkpoint_commits
+        )
+        self._commits = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any checkpoint trigger is configured."""
+        return bool(self._interval) or bool(self._commit_threshold)
+
+    def start(self) -> None:
+        """Start the background thread if checkpoints are enabled."""
+        if not self.enabled or not get_settings().encryption_key or self._thread is not None:
+            return
+
+        if self._commit_threshold:
+            # after_commit rather than the engine's commit event, which fires
+            # before the data is visible to the snapshot connection
+            event.listen(Session, "after_flush", _mark_flush)
+            event.listen(Session, "do_orm_execute", _mark_execute)
+            event.listen(Session, "after_rollback", _clear_writes)
+            event.listen(Session, "after_commit", self._on_commit)
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="db-checkpointer", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Checkpointer started (interval=%s, commits=%s)",
+            self._interval,
+            self._commit_threshold,
+        )
+
+    def stop(self) -> None:
+        """Stop the background thread, waiting for a running checkpoint."""
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+        if self._commit_threshold:
+            event.remove(Session, "after_flush", _mark_flush)
+            event.remove(Session, "do_orm_execute", _mark_execute)
+            event.remove(Session, "after_rollback", _clear_writes)
+            event.remove(Session, "after_commit", self._on_commit)
+        logger.info("Checkpointer stopped")
+
+    def _on_commit(self, session: Session) -> None:
+        """Count commits that wrote rows; wake the thread at the threshold."""
+        if not session.info.pop(_WRITES_KEY, False) or not _writes_database(session):
+            return
+        with self._lock:
+            self._commits += 1
+            due = self._commits >= self._commit_threshold
+        if due:
+            self._wake.set()
+
+    def _run(self) -> None:
+        """Wait for a trigger, then checkpoint, until stopped."""
+        deadline = time.monotonic() + self._interval if self._interval else None
+
+        while not self._stop.is_set():
+            timeout = max(deadline - time.monotonic(), 0.0) if deadline else None
+            self._wake.wait(timeout)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            due_by_time = deadline is not None and time.monotonic() >= deadline
+            with self._lock:
+                commits = self._commits
+            due_by_commits = bool(self._commit_threshold) and commits >= self._commit_threshold
+            if not (due_by_time or due_by_commits):
+                continue
+
+            try:
+                completed = checkpoint_database()
+            except Exception:
+                logger.exception("Checkpoint failed")
+                completed = False
+
+            if completed:
+                # Commits made while the checkpoint ran count towards the next
+                with self._lock:
+                    self._commits -= commits
+                deadline = time.monotonic() + self._interval if self._interval else None
+            else:
+                deadline = time.monotonic() + _RETRY_SECONDS
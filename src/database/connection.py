@@ -1,8 +1,20 @@
 """Database connection management module.
 
-Provides a singleton database connection manager for SQLite with
+Provides a singleton, thread-safe pool of SQLite connections with
 context managers for cursor and transaction handling.
 
+A thread checks a connection out of the pool for the duration of a
+``cursor``/``transaction`` block (or an explicit ``checkout`` block);
+nested blocks on the same thread reuse that connection. The pool holds at
+most ``Settings.connection_pool_size`` connections, and a thread that finds
+them all checked out waits up to ``Settings.connection_pool_timeout``
+seconds before a ``DatabaseError`` is raised. When the outermost block
+ends, a transaction still open on its connection (a write in a ``cursor``
+block that was never committed) is rolled back, with a warning, so the
+next thread to check the connection out doesn't inherit it. The deprecated
+``connection`` property still works outside these blocks by pinning a
+connection to the calling thread until ``close()`` or the thread exits.
+
 Example:
     from src.database import get_connection
 
@@ -14,20 +26,38 @@ Example:
 
 import logging
 import sqlite3
+import threading
+import warnings
+import weakref
 from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Any, Generator
 
 from src.config import get_settings
+from src.database.pragmas import apply_pragmas
 from src.exceptions import DatabaseError
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PoolStats:
+    """Usage counters for the connection pool."""
+
+    size: int
+    open: int = 0
+    in_use: int = 0
+    peak_in_use: int = 0
+    checkouts: int = 0
+    waits: int = 0
+    timeouts: int = 0
+
+
 class DatabaseConnection:
-    """Singleton class managing SQLite database connections."""
+    """Singleton class managing a pool of SQLite database connections."""
 
     _instance: "DatabaseConnection | None" = None
-    _connection: sqlite3.Connection | None = None
+    _condition: threading.Condition | None = None
 
     def __new__(cls) -> "DatabaseConnection":
         """Create or return the singleton instance."""
@@ -36,23 +66,34 @@ class DatabaseConnection:
         return cls._instance
 
     def __init__(self) -> None:
-        """Initialise the database connection if not already connected."""
-        if self._connection is None:
-            self._connect()
+        """Initialise the connection pool if not already initialised."""
+        if self._condition is None:
+            settings = get_settings()
+            self._size = settings.connection_pool_size
+            self._timeout = settings.connection_pool_timeout
+            self._idle: list[sqlite3.Connection] = []
+            # Per thread: ``connection`` checked out, ``depth`` of checkout
+            # blocks using it, and ``pin`` if the ``connection`` property
+            # pinned it, as (connection, generation, finalizer)
+            self._local = threading.local()
+            self._stats = PoolStats(size=self._size)
+            # Bumped by close() so connections checked out before it are
+            # closed on return instead of going back into the pool
+            self._generation = 0
+            self._condition = threading.Condition()
 
-    def _connect(self) -> None:
-        """Establish the database connection."""
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new database connection for the pool."""
         settings = get_settings()
         db_path = settings.database_path
 
         try:
             logger.info("Connecting to database: %s", db_path)
-            self._connection = sqlite3.connect(db_path)
-            self._connection.row_factory = sqlite3.Row
-
-            if settings.foreign_keys_enabled:
-                self._connection.execute("PRAGMA foreign_keys = ON")
-                logger.debug("Foreign key enforcement enabled")
+            # Connections move between threads, but only one uses each at a time
+            connection = sqlite3.connect(db_path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            apply_pragmas(connection)
+            return connection
 
         except sqlite3.Error as e:
             logger.error("Failed to connect to database: %s", e)
@@ -61,50 +102,194 @@ class DatabaseConnection:
                 original_error=e,
             ) from e
 
+    def _acquire(self) -> tuple[sqlite3.Connection, int]:
+        """Take an idle connection, open a new one, or wait for one.
+
+        Returns the connection with the pool generation it belongs to.
+        """
+        stats = self._stats
+        with self._condition:
+            if not self._idle and stats.open >= self._size:
+                stats.waits += 1
+                available = self._condition.wait_for(
+                    lambda: self._idle or stats.open < self._size, self._timeout
+                )
+                if not available:
+                    stats.timeouts += 1
+                    raise DatabaseError(
+                        f"Timed out after {self._timeout}s waiting for a database "
+                        f"connection (pool size {self._size})"
+                    )
+
+            generation = self._generation
+            connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                stats.open += 1
+            stats.checkouts += 1
+            stats.in_use += 1
+            stats.peak_in_use = max(stats.peak_in_use, stats.in_use)
+
+        if connection is None:
+            try:
+                connection = self._connect()
+            except DatabaseError:
+                with self._condition:
+                    stats.open -= 1
+                    stats.in_use -= 1
+                    self._condition.notify()
+                raise
+        return connection, generation
+
+    def _release(self, connection: sqlite3.Connection, generation: int) -> None:
+        """Return a connection to the pool, rolling back an open transaction."""
+        if connection.in_transaction:
+            logger.warning("Rolling back uncommitted changes on a returned connection")
+            connection.rollback()
+
+        with self._condition:
+            self._stats.in_use -= 1
+            if generation == self._generation:
+                self._idle.append(connection)
+            else:
+                self._stats.open -= 1
+                connection.close()
+            self._condition.notify()
+
+    def _unpin(self) -> None:
+        """Return the connection pinned to the current thread to the pool."""
+        connection, generation, finalizer = self._local.pin
+        self._local.pin = None
+        self._local.connection = None
+        finalizer.detach()
+        self._release(connection, generation)
+
+    def _current(self) -> sqlite3.Connection | None:
+        """Return the connection the current thread has checked out, if any."""
+        connection = getattr(self._local, "connection", None)
+        pin = getattr(self._local, "pin", None)
+        if (
+            pin is not None
+            and pin[1] != self._generation
+            and not getattr(self._local, "depth", 0)
+            and not connection.in_transaction
+        ):
+            # Pinned by ``connection`` before close(); release it once idle
+            self._unpin()
+            return None
+        return connection
+
+    @contextmanager
+    def checkout(self) -> Generator[sqlite3.Connection, None, None]:
+        """Check a connection out of the pool for the current thread.
+
+        Nested checkouts on the same thread reuse the outer connection, so
+        several calls can share one connection (and one transaction).
+        """
+        connection = self._current()
+        depth = getattr(self._local, "depth", 0)
+        if connection is not None:
+            self._local.depth = depth + 1
+            try:
+                yield connection
+            finally:
+                self._local.depth = depth
+            return
+
+        connection, generation = self._acquire()
+        self._local.connection = connection
+        self._local.depth = 1
+        try:
+            yield connection
+        finally:
+            self._local.connection = None
+            self._local.depth = 0
+            self._release(connection, generation)
+
+    @property
+    def stats(self) -> PoolStats:
+        """Get a snapshot of the pool usage counters."""
+        with self._condition:
+            return PoolStats(**vars(self._stats))
+
     @property
     def connection(self) -> sqlite3.Connection:
-        """Get the underlying SQLite connection."""
-        if self._connection is None:
-            raise DatabaseError("No database connection available")
-        return self._connection
+        """Get the connection checked out by the current thread.
+
+        Outside a ``checkout`` block this checks a connection out and pins
+        it to the thread until ``close()``, as the single shared connection
+        used to be; a thread that exits returns its pinned connection to the
+        pool. That use is deprecated: it holds a pool slot for the thread's
+        lifetime, so use ``checkout()``, ``cursor()`` or ``transaction()``
+        instead.
+        """
+        connection = self._current()
+        if connection is not None:
+            return connection
+
+        warnings.warn(
+            "DatabaseConnection.connection outside checkout() is deprecated; "
+            "use checkout(), cursor() or transaction()",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        connection, generation = self._acquire()
+        # Release the slot when the thread goes away, even without close()
+        finalizer = weakref.finalize(
+            threading.current_thread(), self._release, connection, generation
+        )
+        finalizer.atexit = False
+        self._local.connection = connection
+        self._local.pin = (connection, generation, finalizer)
+        return connection
 
     @contextmanager
     def cursor(self) -> Generator[sqlite3.Cursor, None, None]:
-        """Get a database cursor as a context manager."""
+        """Get a database cursor as a context manager.
+
+        Nothing is committed: writes must go through ``transaction()``, or
+        be committed on the connection, before the outermost block ends,
+        or they are rolled back when the connection returns to the pool.
+        """
         cursor = None
-        try:
-            cursor = self.connection.cursor()
-            yield cursor
-        except sqlite3.Error as e:
-            logger.error("Cursor error: %s", e)
-            raise DatabaseError("Database cursor error", original_error=e) from e
-        finally:
-            if cursor is not None:
-                cursor.close()
+        with self.checkout() as connection:
+            try:
+                cursor = connection.cursor()
+                yield cursor
+            except sqlite3.Error as e:
+                logger.error("Cursor error: %s", e)
+                raise DatabaseError("Database cursor error", original_error=e) from e
+            finally:
+                if cursor is not None:
+                    cursor.close()
 
     @contextmanager
     def transaction(self) -> Generator[sqlite3.Cursor, None, None]:
         """Execute operations within a transaction with auto commit/rollback."""
         cursor = None
-        try:
-            cursor = self.connection.cursor()
-            yield cursor
-            self.connection.commit()
-            logger.debug("Transaction committed successfully")
-        except sqlite3.Error as e:
-            self.connection.rollback()
-            logger.error("Transaction rolled back: %s", e)
-            raise DatabaseError("Transaction failed", original_error=e) from e
-        finally:
-            if cursor is not None:
-                cursor.close()
+        with self.checkout() as connection:
+            try:
+                cursor = connection.cursor()
+                yield cursor
+                connection.commit()
+                logger.debug("Transaction committed successfully")
+            except sqlite3.Error as e:
+                connection.rollback()
+                logger.error("Transaction rolled back: %s", e)
+                raise DatabaseError("Transaction failed", original_error=e) from e
+            finally:
+                if cursor is not None:
+                    cursor.close()
 
     def execute(
         self,
         query: str,
         params: tuple[Any, ...] | dict[str, Any] | None = None,
     ) -> list[sqlite3.Row]:
-        """Execute a query and return all results."""
+        """Execute a query and return all results.
+
+        Runs in a ``cursor()`` block and doesn't commit, so use
+        ``execute_write()`` for writes.
+        """
         with self.cursor() as cursor:
             if params:
                 cursor.execute(query, params)
@@ -152,13 +337,28 @@ class DatabaseConnection:
             return cursor.rowcount
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self._connection is not None:
-            logger.info("Closing database connection")
-            self._connection.close()
-            self._connection = None
+        """Close all idle connections and the caller's pinned connection.
+
+        Connections still checked out are closed when they are returned,
+        and those pinned to other threads once the thread next uses the pool
+        outside a transaction, or exits. The pool opens new connections on
+        demand afterwards.
+        """
+        if getattr(self._local, "pin", None) is not None and not getattr(
+            self._local, "depth", 0
+        ):
+            self._unpin()
+
+        with self._condition:
+            if self._idle:
+                logger.info("Closing %d database connection(s)", len(self._idle))
+            for connection in self._idle:
+                connection.close()
+            self._stats.open -= len(self._idle)
+            self._idle.clear()
+            self._generation += 1
 
 
 def get_connection() -> DatabaseConnection:
-    """Get the database connection singleton."""
+    """Get the database connection pool singleton."""
     return DatabaseConnection()
@@ -0,0 +1,453 @@
+"""Chunked encryption container for the database at rest.
+
+The container is a fixed header followed by a stream of records. Each
+record is independently authenticated with AES-256-GCM, so the database
+can be encrypted and decrypted in constant memory regardless of its size.
+
+Layout::
+
+    header   MAGIC | version (u8) | chunk_size (u32) | iterations (u32) | salt (16 bytes)
+    record   kind (u8) | length (u32) | nonce (12 bytes) | ciphertext + tag
+
+The header carries the PBKDF2 salt and iteration count used to derive the
+key, so either can be changed without breaking existing files. Version 1
+headers had neither and used a fixed salt; they are still readable.
+
+Data records carry up to ``chunk_size`` bytes of plaintext. The stream
+ends with a single trailer record holding the chunk count, the total
+plaintext length and a SHA-256 digest of every chunk. Every record binds
+the header, its kind and its index as associated data, so records cannot
+be reordered, dropped or spliced between containers without failing
+authentication; the digests additionally catch a record replaced by an
+older version of itself.
+
+Every data record except the last has the same size, so record ``i``
+always starts at ``header + i * record_size``. ``update_container`` uses
+this to re-encrypt only the chunks whose digest changed and rewrite them
+in place, making shutdown cost proportional to what a session wrote. The
+engine applies it to a copy of the container and atomically replaces the
+original, so a crash mid-update never damages the only copy.
+
+Derived keys are memoized per process and can optionally be persisted to
+a permission-protected cache file, since PBKDF2 dominates cold start on
+small machines. The cache file is as sensitive as the database key.
+
+Because records are independent, sealing and opening them is spread over
+a thread pool (AES-GCM releases the GIL) while results are written back
+in their original order.
+
+Files written before this format existed are single Fernet tokens; use
+``is_container`` to tell them apart.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import stat
+import struct
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from src.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"UDBENC"
+FORMAT_VERSION = 2
+
+_PREFIX = struct.Struct(">6sB")
+_HEADER_V1 = struct.Struct(">6sBI")
+_HEADER = struct.Struct(">6sBII16s")
+_RECORD = struct.Struct(">BI")
+_AAD = struct.Struct(">BQ")
+_TRAILER = struct.Struct(">QQ")
+_NONCE_SIZE = 12
+_TAG_SIZE = 16
+_DIGEST_SIZE = 32
+
+_KIND_DATA = 0
+_KIND_TRAILER = 1
+
+SALT_SIZE = 16
+
+# Entries kept in the persistent key cache
+_KEY_CACHE_ENTRIES = 8
+
+
+@dataclass(frozen=True)
+class KeyParams:
+    """PBKDF2 parameters used to derive a container key."""
+
+    salt: bytes
+    iterations: int
+
+
+# Fixed parameters of legacy Fernet files and version 1 containers
+LEGACY_KEY_PARAMS = KeyParams(salt=b"university-db", iterations=100000)
+
+_derived_keys: dict[tuple[str, KeyParams], bytes] = {}
+_derived_keys_lock = threading.Lock()
+
+
+def _cache_fingerprint(password: str, params: KeyParams) -> str:
+    """Identify a (password, salt, iterations) combination in the key cache."""
+    digest = hashlib.sha256()
+    digest.update(params.salt)
+    digest.update(params.iterations.to_bytes(4, "big"))
+    digest.update(password.encode())
+    return digest.hexdigest()
+
+
+def _read_key_cache(cache_path: Path) -> dict[str, str]:
+    """Load the persistent key cache, ignoring it if unreadable or exposed."""
+    if not cache_path.exists():
+        return {}
+    if os.name == "posix" and cache_path.stat().st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        logger.warning("Ignoring key cache readable by other users: %s", cache_path)
+        return {}
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable key cache: %s", cache_path)
+        return {}
+
+
+def _write_key_cache(cache_path: Path, entries: dict[str, str]) -> None:
+    """Atomically write the key cache with owner-only permissions."""
+    temp_path = cache_path.with_name(cache_path.name + ".tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(entries, handle)
+    os.replace(temp_path, cache_path)
+
+
+def derive_key(
+    password: str,
+    params: KeyParams = LEGACY_KEY_PARAMS,
+    cache_path: Path | None = None,
+) -> bytes:
+    """Derive a 256-bit key from a password string.
+
+    Results are memoized for the life of the process. When ``cache_path``
+    is given they are also persisted there so later runs skip PBKDF2.
+    """
+    memo_key = (password, params)
+    with _derived_keys_lock:
+        if memo_key in _derived_keys:
+            return _derived_keys[memo_key]
+
+        fingerprint = _cache_fingerprint(password, params)
+        entries = _read_key_cache(cache_path) if cache_path else {}
+        if fingerprint in entries:
+            key = base64.b64decode(entries[fingerprint])
+        else:
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=params.salt,
+                iterations=params.iterations,
+            )
+            key = kdf.derive(password.encode())
+            if cache_path:
+                entries.pop(fingerprint, None)
+                entries[fingerprint] = base64.b64encode(key).decode()
+                recent = list(entries.items())[-_KEY_CACHE_ENTRIES:]
+                try:
+                    _write_key_cache(cache_path, dict(recent))
+                except OSError:
+                    logger.warning("Could not write key cache: %s", cache_path)
+
+        _derived_keys[memo_key] = key
+        return key
+
+
+def get_fernet(password: str, cache_path: Path | None = None) -> Fernet:
+    """Return the Fernet instance used by the legacy single-token format."""
+    return Fernet(base64.urlsafe_b64encode(derive_key(password, cache_path=cache_path)))
+
+
+def is_container(path: Path) -> bool:
+    """Check whether a file uses the chunked container format."""
+    with path.open("rb") as handle:
+        return handle.read(len(MAGIC)) == MAGIC
+
+
+def read_key_params(path: Path) -> KeyParams:
+    """Return the key parameters a container (or legacy file) was written with."""
+    if not is_container(path):
+        return LEGACY_KEY_PARAMS
+    with path.open("rb") as handle:
+        _header, _chunk_size, params = _read_header(handle)
+    return params
+
+
+def _seal(aead: AESGCM, header: bytes, kind: int, index: int, plaintext: bytes) -> bytes:
+    """Encrypt one record and return it with its record header."""
+    nonce = os.urandom(_NONCE_SIZE)
+    body = nonce + aead.encrypt(nonce, plaintext, header + _AAD.pack(kind, index))
+    return _RECORD.pack(kind, len(body)) + body
+
+
+def _open(aead: AESGCM, header: bytes, kind: int, index: int, body: bytes) -> bytes:
+    """Authenticate and decrypt one record body."""
+    nonce, ciphertext = body[:_NONCE_SIZE], body[_NONCE_SIZE:]
+    try:
+        return aead.decrypt(nonce, ciphertext, header + _AAD.pack(kind, index))
+    except InvalidTag as e:
+        raise DatabaseError("Encrypted database failed authentication", original_error=e) from e
+
+
+def _seal_chunk(
+    aead: AESGCM, header: bytes, index: int, chunk: bytes
+) -> tuple[int, bytes, bytes]:
+    """Encrypt one data chunk, returning its index, record and plaintext digest."""
+    return index, _seal(aead, header, _KIND_DATA, index, chunk), hashlib.sha256(chunk).digest()
+
+
+def _open_chunk(
+    aead: AESGCM, header: bytes, index: int, body: bytes
+) -> tuple[bytes, bytes]:
+    """Decrypt one data record, returning its plaintext and digest."""
+    plaintext = _open(aead, header, _KIND_DATA, index, body)
+    return plaintext, hashlib.sha256(plaintext).digest()
+
+
+def _ordered_map(
+    function: Callable[..., Any],
+    jobs: Iterable[tuple[Any, ...]],
+    workers: int,
+) -> Iterator[Any]:
+    """Apply ``function`` to each job on a thread pool, yielding results in order.
+
+    At most ``workers * 2`` jobs are in flight, keeping memory bounded.
+    """
+    if workers <= 1:
+        for job in jobs:
+            yield function(*job)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[Any]] = deque()
+        for job in jobs:
+            pending.append(executor.submit(function, *job))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _read_exact(source: BinaryIO, size: int) -> bytes:
+    """Read exactly ``size`` bytes or raise on a truncated container."""
+    data = source.read(size)
+    if len(data) != size:
+        raise DatabaseError("Encrypted database is truncated")
+    return data
+
+
+def _record_size(chunk_size: int) -> int:
+    """Return the on-disk size of a full data record."""
+    return _RECORD.size + _NONCE_SIZE + chunk_size + _TAG_SIZE
+
+
+def _trailer_plaintext(length: int, digests: list[bytes]) -> bytes:
+    """Build the trailer payload for a container."""
+    return _TRAILER.pack(len(digests), length) + b"".join(digests)
+
+
+def _parse_trailer(plaintext: bytes) -> tuple[int, int, list[bytes] | None]:
+    """Split a trailer payload into chunk count, length and digests.
+
+    Containers written before digests were tracked have none.
+    """
+    count, length = _TRAILER.unpack_from(plaintext)
+    body = plaintext[_TRAILER.size:]
+    if not body:
+        return count, length, None
+    if len(body) != count * _DIGEST_SIZE:
+        raise DatabaseError("Encrypted database trailer is malformed")
+    return count, length, [
+        body[i:i + _DIGEST_SIZE] for i in range(0, len(body), _DIGEST_SIZE)
+    ]
+
+
+def _read_header(source: BinaryIO) -> tuple[bytes, int, KeyParams]:
+    """Read and validate a container header.
+
+    Returns the raw header (bound into every record), the chunk size and
+    the key parameters.
+    """
+    prefix = _read_exact(source, _PREFIX.size)
+    magic, version = _PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise DatabaseError("Not an encrypted database container")
+
+    if version == 1:
+        header = prefix + _read_exact(source, _HEADER_V1.size - _PREFIX.size)
+        _magic, _version, chunk_size = _HEADER_V1.unpack(header)
+        return header, chunk_size, LEGACY_KEY_PARAMS
+    if version == FORMAT_VERSION:
+        header = prefix + _read_exact(source, _HEADER.size - _PREFIX.size)
+        _magic, _version, chunk_size, iterations, salt = _HEADER.unpack(header)
+        return header, chunk_size, KeyParams(salt=salt, iterations=iterations)
+    raise DatabaseError(f"Unsupported encrypted database version: {version}")
+
+
+def encrypt_stream(
+    source: BinaryIO,
+    destination: BinaryIO,
+    key: bytes,
+    params: KeyParams,
+    chunk_size: int,
+    workers: int = 1,
+) -> None:
+    """Encrypt ``source`` into ``destination`` using the container format.
+
+    ``key`` must have been derived with ``params``, which are recorded in
+    the header.
+    """
+    if len(params.salt) != SALT_SIZE:
+        raise ValueError(f"Container salt must be {SALT_SIZE} bytes")
+    aead = AESGCM(key)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, chunk_size, params.iterations, params.salt)
+    destination.write(header)
+
+    chunks = iter(lambda: source.read(chunk_size), b"")
+    jobs = ((aead, header, index, chunk) for index, chunk in enumerate(chunks))
+
+    length = 0
+    digests: list[bytes] = []
+    for _index, record, digest in _ordered_map(_seal_chunk, jobs, workers):
+        destination.write(record)
+        length += len(record) - _RECORD.size - _NONCE_SIZE - _TAG_SIZE
+        digests.append(digest)
+
+    destination.write(
+        _seal(aead, header, _KIND_TRAILER, len(digests), _trailer_plaintext(length, digests))
+    )
+
+
+def decrypt_stream(
+    source: BinaryIO,
+    destination: BinaryIO,
+    key: bytes,
+    workers: int = 1,
+) -> None:
+    """Decrypt a container from ``source`` into ``destination``.
+
+    ``key`` must be derived with the container's ``read_key_params``.
+    """
+    aead = AESGCM(key)
+    header, _chunk_size, _params = _read_header(source)
+    trailer: list[bytes] = []
+
+    def data_records() -> Iterator[tuple[Any, ...]]:
+        index = 0
+        while True:
+            kind, size = _RECORD.unpack(_read_exact(source, _RECORD.size))
+            body = _read_exact(source, size)
+            if kind == _KIND_TRAILER:
+                trailer.append(body)
+                return
+            yield aead, header, index, body
+            index += 1
+
+    length = 0
+    digests: list[bytes] = []
+    for plaintext, digest in _ordered_map(_open_chunk, data_records(), workers):
+        destination.write(plaintext)
+        length += len(plaintext)
+        digests.append(digest)
+
+    count = len(digests)
+    expected_count, expected_length, expected_digests = _parse_trailer(
+        _open(aead, header, _KIND_TRAILER, count, trailer[0])
+    )
+    if (expected_count, expected_length) != (count, length):
+        raise DatabaseError("Encrypted database trailer does not match its contents")
+    if expected_digests is not None and expected_digests != digests:
+        raise DatabaseError("Encrypted database chunk digests do not match")
+    if source.read(1):
+        raise DatabaseError("Unexpected data after encrypted database trailer")
+
+
+def _read_trailer(container: BinaryIO, aead: AESGCM, header: bytes) -> bytes:
+    """Walk the record headers of a container and decrypt its trailer."""
+    container.seek(len(header))
+    index = 0
+    while True:
+        kind, size = _RECORD.unpack(_read_exact(container, _RECORD.size))
+        if kind == _KIND_TRAILER:
+            return _open(aead, header, _KIND_TRAILER, index, _read_exact(container, size))
+        container.seek(size, os.SEEK_CUR)
+        index += 1
+
+
+def update_container(
+    source: BinaryIO,
+    container: BinaryIO,
+    key: bytes,
+    chunk_size: int,
+    workers: int = 1,
+) -> bool:
+    """Re-encrypt only the chunks of ``source`` that differ from ``container``.
+
+    ``container`` must be opened for reading and writing. Changed chunks are
+    rewritten in place, new chunks are appended and the trailer is replaced.
+    The trailer is written last, so an interrupted update leaves a container
+    that fails authentication rather than one that silently mixes versions;
+    callers should therefore update a copy and swap it in once complete.
+
+    Returns False without touching either stream when the container cannot
+    be updated incrementally (older version, different chunk size or no
+    stored digests); the caller should then write a fresh container instead.
+    """
+    aead = AESGCM(key)
+    container.seek(0)
+    header, existing_chunk_size, _params = _read_header(container)
+    if len(header) != _HEADER.size or existing_chunk_size != chunk_size:
+        return False
+    _count, _length, old_digests = _parse_trailer(_read_trailer(container, aead, header))
+    if old_digests is None:
+        return False
+
+    record_size = _record_size(chunk_size)
+    length = 0
+    digests: list[bytes] = []
+
+    def dirty_chunks() -> Iterator[tuple[Any, ...]]:
+        nonlocal length
+        for index, chunk in enumerate(iter(lambda: source.read(chunk_size), b"")):
+            length += len(chunk)
+            digest = hashlib.sha256(chunk).digest()
+            digests.append(digest)
+            if index >= len(old_digests) or old_digests[index] != digest:
+                yield aead, header, index, chunk
+
+    for index, record, _digest in _ordered_map(_seal_chunk, dirty_chunks(), workers):
+        container.seek(len(header) + index * record_size)
+        container.write(record)
+
+    # The final data record may be shorter than a full record
+    if digests:
+        tail = length - (len(digests) - 1) * chunk_size
+        end = len(header) + (len(digests) - 1) * record_size + record_size - chunk_size + tail
+    else:
+        end = len(header)
+    container.seek(end)
+    container.write(
+        _seal(aead, header, _KIND_TRAILER, len(digests), _trailer_plaintext(length, digests))
+    )
+    container.truncate()
+    return True
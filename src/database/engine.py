@@ -1,28 +1,218 @@
-"""SQLAlchemy engine and session management."""
-
-import base64
+"""SQLAlchemy engine and session management.
+
+When ``Settings.in_memory`` is enabled the decrypted database is never
+written to disk: ``decrypt_database`` deserializes it into an in-memory
+SQLite connection, ``get_engine`` binds to that connection, and
+``encrypt_database`` serializes and encrypts it again at shutdown. Sessions
+take turns writing, one transaction at a time, while other sessions keep
+reading the last commit (see ``src.database.memory``).
+
+File-backed databases get two engines: ``get_engine`` is the single writer
+used for CRUD, and ``get_read_engine`` is a pool of read-only connections
+for queries. With WAL enabled, a long report on a reader never blocks a
+commit on the writer. In-memory mode has only the one shared connection, so
+the read engine is the writer engine.
+
+Creating the writer engine also applies pending schema migrations; see
+``src.database.migrations``.
+
+``checkpoint_database`` writes an encrypted snapshot of the live database
+between start and shutdown; see ``src.database.checkpoint``.
+"""
+
+import io
+import logging
+import os
+import shutil
+import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator
+from typing import BinaryIO, Generator
 
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from src.config import get_settings
-
+from src.database.encryption import (
+    LEGACY_KEY_PARAMS,
+    SALT_SIZE,
+    KeyParams,
+    decrypt_stream,
+    derive_key,
+    encrypt_stream,
+    get_fernet,
+    is_container,
+    read_key_params,
+    update_container,
+)
+from src.database.memory import MemoryDatabase, SharedConnection
+from src.database.migrations import apply_migrations
+from src.database.pragmas import apply_pragmas
+
+logger = logging.getLogger(__name__)
 
 _engine: Engine | None = None
 _session_factory: sessionmaker[Session] | None = None
+_read_engine: Engine | None = None
+_read_session_factory: sessionmaker[Session] | None = None
+_memory_database: MemoryDatabase | None = None
+_encryption_lock = threading.Lock()
+
+# Seconds encrypt_database waits for an open in-memory transaction to end
+# before saving the committed copy instead
+_SHUTDOWN_LOCK_TIMEOUT = 10
+
+
+def _merge_wal(db_path: Path) -> None:
+    """Fold any write-ahead log back into the main database file.
+
+    Must run before the .db file is read as raw bytes, otherwise commits
+    still sitting in the -wal file would be missing from the copy.
+    """
+    connection = sqlite3.connect(db_path)
+    try:
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        connection.close()
+
 
+def _remove_database_files(db_path: Path) -> None:
+    """Delete the plaintext database along with its -wal and -shm files.
 
-def _get_fernet(key: str) -> Fernet:
-    """Derive a Fernet key from a password string."""
-    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=b"university-db", iterations=100000)
-    return Fernet(base64.urlsafe_b64encode(kdf.derive(key.encode())))
+    Also removes a ``.snapshot`` file left by checkpoints from older
+    versions, which backed up to disk before encrypting.
+    """
+    for suffix in ("", "-wal", "-shm", ".snapshot"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+
+def _load_into_memory(data: bytes) -> None:
+    """Deserialize a database image into the shared in-memory connection."""
+    global _memory_database
+
+    # Images taken from a WAL-mode file have the WAL flag set in the header
+    # (bytes 18-19), which in-memory databases can't open; mark them as
+    # rollback-journal databases instead
+    if data[18:20] == b"\x02\x02":
+        data = data[:18] + b"\x01\x01" + data[20:]
+
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.deserialize(data)
+    # Every handle shares this connection, so configure it once here rather
+    # than on each checkout (which would wait for an open transaction)
+    apply_pragmas(connection)
+    _memory_database = MemoryDatabase(connection)
+
+
+def _key_params_for_write(encrypted_path: Path) -> KeyParams:
+    """Choose key parameters for writing the container at ``encrypted_path``.
+
+    The existing salt is kept while the iteration count is unchanged so the
+    derived key (and its cache entry) stays valid across rewrites. Legacy
+    files and changed settings get a fresh random salt.
+    """
+    settings = get_settings()
+    if encrypted_path.exists():
+        params = read_key_params(encrypted_path)
+        if params != LEGACY_KEY_PARAMS and params.iterations == settings.kdf_iterations:
+            return params
+    return KeyParams(salt=os.urandom(SALT_SIZE), iterations=settings.kdf_iterations)
+
+
+def _replace_durably(temp_path: Path, target_path: Path) -> None:
+    """Atomically move a fully written ``temp_path`` over ``target_path``.
+
+    The file is fsynced before the rename and the directory after it, so a
+    crash leaves either the old or the new file, never a partial one.
+    """
+    with temp_path.open("rb") as handle:
+        os.fsync(handle.fileno())
+    os.replace(temp_path, target_path)
+    if os.name == "posix":
+        directory = os.open(target_path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+def _write_encrypted(
+    source: BinaryIO,
+    encrypted_path: Path,
+    key: str,
+) -> None:
+    """Stream ``source`` into the encrypted container at ``encrypted_path``.
+
+    An existing container is updated incrementally, re-encrypting only
+    changed chunks. A fresh container is written when there is none, or
+    when it can't be updated (legacy format, changed key parameters or
+    chunk size). Either way the work happens on a
+    temporary copy that atomically replaces the original, so the container
+    on disk is always a complete one.
+    """
+    settings = get_settings()
+    params = _key_params_for_write(encrypted_path)
+    derived_key = derive_key(key, params, settings.key_cache_path)
+    temp_path = encrypted_path.with_name(encrypted_path.name + ".tmp")
+
+    try:
+        if (
+            encrypted_path.exists()
+            and is_container(encrypted_path)
+            and read_key_params(encrypted_path) == params
+        ):
+            shutil.copyfile(encrypted_path, temp_path)
+            with temp_path.open("r+b") as container:
+                updated = update_container(
+                    source,
+                    container,
+                    derived_key,
+                    settings.encryption_chunk_size,
+                    settings.encryption_workers,
+                )
+            if updated:
+                _replace_durably(temp_path, encrypted_path)
+                return
+
+        with temp_path.open("wb") as destination:
+            encrypt_stream(
+                source,
+                destination,
+                derived_key,
+                params,
+                settings.encryption_chunk_size,
+                settings.encryption_workers,
+            )
+        _replace_durably(temp_path, encrypted_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _read_encrypted(encrypted_path: Path, destination: BinaryIO, key: str) -> None:
+    """Decrypt a container or legacy single-token file into ``destination``."""
+    settings = get_settings()
+    if is_container(encrypted_path):
+        derived_key = derive_key(
+            key, read_key_params(encrypted_path), settings.key_cache_path
+        )
+        with encrypted_path.open("rb") as source:
+            decrypt_stream(source, destination, derived_key, settings.encryption_workers)
+    else:
+        fernet = get_fernet(key, settings.key_cache_path)
+        destination.write(fernet.decrypt(encrypted_path.read_bytes()))
+
+
+def _can_decrypt(encrypted_path: Path, key: str) -> bool:
+    """Return True if ``encrypted_path`` decrypts and authenticates with ``key``."""
+    try:
+        with open(os.devnull, "wb") as sink:
+            _read_encrypted(encrypted_path, sink, key)
+    except Exception:
+        return False
+    return True
 
 
 def decrypt_database() -> None:
@@ -30,67 +220,167 @@ def decrypt_database() -> None:
 
     - If .enc exists: decrypt it (delete stale .db first if present)
     - If only .db exists with encryption key: encrypt it now, then decrypt for use
+    - In in-memory mode the decrypted image is loaded straight into memory
+      instead of being written back to .db
     """
     settings = get_settings()
     db_path = settings.database_path
     encrypted_path = Path(str(db_path) + ".enc")
 
-    # Case 1: Both files exist - previous shutdown failed to delete .db
+    # Older checkpoints backed up to a plaintext file before encrypting it;
+    # don't leave one behind from a crash mid-checkpoint
+    Path(f"{db_path}.snapshot").unlink(missing_ok=True)
+
+    # Case 1: Both files exist - previous shutdown failed to delete .db, or
+    # was interrupted while writing the .enc. Only trust the .enc if it
+    # authenticates; otherwise keep the .db and re-encrypt it (Case 2),
+    # setting the unreadable .enc aside rather than deleting it.
     if encrypted_path.exists() and db_path.exists() and settings.encryption_key:
-        db_path.unlink()
+        if _can_decrypt(encrypted_path, settings.encryption_key):
+            _remove_database_files(db_path)
+        else:
+            corrupt_path = encrypted_path.with_name(encrypted_path.name + ".corrupt")
+            logger.warning(
+                "%s does not decrypt; keeping %s and moving the container to %s",
+                encrypted_path,
+                db_path,
+                corrupt_path,
+            )
+            os.replace(encrypted_path, corrupt_path)
 
     # Case 2: Only .db exists with encryption key - encrypt it first
     if db_path.exists() and not encrypted_path.exists() and settings.encryption_key:
-        fernet = _get_fernet(settings.encryption_key)
-        decrypted_data = db_path.read_bytes()
-        encrypted_data = fernet.encrypt(decrypted_data)
-        encrypted_path.write_bytes(encrypted_data)
-        db_path.unlink()
+        _merge_wal(db_path)
+        with db_path.open("rb") as source:
+            _write_encrypted(source, encrypted_path, settings.encryption_key)
+        _remove_database_files(db_path)
 
     # Case 3: Encrypted file exists - decrypt for use
     if encrypted_path.exists() and settings.encryption_key:
-        fernet = _get_fernet(settings.encryption_key)
-        encrypted_data = encrypted_path.read_bytes()
         try:
-            decrypted_data = fernet.decrypt(encrypted_data)
+            if settings.in_memory:
+                buffer = io.BytesIO()
+                _read_encrypted(encrypted_path, buffer, settings.encryption_key)
+                _load_into_memory(buffer.getvalue())
+            else:
+                with db_path.open("wb") as destination:
+                    _read_encrypted(encrypted_path, destination, settings.encryption_key)
         except Exception:
+            # Don't leave a partially decrypted file behind
+            db_path.unlink(missing_ok=True)
             raise SystemExit("Failed to decrypt database. Wrong DB_ENCRYPTION_KEY?")
-        db_path.write_bytes(decrypted_data)
 
 
 def encrypt_database() -> None:
-    """Encrypt the database file for storage at rest."""
-    global _engine, _session_factory
+    """Encrypt the database file (or in-memory image) for storage at rest."""
+    global _engine, _session_factory, _read_engine, _read_session_factory
+    global _memory_database
+
+    # Serialize the last commit before the connection is closed. If a
+    # transaction is still open its uncommitted writes must not be saved:
+    # fall back to the committed copy, or keep the existing .enc
+    in_memory = _memory_database is not None
+    memory_image = None
+    if in_memory:
+        memory_image = _memory_database.committed_image(timeout=_SHUTDOWN_LOCK_TIMEOUT)
+        if memory_image is None:
+            logger.error(
+                "A transaction is still open and the last commit can't be isolated "
+                "from it; keeping the previous encrypted database"
+            )
+
+    # Dispose of engines to release file locks
+    if _read_engine is not None:
+        if _read_engine is not _engine:
+            _read_engine.dispose()
+        _read_engine = None
+        _read_session_factory = None
 
-    # Dispose of engine to release file locks
     if _engine is not None:
         _engine.dispose()
         _engine = None
         _session_factory = None
 
+    if _memory_database is not None:
+        _memory_database.connection.close()
+        _memory_database = None
+
     settings = get_settings()
     db_path = settings.database_path
     encrypted_path = Path(str(db_path) + ".enc")
 
+    if in_memory:
+        if memory_image is not None and settings.encryption_key:
+            with _encryption_lock:
+                _write_encrypted(io.BytesIO(memory_image), encrypted_path, settings.encryption_key)
+        return
+
     if db_path.exists() and settings.encryption_key:
-        fernet = _get_fernet(settings.encryption_key)
-        decrypted_data = db_path.read_bytes()
-        encrypted_data = fernet.encrypt(decrypted_data)
-        encrypted_path.write_bytes(encrypted_data)
+        _merge_wal(db_path)
+        with _encryption_lock, db_path.open("rb") as source:
+            _write_encrypted(source, encrypted_path, settings.encryption_key)
         # Try to delete, but it's fine if it fails - cleaned up on next start
         try:
-            db_path.unlink()
+            _remove_database_files(db_path)
         except PermissionError:
             pass
 
 
-def _configure_connection(dbapi_conn, connection_record) -> None:  # noqa: ANN001
-    """Configure SQLite connection (foreign keys)."""
+def _backup_image(source: sqlite3.Connection) -> bytes:
+    """Copy a consistent snapshot of ``source`` into memory and serialize it.
+
+    The copy never touches the disk, so no plaintext snapshot can be left
+    behind if the process dies mid-checkpoint.
+    """
+    snapshot = sqlite3.connect(":memory:")
+    try:
+        source.backup(snapshot)
+        return snapshot.serialize()
+    finally:
+        snapshot.close()
+
+
+def checkpoint_database() -> bool:
+    """Write an encrypted snapshot of the live database.
+
+    A consistent snapshot is taken with the SQLite online backup API while
+    the application keeps running, encrypted, and atomically swapped in for
+    the .enc file. Like shutdown, this updates the existing container
+    incrementally, re-encrypting only the chunks changed since the last
+    write. Returns False if there was nothing to checkpoint, or if the last
+    in-memory commit could not be isolated from an open transaction (the
+    caller should retry later).
+    """
     settings = get_settings()
-    cursor = dbapi_conn.cursor()
-    if settings.foreign_keys_enabled:
-        cursor.execute("PRAGMA foreign_keys = ON")
-    cursor.close()
+    db_path = settings.database_path
+    encrypted_path = Path(str(db_path) + ".enc")
+
+    if not settings.encryption_key:
+        return False
+
+    with _encryption_lock:
+        if _memory_database is not None:
+            # While a transaction is open this is the committed copy, never
+            # the live connection with its uncommitted changes
+            image = _memory_database.committed_image(timeout=0)
+            if image is None:
+                return False
+        else:
+            if not db_path.exists():
+                return False
+            source = sqlite3.connect(db_path)
+            try:
+                image = _backup_image(source)
+            finally:
+                source.close()
+
+        _write_encrypted(io.BytesIO(image), encrypted_path, settings.encryption_key)
+        return True
+
+
+def _configure_connection(dbapi_conn, connection_record) -> None:  # noqa: ANN001
+    """Configure SQLite connection (foreign keys and PRAGMA profile)."""
+    apply_pragmas(dbapi_conn)
 
 
 def get_engine() -> Engine:
@@ -99,13 +389,60 @@ def get_engine() -> Engine:
 
     if _engine is None:
         settings = get_settings()
-        _engine = create_engine(
-            settings.database_url,
+        if _memory_database is not None:
+            # Every checkout gets its own handle, so sessions don't share a
+            # transaction; closing a handle leaves the connection open
+            _engine = create_engine(
+                "sqlite://",
+                creator=lambda: SharedConnection(_memory_database),
+                poolclass=NullPool,
+                echo=settings.echo_sql,
+            )
+        else:
+            _engine = create_engine(
+                settings.database_url,
+                echo=settings.echo_sql,
+            )
+            event.listen(_engine, "connect", _configure_connection)
+        with _engine.connect() as connection:
+            apply_migrations(connection.connection.driver_connection)
+
+    return _engine
+
+
+def _configure_read_connection(dbapi_conn, connection_record) -> None:  # noqa: ANN001
+    """Configure a read-only SQLite connection."""
+    apply_pragmas(dbapi_conn, read_only=True)
+
+
+def get_read_engine() -> Engine:
+    """Get or create the read-only engine singleton.
+
+    Connections open the database file with ``mode=ro``, so they can never
+    take the write lock. Falls back to the writer engine in in-memory mode.
+    """
+    global _read_engine
+
+    if _read_engine is None:
+        if _memory_database is not None:
+            _read_engine = get_engine()
+            return _read_engine
+
+        settings = get_settings()
+        # Readers can't switch the file to WAL, so let the writer do it first
+        get_engine()
+        # Autocommit: each query reads the latest commit and holds no read
+        # transaction afterwards, so idle readers never pin a WAL snapshot
+        # (which would stop checkpoints and hide newer commits)
+        _read_engine = create_engine(
+            settings.read_only_database_url,
+            pool_size=settings.read_pool_size,
+            isolation_level="AUTOCOMMIT",
             echo=settings.echo_sql,
         )
-        event.listen(_engine, "connect", _configure_connection)
+        event.listen(_read_engine, "connect", _configure_read_connection)
 
-    return _engine
+    return _read_engine
 
 
 def get_session_factory() -> sessionmaker[Session]:
@@ -123,6 +460,32 @@ def get_session() -> Session:
     return get_session_factory()()
 
 
+def _refresh_on_read(orm_execute_state: ORMExecuteState) -> None:
+    """Overwrite already-loaded objects with the rows a read query returns.
+
+    Read sessions never hold changes of their own, so refreshing is safe and
+    keeps objects they loaded earlier from hiding newer commits.
+    """
+    if orm_execute_state.is_select:
+        orm_execute_state.update_execution_options(populate_existing=True)
+
+
+def get_read_session_factory() -> sessionmaker[Session]:
+    """Get or create the read-only session factory singleton."""
+    global _read_session_factory
+
+    if _read_session_factory is None:
+        _read_session_factory = sessionmaker(bind=get_read_engine())
+        event.listen(_read_session_factory, "do_orm_execute", _refresh_on_read)
+
+    return _read_session_factory
+
+
+def get_read_session() -> Session:
+    """Create a new session on the read-only engine."""
+    return get_read_session_factory()()
+
+
 @contextmanager
 def session_scope() -> Generator[Session, None, None]:
     """Provide a transactional scope around a series of operations."""
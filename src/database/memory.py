@@ -0,0 +1,248 @@
+"""Transaction-level locking for the shared in-memory database connection.
+
+An in-memory database lives in a single sqlite3 connection, and a
+connection has only one transaction. Without coordination every session
+would share it: one session's commit would commit another's flushed work,
+and a rollback (including the pool's reset when a session closes) would
+discard it.
+
+Each engine checkout gets its own ``SharedConnection`` handle on the real
+connection. The handle that opens a transaction (its first write) takes
+the database lock and keeps it until it commits or rolls back, so
+transactions run one at a time, as they would against a file. ``commit``
+and ``rollback`` on a handle that doesn't own the transaction do nothing.
+
+Other handles must not see the open transaction's changes, and shouldn't
+wait for it to finish just to read. Before a transaction starts, the
+database keeps a read-only copy of the last committed state (refreshed only
+when something was committed since the previous copy), and ``SELECT``
+statements from other handles run against that copy while the transaction
+is open, like readers of a WAL database. Anything else from another handle
+waits for the lock (up to the PRAGMA profile's ``busy_timeout``, then fails
+with "database is locked"). Reads outside any transaction run on the live
+connection and are fetched in full while holding the lock, so rows stepped
+later can't include a transaction that starts in the meantime.
+"""
+
+import re
+import sqlite3
+import threading
+from collections import deque
+from typing import Any, Iterable, Iterator
+
+from src.config import PRAGMA_PROFILES, get_settings
+
+# Statements sqlite3 opens a transaction for, or that open one explicitly
+_OPENS_TRANSACTION = re.compile(r"\s*(INSERT|UPDATE|DELETE|REPLACE|BEGIN|SAVEPOINT)\b", re.I)
+
+# Statements that may run against the committed copy
+_READ_ONLY = re.compile(r"\s*(SELECT|WITH)\b", re.I)
+
+
+class MemoryDatabase:
+    """The shared connection, the lock serializing its transactions and a
+    read-only copy of its last committed state."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.lock = threading.Lock()
+        self.owner: "SharedConnection | None" = None
+        # Bumped by every commit; the copy is current when the versions match
+        self.version = 0
+        self._snapshot: sqlite3.Connection | None = None
+        self._snapshot_version = -1
+
+    def acquire(self) -> None:
+        """Wait for the lock, up to the PRAGMA profile's busy timeout."""
+        settings = get_settings()
+        timeout = PRAGMA_PROFILES[settings.pragma_profile].get("busy_timeout", 5000) / 1000
+        if not self.lock.acquire(timeout=timeout):
+            raise sqlite3.OperationalError("database is locked")
+
+    def release(self) -> None:
+        """Release the lock after a statement or at the end of a transaction."""
+        self.owner = None
+        self.lock.release()
+
+    def snapshot(self) -> sqlite3.Connection | None:
+        """Return the committed copy if it reflects the latest commit."""
+        snapshot = self._snapshot
+        if snapshot is not None and self._snapshot_version == self.version:
+            return snapshot
+        return None
+
+    def refresh_snapshot(self) -> None:
+        """Copy the committed state if it changed; the caller holds the lock
+        and no transaction is open.
+
+        The copy is replaced rather than overwritten, so readers still
+        stepping through the previous one are unaffected.
+        """
+        if self._snapshot_version == self.version:
+            return
+        snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+        self.connection.backup(snapshot)
+        snapshot.execute("PRAGMA query_only = ON")
+        self._snapshot = snapshot
+        self._snapshot_version = self.version
+
+    def committed_image(self, timeout: float) -> bytes | None:
+        """Serialize the last committed state.
+
+        Waits up to ``timeout`` seconds for an open transaction to end, then
+        falls back to the committed copy. Returns None if neither is
+        available, rather than an image that includes uncommitted writes.
+        """
+        if self.lock.acquire(timeout=timeout):
+            try:
+                return self.connection.serialize()
+            finally:
+                self.lock.release()
+        snapshot = self.snapshot()
+        return snapshot.serialize() if snapshot is not None else None
+
+
+class _SharedCursor:
+    """Cursor whose statements run under the database lock."""
+
+    def __init__(self, handle: "SharedConnection") -> None:
+        self._handle = handle
+        self._cursor = handle.database.connection.cursor()
+        self._rows: deque | None = None
+
+    def _run(self, method: str, *args: Any) -> "_SharedCursor":
+        handle = self._handle
+        database = handle.database
+        connection = database.connection
+        self._rows = None
+
+        if database.owner is handle:
+            # Inside our own transaction: the lock is already held
+            self._cursor = connection.cursor()
+            try:
+                getattr(self._cursor, method)(*args)
+            finally:
+                if not connection.in_transaction:
+                    # executescript commits first
+                    database.version += 1
+                    database.release()
+            return self
+
+        if not database.lock.acquire(blocking=False):
+            if self._read_snapshot(method, *args):
+                return self
+            database.acquire()
+
+        self._cursor = connection.cursor()
+        try:
+            if not connection.in_transaction and (
+                method == "executescript" or _OPENS_TRANSACTION.match(args[0])
+            ):
+                database.refresh_snapshot()
+            changes = connection.total_changes
+            getattr(self._cursor, method)(*args)
+            if not connection.in_transaction:
+                if method == "executescript" or connection.total_changes != changes:
+                    database.version += 1
+                # Fetch now: the next statement may belong to a transaction
+                self._rows = deque(self._cursor.fetchall())
+        finally:
+            if connection.in_transaction:
+                database.owner = handle
+            else:
+                database.release()
+        return self
+
+    def _read_snapshot(self, method: str, *args: Any) -> bool:
+        """Run a read against the committed copy; False if it can't be used."""
+        snapshot = self._handle.database.snapshot()
+        if snapshot is None or method != "execute" or not _READ_ONLY.match(args[0]):
+            return False
+        cursor = snapshot.cursor()
+        try:
+            cursor.execute(*args)
+        except sqlite3.OperationalError:
+            # e.g. WITH ... INSERT, which the read-only copy refuses
+            return False
+        self._cursor = cursor
+        return True
+
+    def execute(self, sql: str, parameters: Any = ()) -> "_SharedCursor":
+        return self._run("execute", sql, parameters)
+
+    def executemany(self, sql: str, parameters: Iterable[Any]) -> "_SharedCursor":
+        return self._run("executemany", sql, parameters)
+
+    def executescript(self, script: str) -> "_SharedCursor":
+        return self._run("executescript", script)
+
+    def fetchone(self) -> Any:
+        if self._rows is None:
+            return self._cursor.fetchone()
+        return self._rows.popleft() if self._rows else None
+
+    def fetchmany(self, size: int | None = None) -> list[Any]:
+        size = size or self._cursor.arraysize
+        if self._rows is None:
+            return self._cursor.fetchmany(size)
+        return [self._rows.popleft() for _ in range(min(size, len(self._rows)))]
+
+    def fetchall(self) -> list[Any]:
+        if self._rows is None:
+            return self._cursor.fetchall()
+        rows, self._rows = list(self._rows), deque()
+        return rows
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+
+class SharedConnection:
+    """One session's handle on the shared in-memory connection (DBAPI-like)."""
+
+    def __init__(self, database: MemoryDatabase) -> None:
+        self.database = database
+
+    @property
+    def in_transaction(self) -> bool:
+        """True while this handle owns the open transaction."""
+        return self.database.owner is self
+
+    def cursor(self) -> _SharedCursor:
+        return _SharedCursor(self)
+
+    def execute(self, sql: str, parameters: Any = ()) -> _SharedCursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executescript(self, script: str) -> _SharedCursor:
+        return self.cursor().executescript(script)
+
+    def commit(self) -> None:
+        """Commit this handle's transaction; no-op if it has none."""
+        if self.in_transaction:
+            try:
+                self.database.connection.commit()
+                self.database.version += 1
+            finally:
+                self.database.release()
+
+    def rollback(self) -> None:
+        """Roll back this handle's transaction; no-op if it has none."""
+        if self.in_transaction:
+            try:
+                self.database.connection.rollback()
+            finally:
+                self.database.release()
+
+    def close(self) -> None:
+        """Drop the handle, rolling back any transaction it left open.
+
+        The shared connection itself stays open.
+        """
+        self.rollback()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.database.connection, name)
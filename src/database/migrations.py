@@ -0,0 +1,64 @@
+"""Schema migrations for existing databases.
+
+``database/schema.sql`` always creates the latest schema. Databases created
+from an older schema (including the shipped ``university.db.enc``) are
+brought up to date by the numbered scripts in ``database/migrations``
+(``001_fts5_search.sql``, ``002_...``). SQLite's ``user_version`` records the
+last script applied; ``schema.sql`` sets it to the latest number, so new
+databases skip them all.
+
+Pending migrations are applied when the writer engine is created.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+
+from src.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "database" / "migrations"
+
+
+def get_migrations() -> list[tuple[int, Path]]:
+    """Return the migration scripts as (version, path), in order."""
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        number = path.stem.partition("_")[0]
+        if number.isdigit():
+            migrations.append((int(number), path))
+    return sorted(migrations)
+
+
+def apply_migrations(connection: sqlite3.Connection) -> list[int]:
+    """Apply pending migrations and return the versions applied.
+
+    Each script runs in its own transaction together with the
+    ``user_version`` update, so a failed script leaves the database at the
+    previous version.
+    """
+    current = connection.execute("PRAGMA user_version").fetchone()[0]
+    has_schema = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' LIMIT 1"
+    ).fetchone()
+    if not has_schema:
+        # Empty database: nothing to migrate until schema.sql has been run
+        return []
+
+    applied = []
+    for version, path in get_migrations():
+        if version <= current:
+            continue
+        logger.info("Applying database migration %s", path.name)
+        try:
+            connection.executescript(
+                f"BEGIN;\n{path.read_text()}\nPRAGMA user_version = {version};\nCOMMIT;"
+            )
+        except sqlite3.Error as e:
+            if connection.in_transaction:
+                connection.rollback()
+            raise DatabaseError(f"Migration {path.name} failed: {e}", e) from e
+        applied.append(version)
+
+    return applied
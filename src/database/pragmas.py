@@ -0,0 +1,46 @@
+"""SQLite connection configuration shared by both connection stacks.
+
+Both the SQLAlchemy engine and the raw ``DatabaseConnection`` call
+``apply_pragmas`` on every new connection, so they always run with the
+same foreign key enforcement and performance profile.
+"""
+
+import logging
+from typing import Any
+
+from src.config import PRAGMA_PROFILES, get_settings
+from src.exceptions import ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+
+def apply_pragmas(
+    connection: Any,
+    profile: str | None = None,
+    read_only: bool = False,
+) -> None:
+    """Apply foreign key enforcement and a PRAGMA profile to a DBAPI connection.
+
+    Args:
+        connection: A DBAPI connection (sqlite3 or a driver adapter).
+        profile: Profile name from ``PRAGMA_PROFILES``; defaults to
+            ``Settings.pragma_profile``.
+        read_only: Skip PRAGMAs that write to the database file
+            (``journal_mode`` is persistent, so readers inherit it).
+    """
+    settings = get_settings()
+    profile = profile or settings.pragma_profile
+    if profile not in PRAGMA_PROFILES:
+        raise ConfigurationError(f"Unknown PRAGMA profile: {profile}")
+
+    cursor = connection.cursor()
+    try:
+        if settings.foreign_keys_enabled:
+            cursor.execute("PRAGMA foreign_keys = ON")
+        for name, value in PRAGMA_PROFILES[profile].items():
+            if read_only and name == "journal_mode":
+                continue
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+    logger.debug("Applied PRAGMA profile %r", profile)
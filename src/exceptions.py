@@ -46,6 +46,17 @@ class EntityNotFoundError(UniversityDBError):
         super().__init__(message)
 
 
+class EntitiesNotFoundError(EntityNotFoundError):
+    """Raised when some entities in a batch lookup do not exist."""
+
+    def __init__(self, entity_type: str, entity_ids: list[int]) -> None:
+        self.entity_type = entity_type
+        self.entity_id = entity_ids[0]
+        self.entity_ids = entity_ids
+        ids = ", ".join(str(entity_id) for entity_id in entity_ids)
+        UniversityDBError.__init__(self, f"{entity_type} with IDs {ids} not found")
+
+
 class ValidationError(UniversityDBError):
     """Raised when data validation fails."""
 
@@ -1,14 +1,98 @@
 """SQLAlchemy declarative base."""
 
-from typing import Any
+import json
+from operator import attrgetter
+from typing import Any, Callable, Iterable, NamedTuple
 
 from sqlalchemy.orm import DeclarativeBase
 
+from src.models import records as record_types
+
+try:
+    import orjson
+except ImportError:  # optional: to_json() falls back to the json module
+    orjson = None
+
+# Record classes checked by Base.record_class(), one per model
+_record_classes: dict[type, type[NamedTuple]] = {}
+
+# Column names and a getter returning their values as a tuple, one per model
+_serializers: dict[type, tuple[tuple[str, ...], Callable[[Any], tuple]]] = {}
+
+
+def _json_default(value: Any) -> str:
+    """Encode values JSON has no type for (dates, decimals) as strings."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
 
+    @classmethod
+    def _serializer(cls) -> tuple[tuple[str, ...], Callable[[Any], tuple]]:
+        """Return the model's column names and a getter for their values.
+
+        Built once per class: an ``attrgetter`` over every column fetches all
+        values in one C-level call instead of a ``getattr`` per column.
+        """
+        serializer = _serializers.get(cls)
+        if serializer is None:
+            names = tuple(c.name for c in cls.__table__.columns)
+            getter = attrgetter(*names)
+            if len(names) == 1:
+                # attrgetter returns a bare value for a single name
+                single = getter
+                getter = lambda entity: (single(entity),)  # noqa: E731
+            serializer = _serializers[cls] = (names, getter)
+        return serializer
+
     @property
     def as_dict(self) -> dict[str, Any]:
         """Return model attributes as a dictionary."""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        names, getter = self._serializer()
+        return dict(zip(names, getter(self)))
+
+    @classmethod
+    def to_records(cls, entities: Iterable["Base"]) -> list[dict[str, Any]]:
+        """Return ``as_dict`` for each entity, reusing the class serializer."""
+        names, getter = cls._serializer()
+        return [dict(zip(names, getter(entity))) for entity in entities]
+
+    @classmethod
+    def to_json(cls, entities: Iterable["Base"]) -> str:
+        """Serialize entities to a JSON array of their ``as_dict`` records.
+
+        Uses orjson when it is installed and the standard ``json`` module
+        otherwise; dates are written as ISO strings either way.
+        """
+        records = cls.to_records(entities)
+        if orjson is not None:
+            return orjson.dumps(records, default=_json_default).decode()
+        return json.dumps(records, default=_json_default, separators=(",", ":"))
+
+    @classmethod
+    def record_class(cls) -> type[NamedTuple]:
+        """Return a read-only record type with one field per table column.
+
+        Records (e.g. ``StudentRecord``, declared in ``src.models.records``)
+        are plain named tuples: no identity map, change tracking or lazy
+        loading, so a list of them costs a fraction of the memory and time
+        of the ORM objects. Raises TypeError if the declared fields no longer
+        match the table.
+        """
+        record_class = _record_classes.get(cls)
+        if record_class is None:
+            name = f"{cls.__name__}Record"
+            record_class = getattr(record_types, name, None)
+            if record_class is None:
+                raise TypeError(f"{name} is not declared in src.models.records")
+            columns = tuple(c.name for c in cls.__table__.columns)
+            if record_class._fields != columns:
+                raise TypeError(
+                    f"{name} fields {record_class._fields} do not match "
+                    f"{cls.__tablename__} columns {columns}"
+                )
+            _record_classes[cls] = record_class
+        return record_class
@@ -0,0 +1,188 @@
+"""Read-only row records, one named tuple per model.
+
+``Base.record_class()`` returns ``<Model>Record`` from this module, and the
+repositories' ``get_all_rows()`` and ``iter_rows()`` build them straight
+from query rows. Fields are the model's table columns, in table order;
+``record_class()`` checks they still match.
+"""
+
+from typing import NamedTuple
+
+
+class CourseRecord(NamedTuple):
+    """Row of ``course`` (see ``Course``)."""
+
+    course_id: int
+    course_code: str
+    name: str
+    description: str | None
+    dept_id: int | None
+    level: str | None
+    credits: int | None
+    schedule: str | None
+
+
+class CourseMaterialRecord(NamedTuple):
+    """Row of ``course_material`` (see ``CourseMaterial``)."""
+
+    material_id: int
+    course_id: int
+    title: str
+    material_type: str | None
+    url: str | None
+
+
+class DepartmentRecord(NamedTuple):
+    """Row of ``department`` (see ``Department``)."""
+
+    dept_id: int
+    name: str
+    faculty: str | None
+
+
+class ResearchAreaRecord(NamedTuple):
+    """Row of ``department_research_area`` (see ``ResearchArea``)."""
+
+    area_id: int
+    dept_id: int
+    area: str
+
+
+class LecturerRecord(NamedTuple):
+    """Row of ``lecturer`` (see ``Lecturer``)."""
+
+    lecturer_id: int
+    name: str
+    dept_id: int | None
+    course_load: int | None
+
+
+class LecturerExpertiseRecord(NamedTuple):
+    """Row of ``lecturer_expertise`` (see ``LecturerExpertise``)."""
+
+    expertise_id: int
+    lecturer_id: int
+    area: str
+
+
+class LecturerQualificationRecord(NamedTuple):
+    """Row of ``lecturer_qualification`` (see ``LecturerQualification``)."""
+
+    qualification_id: int
+    lecturer_id: int
+    qualification_name: str
+    institution: str | None
+    year_awarded: int | None
+
+
+class LecturerResearchInterestRecord(NamedTuple):
+    """Row of ``lecturer_research_interest`` (see ``LecturerResearchInterest``)."""
+
+    interest_id: int
+    lecturer_id: int
+    interest: str
+
+
+class PublicationRecord(NamedTuple):
+    """Row of ``publication`` (see ``Publication``)."""
+
+    publication_id: int
+    lecturer_id: int
+    title: str
+    journal: str | None
+    publication_date: str | None
+
+
+class ProgrammeRecord(NamedTuple):
+    """Row of ``programme`` (see ``Programme``)."""
+
+    programme_id: int
+    name: str
+    degree_awarded: str | None
+    duration_years: int | None
+    enrolment_details: str | None
+
+
+class ProjectFundingRecord(NamedTuple):
+    """Row of ``project_funding`` (see ``ProjectFunding``)."""
+
+    funding_id: int
+    project_id: int
+    source_name: str
+    amount: float | None
+
+
+class ProjectOutcomeRecord(NamedTuple):
+    """Row of ``project_outcome`` (see ``ProjectOutcome``)."""
+
+    outcome_id: int
+    project_id: int
+    description: str
+    outcome_date: str | None
+
+
+class ProjectPublicationRecord(NamedTuple):
+    """Row of ``project_publication`` (see ``ProjectPublication``)."""
+
+    project_pub_id: int
+    project_id: int
+    title: str
+    publication_date: str | None
+
+
+class ResearchProjectRecord(NamedTuple):
+    """Row of ``research_project`` (see ``ResearchProject``)."""
+
+    project_id: int
+    title: str
+    head_lecturer_id: int
+    dept_id: int | None
+    start_date: str | None
+    end_date: str | None
+
+
+class NonAcademicStaffRecord(NamedTuple):
+    """Row of ``non_academic_staff`` (see ``NonAcademicStaff``)."""
+
+    staff_id: int
+    name: str
+    job_title: str | None
+    dept_id: int | None
+    employment_type: str | None
+    contract_details: str | None
+    salary: float | None
+    emergency_contact: str | None
+
+
+class DisciplinaryRecordRecord(NamedTuple):
+    """Row of ``disciplinary_record`` (see ``DisciplinaryRecord``)."""
+
+    record_id: int
+    student_id: int
+    incident_date: str | None
+    description: str | None
+    action_taken: str | None
+
+
+class StudentRecord(NamedTuple):
+    """Row of ``student`` (see ``Student``)."""
+
+    student_id: int
+    name: str
+    date_of_birth: str | None
+    contact_info: str | None
+    programme_id: int | None
+    year_of_study: int | None
+    graduation_status: str | None
+    advisor_id: int | None
+
+
+class StudentGradeRecord(NamedTuple):
+    """Row of ``student_grade`` (see ``StudentGrade``)."""
+
+    grade_id: int
+    student_id: int
+    course_id: int
+    assessment_type: str | None
+    grade: int | None
+    date_recorded: str | None
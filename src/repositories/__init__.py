@@ -1,23 +1,66 @@
 """Repository layer for database access."""
 
+from src.repositories.async_repository import (
+    AsyncBaseRepository,
+    AsyncCourseRepository,
+    AsyncDepartmentRepository,
+    AsyncLecturerRepository,
+    AsyncProgrammeRepository,
+    AsyncResearchProjectRepository,
+    AsyncStaffRepository,
+    AsyncStudentRepository,
+)
 from src.repositories.base import BaseRepository
+from src.repositories.cache import (
+    CacheStats,
+    EntityCache,
+    QueryCache,
+    cached_query,
+    get_entity_cache,
+    get_query_cache,
+)
 from src.repositories.course_repository import CourseRepository
 from src.repositories.department_repository import DepartmentRepository
 from src.repositories.factory import RepositoryFactory
 from src.repositories.lecturer_repository import LecturerRepository
+from src.repositories.loading import LoadSpec, load_options
 from src.repositories.programme_repository import ProgrammeRepository
 from src.repositories.research_repository import ResearchProjectRepository
 from src.repositories.staff_repository import StaffRepository
-from src.repositories.student_repository import StudentRepository
+from src.repositories.student_repository import (
+    CourseAverage,
+    HighPerformingStudent,
+    StudentProfile,
+    StudentRepository,
+)
 
 __all__ = [
+    "AsyncBaseRepository",
+    "AsyncCourseRepository",
+    "AsyncDepartmentRepository",
+    "AsyncLecturerRepository",
+    "AsyncProgrammeRepository",
+    "AsyncResearchProjectRepository",
+    "AsyncStaffRepository",
+    "AsyncStudentRepository",
     "BaseRepository",
+    "CacheStats",
+    "CourseAverage",
     "CourseRepository",
     "DepartmentRepository",
+    "EntityCache",
+    "HighPerformingStudent",
     "LecturerRepository",
+    "LoadSpec",
     "ProgrammeRepository",
+    "QueryCache",
     "RepositoryFactory",
     "ResearchProjectRepository",
     "StaffRepository",
+    "StudentProfile",
     "StudentRepository",
+    "cached_query",
+    "get_entity_cache",
+    "get_query_cache",
+    "load_options",
 ]
@@ -0,0 +1,202 @@
+"""Async repositories for use from the NiceGUI event loop.
+
+Each ``Async*Repository`` exposes the same methods as its sync counterpart,
+returning awaitables. Calls run the sync repository's method inside
+``AsyncSession.run_sync``, so the query logic lives in one place.
+
+A sync ``Session`` may be passed instead (``async_session_scope`` does so in
+in-memory mode, where there is no async engine); calls then run on a worker
+thread with ``asyncio.to_thread``, so they don't block the event loop either.
+
+Relationships are not lazy-loaded on returned entities once the call has
+finished; request them with ``load=[...]`` (see ``src.repositories.loading``),
+read the foreign key columns or query the related repository.
+
+Example:
+    async with async_session_scope() as session:
+        repo = AsyncStudentRepository(session)
+        student = await repo.get_by_id(1)
+        grades = await repo.get_grades(student.student_id, load=["course"])
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, Generic, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.database import get_async_session, get_session
+from src.models.base import Base
+from src.models.course import Course
+from src.models.department import Department
+from src.models.lecturer import Lecturer
+from src.models.programme import Programme
+from src.models.research import ResearchProject
+from src.models.staff import NonAcademicStaff
+from src.models.student import Student
+from src.repositories.base import BaseRepository
+from src.repositories.course_repository import CourseRepository
+from src.repositories.department_repository import DepartmentRepository
+from src.repositories.lecturer_repository import LecturerRepository
+from src.repositories.loading import LoadSpec
+from src.repositories.programme_repository import ProgrammeRepository
+from src.repositories.research_repository import ResearchProjectRepository
+from src.repositories.staff_repository import StaffRepository
+from src.repositories.student_repository import StudentRepository
+
+T = TypeVar("T", bound=Base)
+
+
+class AsyncBaseRepository(Generic[T]):
+    """Async wrapper running a sync repository on an ``AsyncSession``.
+
+    Subclasses set ``repository_class``. Methods other than the common CRUD
+    ones below are forwarded by name.
+    """
+
+    repository_class: type[BaseRepository]
+
+    def __init__(self, session: AsyncSession | Session | None = None) -> None:
+        if session is None:
+            # In-memory databases have no async engine; use a sync session
+            session = get_session() if get_settings().in_memory else get_async_session()
+        self._session = session
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run a sync repository method on the session's connection."""
+
+        def call(session: Session) -> Any:
+            repository = self.repository_class(session)
+            return getattr(repository, method)(*args, **kwargs)
+
+        if isinstance(self._session, Session):
+            return await asyncio.to_thread(call, self._session)
+        return await self._session.run_sync(call)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        """Forward public repository methods as coroutines."""
+        if name.startswith("_") or not callable(
+            getattr(self.repository_class, name, None)
+        ):
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+
+        async def method(*args: Any, **kwargs: Any) -> Any:
+            return await self._call(name, *args, **kwargs)
+
+        method.__name__ = name
+        return method
+
+    async def get_by_id(self, entity_id: int, *, load: LoadSpec = None) -> T:
+        """Retrieve an entity by its primary key."""
+        return await self._call("get_by_id", entity_id, load=load)
+
+    async def get_all(self, *, load: LoadSpec = None) -> list[T]:
+        """Retrieve all entities."""
+        return await self._call("get_all", load=load)
+
+    async def get_page(
+        self,
+        after_id: int | None = None,
+        limit: int = 50,
+        order_by: str | None = None,
+        *,
+        load: LoadSpec = None,
+    ) -> list[T]:
+        """Retrieve the next page of entities using keyset pagination."""
+        return await self._call("get_page", after_id, limit, order_by, load=load)
+
+    async def iter_all(
+        self,
+        batch_size: int = 500,
+        *,
+        load: LoadSpec = None,
+    ) -> AsyncIterator[T]:
+        """Iterate over all entities, one primary key page at a time."""
+        after_id = None
+        while True:
+            page = await self.get_page(after_id, batch_size, load=load)
+            for entity in page:
+                yield entity
+            if len(page) < batch_size:
+                break
+            after_id = inspect(page[-1]).identity[0]
+
+    async def exists(self, entity_id: int) -> bool:
+        """Check if an entity exists by its primary key."""
+        return await self._call("exists", entity_id)
+
+    async def count(self) -> int:
+        """Count the total number of entities."""
+        return await self._call("count")
+
+    async def create(self, **kwargs: Any) -> T:
+        """Create a new entity and return it."""
+        return await self._call("create", **kwargs)
+
+    async def update(self, entity_id: int, **kwargs: Any) -> T:
+        """Update an existing entity and return it."""
+        return await self._call("update", entity_id, **kwargs)
+
+    async def delete(self, entity_id: int) -> bool:
+        """Delete an entity by its primary key."""
+        return await self._call("delete", entity_id)
+
+    async def commit(self) -> None:
+        """Commit the current transaction."""
+        if isinstance(self._session, Session):
+            await asyncio.to_thread(self._session.commit)
+        else:
+            await self._session.commit()
+
+    async def rollback(self) -> None:
+        """Rollback the current transaction."""
+        if isinstance(self._session, Session):
+            await asyncio.to_thread(self._session.rollback)
+        else:
+            await self._session.rollback()
+
+
+class AsyncStudentRepository(AsyncBaseRepository[Student]):
+    """Async counterpart of ``StudentRepository``."""
+
+    repository_class = StudentRepository
+
+
+class AsyncLecturerRepository(AsyncBaseRepository[Lecturer]):
+    """Async counterpart of ``LecturerRepository``."""
+
+    repository_class = LecturerRepository
+
+
+class AsyncCourseRepository(AsyncBaseRepository[Course]):
+    """Async counterpart of ``CourseRepository``."""
+
+    repository_class = CourseRepository
+
+
+class AsyncDepartmentRepository(AsyncBaseRepository[Department]):
+    """Async counterpart of ``DepartmentRepository``."""
+
+    repository_class = DepartmentRepository
+
+
+class AsyncProgrammeRepository(AsyncBaseRepository[Programme]):
+    """Async counterpart of ``ProgrammeRepository``."""
+
+    repository_class = ProgrammeRepository
+
+
+class AsyncStaffRepository(AsyncBaseRepository[NonAcademicStaff]):
+    """Async counterpart of ``StaffRepository``."""
+
+    repository_class = StaffRepository
+
+
+class AsyncResearchProjectRepository(AsyncBaseRepository[ResearchProject]):
+    """Async counterpart of ``ResearchProjectRepository``."""
+
+    repository_class = ResearchProjectRepository
@@ -1,25 +1,163 @@
 """Base repository providing common database operations using SQLAlchemy."""
 
+import logging
+import re
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    TypeVar,
+)
 
-from sqlalchemy import func, select
+import pandas as pd
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    bindparam,
+    column,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    table,
+    tuple_,
+    update,
+)
 from sqlalchemy.exc import IntegrityError as SAIntegrityError
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.orm.util import identity_key
 
 from src.database import get_session
-from src.exceptions import DatabaseError, EntityNotFoundError, IntegrityError
+from src.exceptions import (
+    DatabaseError,
+    EntitiesNotFoundError,
+    EntityNotFoundError,
+    IntegrityError,
+    ValidationError,
+)
 from src.models.base import Base
+from src.repositories import columnar
+from src.repositories.cache import get_entity_cache, hydrate, invalidate_on_commit
+from src.repositories.loading import LoadSpec, apply_load, install_strict_loading
+
+if TYPE_CHECKING:
+    import pyarrow
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=Base)
+M = TypeVar("M", bound=Base)
+
+# Rows per statement for the bulk methods and batched lookups
+BULK_CHUNK_SIZE = 500
+
+# Default maximum number of search() results
+SEARCH_LIMIT = 50
+
+# search() modes: word prefixes (FTS5) or substrings (trigram index)
+SEARCH_MODES = ("prefix", "substring")
+
+# Session.info flag: the session has written rows it hasn't committed yet
+_UNCOMMITTED_WRITES_KEY = "uncommitted_writes"
+
+_tracking_lock = threading.Lock()
+_tracking_installed = False
+
+
+def _mark_flush(session: Session, flush_context: Any) -> None:
+    """Record that a flush wrote rows in the session's transaction."""
+    session.info[_UNCOMMITTED_WRITES_KEY] = True
+
+
+def _mark_execute(orm_execute_state: ORMExecuteState) -> None:
+    """Record INSERT/UPDATE/DELETE statements run through the session."""
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_UNCOMMITTED_WRITES_KEY] = True
+
+
+def _clear_writes(session: Session, *args: Any) -> None:
+    """Forget recorded writes once the transaction commits or rolls back."""
+    session.info.pop(_UNCOMMITTED_WRITES_KEY, None)
+
+
+def _install_write_tracking() -> None:
+    """Register the session events behind ``has_uncommitted_writes`` (once)."""
+    global _tracking_installed
+
+    if _tracking_installed:
+        return
+    with _tracking_lock:
+        if not _tracking_installed:
+            event.listen(Session, "after_flush", _mark_flush)
+            event.listen(Session, "do_orm_execute", _mark_execute)
+            event.listen(Session, "after_commit", _clear_writes)
+            event.listen(Session, "after_rollback", _clear_writes)
+            _tracking_installed = True
+
+
+def has_uncommitted_writes(session: Session) -> bool:
+    """Return True if ``session`` has pending or flushed-but-uncommitted changes."""
+    return bool(
+        session.new
+        or session.dirty
+        or session.deleted
+        or session.info.get(_UNCOMMITTED_WRITES_KEY)
+    )
+
+
+def _chunks(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    """Split rows into lists of at most ``size`` items."""
+    chunk: list[dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
 class BaseRepository(ABC, Generic[T]):
-    """Abstract base repository for SQLAlchemy ORM operations."""
+    """Abstract base repository for SQLAlchemy ORM operations.
+
+    Writes go through ``session``; ``get_*``, ``search`` and other queries go
+    through ``read_session`` when one is given (see ``get_read_session``),
+    otherwise through the same session. While the writer has changes it
+    hasn't committed, queries use the writer instead, so a unit of work
+    always sees its own writes.
+    """
 
-    def __init__(self, session: Session | None = None) -> None:
+    # FTS5 table indexing ``search_columns`` (see database/schema.sql)
+    fts_table: str | None = None
+    # FTS5 trigram table indexing ``search_columns`` for substring search
+    trigram_table: str | None = None
+    # Columns matched by search(); the first orders results without FTS
+    search_columns: tuple[str, ...] = ()
+    # Low-cardinality text columns loaded as categoricals by to_dataframe()
+    categorical_columns: tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        read_session: Session | None = None,
+    ) -> None:
         self._session = session or get_session()
+        self._reader = read_session or self._session
+        _install_write_tracking()
+        install_strict_loading()
 
     @property
     @abstractmethod
@@ -27,32 +165,337 @@ class BaseRepository(ABC, Generic[T]):
         """The ORM model class for this repository."""
         pass
 
+    @property
+    def _read_session(self) -> Session:
+        """Session for queries: the writer while it has uncommitted changes."""
+        if self._reader is not self._session and has_uncommitted_writes(self._session):
+            return self._session
+        return self._reader
+
+    @property
+    def _reads_uncommitted(self) -> bool:
+        """True while queries can see writes that aren't committed yet."""
+        return has_uncommitted_writes(self._session)
+
     @property
     def _primary_key(self) -> str:
         """Get the primary key column name from the model."""
         return self.model_class.__mapper__.primary_key[0].name
 
-    def get_by_id(self, entity_id: int) -> T:
-        """Retrieve an entity by its primary key."""
-        entity = self._session.get(self.model_class, entity_id)
+    def _scalars(self, stmt: Select, load: LoadSpec = None) -> list[Any]:
+        """Run a select on the read session, eager loading ``load`` paths."""
+        if load:
+            stmt = apply_load(stmt, stmt.column_descriptions[0]["entity"], load)
+        return list(self._read_session.scalars(stmt).all())
+
+    def _loaded(self, entity_id: int) -> T | None:
+        """Return an entity from the session or the entity cache, without a query."""
+        key = identity_key(self.model_class, entity_id)
+        entity = self._read_session.identity_map.get(key)
+        # Expired entities would each reload with their own SELECT
+        if entity is not None and not inspect(entity).expired:
+            return entity
+
+        values = get_entity_cache().get(self.model_class, entity_id)
+        if values is None:
+            return None
+        return hydrate(self._read_session, self.model_class, values)
+
+    def get_by_id(self, entity_id: int, *, load: LoadSpec = None) -> T:
+        """Retrieve an entity by its primary key.
+
+        ``load`` lists relationship paths to eager load (see
+        ``src.repositories.loading``); the entity is then always queried.
+        """
+        entity = None if load else self._loaded(entity_id)
         if entity is None:
-            raise EntityNotFoundError(self.model_class.__tablename__, entity_id)
+            if load:
+                pk = self.model_class.__mapper__.primary_key[0]
+                stmt = select(self.model_class).where(pk == entity_id)
+                entity = self._read_session.scalar(apply_load(stmt, self.model_class, load))
+            else:
+                entity = self._read_session.get(self.model_class, entity_id)
+            if entity is None:
+                raise EntityNotFoundError(self.model_class.__tablename__, entity_id)
+            get_entity_cache().put(entity)
         return entity
 
-    def get_all(self) -> list[T]:
+    def get_many(
+        self,
+        entity_ids: Iterable[int],
+        strict: bool = False,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        *,
+        load: LoadSpec = None,
+    ) -> dict[int, T]:
+        """Retrieve several entities by primary key in as few queries as possible.
+
+        Entities already loaded in the session or the entity cache are
+        returned without a query; the rest are fetched with one ``IN (...)``
+        query per chunk. With ``load``, every entity is queried so its
+        relationships are eager loaded.
+
+        Returns a dict keyed by ID, in the order of ``entity_ids``. IDs that
+        don't exist are left out, or reported together in one
+        ``EntitiesNotFoundError`` if ``strict``.
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        found: dict[int, T] = {}
+        missing: list[int] = []
+        for entity_id in entity_ids:
+            entity = None if load else self._loaded(entity_id)
+            if entity is not None:
+                found[entity_id] = entity
+            else:
+                missing.append(entity_id)
+
+        cache = get_entity_cache()
+
+        pk = self.model_class.__mapper__.primary_key[0]
+        for start in range(0, len(missing), chunk_size):
+            stmt = select(self.model_class).where(
+                pk.in_(missing[start : start + chunk_size])
+            )
+            for entity in self._read_session.scalars(apply_load(stmt, self.model_class, load)):
+                found[getattr(entity, self._primary_key)] = entity
+                cache.put(entity)
+
+        if strict:
+            not_found = [entity_id for entity_id in missing if entity_id not in found]
+            if not_found:
+                raise EntitiesNotFoundError(self.model_class.__tablename__, not_found)
+        return {entity_id: found[entity_id] for entity_id in entity_ids if entity_id in found}
+
+    def get_all(self, *, load: LoadSpec = None) -> list[T]:
         """Retrieve all entities."""
+        return self._scalars(select(self.model_class), load)
+
+    def get_page(
+        self,
+        after_id: int | None = None,
+        limit: int = 50,
+        order_by: str | None = None,
+        *,
+        load: LoadSpec = None,
+    ) -> list[T]:
+        """Retrieve the next page of entities using keyset pagination.
+
+        Args:
+            after_id: Primary key of the last entity on the previous page,
+                or None for the first page.
+            limit: Maximum number of entities to return.
+            order_by: Column name to sort by; ties (and the default order)
+                fall back to the primary key. Use a NOT NULL column: NULLs
+                can't be compared against the previous page's key.
+
+        Pass the primary key of the last returned entity as ``after_id`` to
+        fetch the following page. Unlike OFFSET, each page is an index seek,
+        so late pages cost the same as the first.
+        """
+        if limit <= 0:
+            raise ValueError("Page limit must be positive")
+
+        pk = self.model_class.__mapper__.primary_key[0]
         stmt = select(self.model_class)
-        return list(self._session.scalars(stmt).all())
+
+        if order_by is None:
+            if after_id is not None:
+                stmt = stmt.where(pk > after_id)
+            stmt = stmt.order_by(pk)
+        else:
+            columns = self.model_class.__table__.c
+            if order_by not in columns:
+                raise ValueError(
+                    f"Unknown column for {self.model_class.__tablename__}: {order_by}"
+                )
+            column = columns[order_by]
+            if after_id is not None:
+                after_value = select(column).where(pk == after_id).scalar_subquery()
+                stmt = stmt.where(tuple_(column, pk) > tuple_(after_value, after_id))
+            stmt = stmt.order_by(column, pk)
+
+        return self._scalars(stmt.limit(limit), load)
+
+    def iter_all(self, batch_size: int = 500, *, load: LoadSpec = None) -> Iterator[T]:
+        """Iterate over all entities, fetching ``batch_size`` rows at a time.
+
+        Rows are streamed from the cursor rather than loaded up front, so
+        memory use depends on the batch size, not the table size. ``load``
+        relationships are eager loaded once per batch.
+        """
+        pk = self.model_class.__mapper__.primary_key[0]
+        stmt = (
+            select(self.model_class)
+            .order_by(pk)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self._read_session.scalars(apply_load(stmt, self.model_class, load))
+
+    def _row_select(self) -> Select:
+        """Select every table column of the model, without the ORM entity."""
+        return select(*self.model_class.__table__.columns)
+
+    def get_all_rows(self) -> list[NamedTuple]:
+        """Retrieve all rows as read-only records (see ``Base.record_class``).
+
+        For list views and exports: skips building ORM entities, so it is
+        much cheaper than ``get_all()`` for large tables.
+        """
+        record = self.model_class.record_class()
+        pk = self.model_class.__mapper__.primary_key[0]
+        result = self._read_session.execute(self._row_select().order_by(pk))
+        return list(map(record._make, result.tuples()))
+
+    def iter_rows(self, batch_size: int = 500) -> Iterator[NamedTuple]:
+        """Iterate over all rows as records, fetching ``batch_size`` at a time."""
+        record = self.model_class.record_class()
+        pk = self.model_class.__mapper__.primary_key[0]
+        stmt = self._row_select().order_by(pk).execution_options(yield_per=batch_size)
+        for partition in self._read_session.execute(stmt).tuples().partitions():
+            yield from map(record._make, partition)
+
+    def to_dataframe(
+        self,
+        filters: Mapping[str, Any] | None = None,
+        columns: Iterable[str] | None = None,
+        batch_size: int = 5000,
+    ) -> pd.DataFrame:
+        """Load rows straight into a pandas DataFrame, in primary key order.
+
+        Args:
+            filters: Column name to value: equality, ``IS NULL`` for None, or
+                ``IN`` for a list, tuple or set.
+            columns: Column names to load (default: all table columns).
+            batch_size: Rows fetched from the cursor at a time.
+
+        Rows are streamed into per-column lists, with no ORM entities, and
+        typed from the table definition (see ``src.repositories.columnar``).
+        """
+        stmt, selected = columnar.build_select(self.model_class.__table__, filters, columns)
+        data = columnar.fetch_columns(self._read_session, stmt, len(selected), batch_size)
+        return columnar.to_dataframe(selected, data, self.categorical_columns)
+
+    def to_arrow(
+        self,
+        filters: Mapping[str, Any] | None = None,
+        columns: Iterable[str] | None = None,
+        batch_size: int = 5000,
+    ) -> "pyarrow.Table":
+        """Load rows into a ``pyarrow.Table``; see ``to_dataframe``.
+
+        Requires the optional pyarrow package.
+        """
+        stmt, selected = columnar.build_select(self.model_class.__table__, filters, columns)
+        data = columnar.fetch_columns(self._read_session, stmt, len(selected), batch_size)
+        return columnar.to_arrow(selected, data, self.categorical_columns)
+
+    def _search(self, term: str, limit: int | None, mode: str = "prefix") -> list[T]:
+        """Search ``search_columns`` for ``term``.
+
+        In ``"prefix"`` mode every word in ``term`` must prefix-match a word
+        in one of the columns, using the FTS5 index ranked by bm25. In
+        ``"substring"`` mode a column must contain ``term`` anywhere, using
+        the trigram index, ordered by the first column. Without an index
+        (FTS5 unavailable or the database not migrated), or for terms the
+        index can't match, falls back to a case-insensitive LIKE scan.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValidationError(
+                "mode", f"must be one of {', '.join(SEARCH_MODES)}, got {mode!r}"
+            )
+
+        if mode == "substring":
+            order_by = getattr(self.model_class, self.search_columns[0])
+            return self._scalars_with_fallback(
+                lambda use_index: select(self.model_class)
+                .where(self._contains(self.search_columns, term, use_index=use_index))
+                .order_by(order_by)
+                .limit(limit)
+            )
+
+        words = re.findall(r"\w+", term)
+        if self.fts_table and words:
+            fts = table(self.fts_table, column("rowid"), column("rank"))
+            pk = getattr(self.model_class, self._primary_key)
+            # Quoted so FTS5 query syntax in the term is matched literally
+            query = " ".join(f'"{word}"*' for word in words)
+            stmt = (
+                select(self.model_class)
+                .join(fts, fts.c.rowid == pk)
+                .where(literal_column(self.fts_table).op("MATCH")(query))
+                .order_by(fts.c.rank, pk)
+                .limit(limit)
+            )
+            try:
+                return list(self._read_session.scalars(stmt).all())
+            except OperationalError as e:
+                logger.debug("Full-text search unavailable, using LIKE: %s", e)
+
+        stmt = (
+            select(self.model_class)
+            .where(self._contains(self.search_columns, term, use_index=False))
+            .order_by(getattr(self.model_class, self.search_columns[0]))
+            .limit(limit)
+        )
+        return list(self._read_session.scalars(stmt).all())
+
+    def _contains(
+        self,
+        columns: Iterable[str],
+        term: str,
+        model: type[Base] | None = None,
+        trigram_table: str | None = None,
+        use_index: bool = True,
+    ) -> ColumnElement[bool]:
+        """Condition: one of ``columns`` of ``model`` contains ``term``.
+
+        Case-insensitive, like ``lower(column) LIKE '%term%'``, but looked up
+        in the trigram index (``trigram_table``, by default this
+        repository's) when ``use_index`` is set. Trigrams can't match terms
+        shorter than three characters, so those always use LIKE. Either way
+        ``term`` is matched literally.
+        """
+        model = model or self.model_class
+        columns = list(columns)
+        if trigram_table is None and model is self.model_class:
+            trigram_table = self.trigram_table
+        if use_index and trigram_table and len(term) >= 3:
+            trigram = table(trigram_table, column("rowid"))
+            # Column filter plus a quoted string, so the term is matched literally
+            query = "{%s} : \"%s\"" % (" ".join(columns), term.replace('"', '""'))
+            matches = select(trigram.c.rowid).where(
+                literal_column(trigram_table).op("MATCH")(query)
+            )
+            return model.__mapper__.primary_key[0].in_(matches)
+
+        # Escape LIKE wildcards so "%" and "_" match literally, as in the index
+        escaped = re.sub(r"([\\%_])", r"\\\1", term)
+        pattern = func.lower(f"%{escaped}%")
+        return or_(
+            *(func.lower(getattr(model, name)).like(pattern, escape="\\") for name in columns)
+        )
+
+    def _scalars_with_fallback(
+        self,
+        build: Callable[[bool], Select],
+        load: LoadSpec = None,
+    ) -> list[Any]:
+        """Run ``build(True)``, or ``build(False)`` if the index is missing."""
+        try:
+            return self._scalars(build(True), load)
+        except OperationalError as e:
+            logger.debug("Trigram index unavailable, using LIKE: %s", e)
+            return self._scalars(build(False), load)
 
     def exists(self, entity_id: int) -> bool:
         """Check if an entity exists by its primary key."""
-        entity = self._session.get(self.model_class, entity_id)
+        entity = self._read_session.get(self.model_class, entity_id)
         return entity is not None
 
     def count(self) -> int:
         """Count the total number of entities."""
         stmt = select(func.count()).select_from(self.model_class)
-        return self._session.scalar(stmt) or 0
+        return self._read_session.scalar(stmt) or 0
 
     def create(self, **kwargs: Any) -> T:
         """Create a new entity and return it."""
@@ -60,11 +503,7 @@ class BaseRepository(ABC, Generic[T]):
             raise ValueError("No fields provided for create")
 
         try:
-            entity = self.model_class(**kwargs)
-            self._session.add(entity)
-            self._session.flush()
-            self._session.refresh(entity)
-            return entity
+            return self._insert_returning(self.model_class, **kwargs)
         except SAIntegrityError as e:
             self._session.rollback()
             raise IntegrityError(str(e.orig), e) from e
@@ -72,6 +511,26 @@ class BaseRepository(ABC, Generic[T]):
             self._session.rollback()
             raise DatabaseError(str(e), e) from e
 
+    def _insert_returning(self, model: type[M], **values: Any) -> M:
+        """Insert one row and return it as a persistent entity.
+
+        Uses a single INSERT ... RETURNING (SQLite 3.35+) to get the
+        generated key and defaults back, instead of a flush followed by a
+        refresh SELECT. Falls back to flush and refresh on older SQLite or
+        when ``values`` include something other than column attributes.
+        """
+        columns = model.__mapper__.column_attrs.keys()
+        returning = self._session.get_bind().dialect.insert_returning
+        if returning and all(key in columns for key in values):
+            stmt = insert(model).values(**values).returning(model)
+            return self._session.scalars(stmt).one()
+
+        entity = model(**values)
+        self._session.add(entity)
+        self._session.flush()
+        self._session.refresh(entity)
+        return entity
+
     def update(self, entity_id: int, **kwargs: Any) -> T:
         """Update an existing entity and return it."""
         if not kwargs:
@@ -112,6 +571,115 @@ class BaseRepository(ABC, Generic[T]):
             self._session.rollback()
             raise DatabaseError(str(e), e) from e
 
+    def bulk_create(
+        self,
+        rows: Iterable[dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> list[int]:
+        """Insert many entities and return their generated primary keys.
+
+        Rows are sent as one multi-row INSERT ... RETURNING per chunk,
+        without loading or refreshing ORM objects. IDs are returned in the
+        order of ``rows``. On SQLite older than 3.35 (no RETURNING) each row
+        is inserted separately and its ``lastrowid`` taken instead.
+        """
+        pk = self.model_class.__mapper__.primary_key[0]
+        dialect = self._session.get_bind().dialect
+        ids: list[int] = []
+
+        try:
+            if not dialect.insert_executemany_returning_sort_by_parameter_order:
+                stmt = insert(self.model_class.__table__)
+                for row in rows:
+                    result = self._session.execute(stmt, row)
+                    ids.append(result.inserted_primary_key[0])
+                return ids
+
+            stmt = insert(self.model_class).returning(pk, sort_by_parameter_order=True)
+            for chunk in _chunks(rows, chunk_size):
+                ids.extend(self._session.scalars(stmt, chunk).all())
+            return ids
+        except SAIntegrityError as e:
+            self._session.rollback()
+            raise IntegrityError(str(e.orig), e) from e
+        except SQLAlchemyError as e:
+            self._session.rollback()
+            raise DatabaseError(str(e), e) from e
+
+    def bulk_update(
+        self,
+        rows: Iterable[dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> int:
+        """Update many entities by primary key and return the rows matched.
+
+        Each row must contain the primary key plus the fields to change.
+        Every row is checked before anything is executed, so an invalid row
+        leaves the database untouched. Entities are not loaded first; rows
+        in a chunk that change the same fields are sent as one executemany
+        UPDATE. Entities already loaded in the session keep their old values
+        until the next commit.
+        """
+        pk = self._primary_key
+        table = self.model_class.__table__
+        updated = 0
+
+        rows = list(rows)
+        for row in rows:
+            if pk not in row:
+                raise ValueError(f"Every row must include the primary key {pk!r}")
+            if len(row) < 2:
+                raise ValueError("No fields provided for update")
+
+        try:
+            for chunk in _chunks(rows, chunk_size):
+                groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+                for row in chunk:
+                    fields = tuple(sorted(key for key in row if key != pk))
+                    # Bind names must not clash with the SET column names
+                    groups.setdefault(fields, []).append(
+                        {f"b_{key}": value for key, value in row.items()}
+                    )
+
+                for row in chunk:
+                    invalidate_on_commit(self._session, self.model_class, row[pk])
+                for fields, params in groups.items():
+                    stmt = (
+                        update(table)
+                        .where(table.c[pk] == bindparam(f"b_{pk}"))
+                        .values({field: bindparam(f"b_{field}") for field in fields})
+                    )
+                    result = self._session.execute(stmt, params)
+                    updated += result.rowcount
+            return updated
+        except SAIntegrityError as e:
+            self._session.rollback()
+            raise IntegrityError(str(e.orig), e) from e
+        except SQLAlchemyError as e:
+            self._session.rollback()
+            raise DatabaseError(str(e), e) from e
+
+    def delete_where(self, *criteria: ColumnElement[bool], **filters: Any) -> int:
+        """Delete all entities matching the criteria and return the count.
+
+        Accepts SQL expressions (``Student.year_of_study > 3``) and/or
+        column equality filters (``programme_id=2``) in one DELETE statement.
+        """
+        if not criteria and not filters:
+            raise ValueError("No criteria provided for delete_where")
+
+        stmt = delete(self.model_class).where(*criteria).filter_by(**filters)
+        invalidate_on_commit(self._session, self.model_class)
+        try:
+            result = self._session.execute(stmt)
+            return result.rowcount
+        except SAIntegrityError as e:
+            self._session.rollback()
+            raise IntegrityError(str(e.orig), e) from e
+        except SQLAlchemyError as e:
+            self._session.rollback()
+            raise DatabaseError(str(e), e) from e
+
     def commit(self) -> None:
         """Commit the current transaction."""
         self._session.commit()
@@ -0,0 +1,462 @@
+"""Second-level entity and query result caches shared by all sessions.
+
+Sessions only remember the entities they have loaded themselves, so every
+new session (and every read after a commit) goes back to SQLite, even for
+tables that almost never change. The entity cache keeps the column values
+of recently loaded entities, keyed by (model, primary key), for the tables
+listed in ``Settings.entity_cache``; ``BaseRepository.get_by_id`` and
+``get_many`` build entities from it without a query.
+
+Each table has its own LRU with a maximum size and an optional TTL.
+Entries are invalidated when an entity is changed or deleted through a
+session flush, when the repositories change rows with bulk statements, and
+again after the writing session commits or rolls back (a reader may have
+re-cached the old values in between).
+
+The query cache keeps the results of repository list methods decorated
+with ``cached_query``, keyed by method and arguments. Each entry is tagged
+with the tables the query reads and the version of each table when it
+ran. Every write through a session (flushes and ``session.execute`` of
+INSERT/UPDATE/DELETE) bumps the version of the tables it touches, again
+after the writing session commits or rolls back, so an entry is dropped
+exactly when one of its tables changes rather than on a timer. Writes made
+outside SQLAlchemy sessions (``DatabaseConnection``, other processes) are
+not seen.
+
+Example:
+    DB_ENTITY_CACHE="department:100:600,programme:50:600" \\
+    DB_QUERY_CACHE_SIZE=500 python main.py
+
+    from src.repositories import get_entity_cache, get_query_cache
+    print(get_entity_cache().stats(), get_query_cache().stats())
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, TypeVar
+
+from sqlalchemy import Table, event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from src.config import get_settings
+from src.models.base import Base
+
+logger = logging.getLogger(__name__)
+
+# Session.info keys for entries to invalidate again once the session commits
+_PENDING_KEY = "entity_cache_pending"
+_PENDING_TABLES_KEY = "query_cache_pending"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class CacheStats:
+    """Counters for one table's entity cache, or for the query cache."""
+
+    size: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class _TableCache:
+    """LRU of column values for one table."""
+
+    def __init__(self, max_size: int, ttl: float | None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict[Any, tuple[float, dict[str, Any]]] = OrderedDict()
+        self.stats = CacheStats()
+
+
+class EntityCache:
+    """Thread-safe per-table LRU/TTL cache of entity column values."""
+
+    def __init__(self, config: dict[str, tuple[int, float | None]]) -> None:
+        """Initialise from ``{table_name: (max_size, ttl_seconds)}``."""
+        self._tables = {
+            table: _TableCache(max_size, ttl) for table, (max_size, ttl) in config.items()
+        }
+        self._lock = threading.Lock()
+
+    def enabled_for(self, model: type[Base]) -> bool:
+        """Whether entities of ``model`` are cached."""
+        return model.__tablename__ in self._tables
+
+    def get(self, model: type[Base], entity_id: Any) -> dict[str, Any] | None:
+        """Return the cached column values for an entity, if fresh."""
+        table = self._tables.get(model.__tablename__)
+        if table is None:
+            return None
+
+        with self._lock:
+            entry = table.entries.get(entity_id)
+            if entry is not None and table.ttl is not None:
+                if time.monotonic() - entry[0] > table.ttl:
+                    del table.entries[entity_id]
+                    table.stats.evictions += 1
+                    entry = None
+            if entry is None:
+                table.stats.misses += 1
+                return None
+            table.entries.move_to_end(entity_id)
+            table.stats.hits += 1
+            return entry[1]
+
+    def put(self, entity: Base) -> None:
+        """Store the loaded column values of an entity."""
+        table = self._tables.get(entity.__tablename__)
+        if table is None:
+            return
+
+        values = _column_values(entity)
+        if values is None:
+            return
+        state = inspect(entity)
+        entity_id = state.key[1][0]
+        # Written but not yet committed by this session: may be rolled back
+        if state.session is not None:
+            pending = state.session.info.get(_PENDING_KEY, ())
+            if (type(entity), entity_id) in pending or (type(entity), None) in pending:
+                return
+
+        with self._lock:
+            table.entries[entity_id] = (time.monotonic(), values)
+            table.entries.move_to_end(entity_id)
+            while len(table.entries) > table.max_size:
+                table.entries.popitem(last=False)
+                table.stats.evictions += 1
+
+    def invalidate(self, model: type[Base], entity_id: Any | None = None) -> None:
+        """Drop one entity, or every entity of ``model`` if no ID is given."""
+        table = self._tables.get(model.__tablename__)
+        if table is None:
+            return
+
+        with self._lock:
+            if entity_id is None:
+                table.stats.invalidations += len(table.entries)
+                table.entries.clear()
+            elif table.entries.pop(entity_id, None) is not None:
+                table.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every cached entity."""
+        with self._lock:
+            for table in self._tables.values():
+                table.entries.clear()
+
+    def stats(self) -> dict[str, CacheStats]:
+        """Return a snapshot of the counters for each cached table."""
+        with self._lock:
+            return {
+                name: CacheStats(**{**vars(table.stats), "size": len(table.entries)})
+                for name, table in self._tables.items()
+            }
+
+
+def _column_values(entity: Base) -> dict[str, Any] | None:
+    """Return the loaded column values of a clean, persistent entity."""
+    state = inspect(entity)
+    if state.expired or state.modified or state.key is None:
+        return None
+    # Only columns that are loaded; deferred ones load on access as usual
+    return {
+        attr.key: state.dict[attr.key]
+        for attr in state.mapper.column_attrs
+        if attr.key in state.dict
+    }
+
+
+def hydrate(session: Session, model: type[Base], values: dict[str, Any]) -> Base:
+    """Attach an entity built from cached column values to ``session``.
+
+    Returns the session's own instance if it already holds a loaded one;
+    otherwise the entity is merged in as persistent without a query.
+    """
+    pk = model.__mapper__.primary_key[0].key
+    existing = session.identity_map.get(identity_key(model, values[pk]))
+    if existing is not None and not inspect(existing).expired:
+        return existing
+
+    entity = model(**values)
+    make_transient_to_detached(entity)
+    return session.merge(entity, load=False)
+
+
+class QueryCache:
+    """LRU of repository query results, invalidated by table versions."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialise with room for ``max_size`` results (0 disables)."""
+        self.max_size = max_size
+        self._entries: OrderedDict[Any, tuple[tuple[int, ...], Any]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether results are cached at all."""
+        return self.max_size > 0
+
+    def versions(self, tables: Iterable[str]) -> tuple[int, ...]:
+        """Return the current version of each table."""
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        """Mark tables as changed, making results that read them stale."""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, key: Any, tables: tuple[str, ...]) -> Any | None:
+        """Return the payload stored for ``key`` if none of its tables changed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                current = tuple(self._versions.get(table, 0) for table in tables)
+                if entry[0] == current:
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self._stats.invalidations += 1
+            self._stats.misses += 1
+            return None
+
+    def put(self, key: Any, versions: tuple[int, ...], payload: Any) -> None:
+        """Store a payload computed when the tables were at ``versions``."""
+        with self._lock:
+            self._entries[key] = (versions, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return CacheStats(**{**vars(self._stats), "size": len(self._entries)})
+
+
+def _freeze(result: Any) -> tuple[str, Any] | None:
+    """Convert a query result to a session-independent payload."""
+    if isinstance(result, Base):
+        values = _column_values(result)
+        return None if values is None else ("entity", (type(result), values))
+    if isinstance(result, list) and all(isinstance(item, Base) for item in result):
+        rows = []
+        for item in result:
+            values = _column_values(item)
+            if values is None:
+                return None
+            rows.append((type(item), values))
+        return ("list", rows)
+    if isinstance(result, list) and all(isinstance(item, tuple) for item in result):
+        # Projection rows (named tuples of column values) are immutable
+        return ("rows", tuple(result))
+    if result is None or isinstance(result, (int, float, str, bool)):
+        return ("value", result)
+    return None
+
+
+def _thaw(payload: tuple[str, Any], session: Session) -> Any:
+    """Rebuild a query result from a payload in ``session``."""
+    kind, data = payload
+    if kind == "entity":
+        return hydrate(session, *data)
+    if kind == "list":
+        return [hydrate(session, model, values) for model, values in data]
+    if kind == "rows":
+        return list(data)
+    return data
+
+
+def _table_name(source: type[Base] | Table) -> str:
+    """Return the table name of a model or ``Table``."""
+    return source.name if isinstance(source, Table) else source.__tablename__
+
+
+def cached_query(*sources: type[Base] | Table) -> Callable[[F], F]:
+    """Cache a repository read method's results in the query cache.
+
+    Args:
+        sources: Models and/or association tables the query reads; a write
+            to any of them invalidates the cached results.
+
+    The method must only depend on its arguments and those tables, and
+    return entities, a list of entities, or a plain value. Results are
+    rebuilt in the repository's read session on a hit.
+    """
+    tables = tuple(sorted({_table_name(source) for source in sources}))
+
+    def decorator(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            cache = get_query_cache()
+            # Cached entities come back without their eager-loaded relationships,
+            # and results that include uncommitted writes mustn't be shared
+            if not cache.enabled or kwargs.get("load") or self._reads_uncommitted:
+                return method(self, *args, **kwargs)
+
+            key = (type(self).__qualname__, method.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                payload = cache.get(key, tables)
+            except TypeError:
+                # Unhashable arguments (e.g. a list of IDs): don't cache
+                return method(self, *args, **kwargs)
+            if payload is not None:
+                return _thaw(payload, self._read_session)
+
+            versions = cache.versions(tables)
+            result = method(self, *args, **kwargs)
+            payload = _freeze(result)
+            if payload is not None:
+                cache.put(key, versions, payload)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+_entity_cache: EntityCache | None = None
+_query_cache: QueryCache | None = None
+_cache_lock = threading.Lock()
+_listeners_installed = False
+
+
+def invalidate_on_commit(
+    session: Session,
+    model: type[Base],
+    entity_id: Any | None = None,
+) -> None:
+    """Invalidate an entry now and again when ``session`` commits."""
+    cache = get_entity_cache()
+    if not cache.enabled_for(model):
+        return
+    cache.invalidate(model, entity_id)
+    session.info.setdefault(_PENDING_KEY, set()).add((model, entity_id))
+
+
+def _tables_changed(session: Session, tables: Iterable[str]) -> None:
+    """Bump table versions now and again when ``session`` commits."""
+    cache = get_query_cache()
+    if not cache.enabled:
+        return
+    tables = set(tables)
+    cache.bump(tables)
+    session.info.setdefault(_PENDING_TABLES_KEY, set()).update(tables)
+
+
+def _flushed_tables(session: Session) -> set[str]:
+    """Return the tables a flush wrote, including association tables."""
+    tables = set()
+    deleted = session.deleted
+    for entity in (*session.new, *session.dirty, *deleted):
+        state = inspect(entity)
+        tables.add(state.mapper.local_table.name)
+        # Collection changes on many-to-many relationships write the
+        # association table (deletes clear the entity's rows from it)
+        for relationship in state.mapper.relationships:
+            if relationship.secondary is not None and (
+                entity in deleted
+                or state.attrs[relationship.key].history.has_changes()
+            ):
+                tables.add(relationship.secondary.name)
+    return tables
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    """Invalidate entities updated or deleted by a flush."""
+    for entity in (*session.dirty, *session.deleted):
+        state = inspect(entity)
+        if state.key is not None:
+            invalidate_on_commit(session, type(entity), state.key[1][0])
+    if get_query_cache().enabled:
+        _tables_changed(session, _flushed_tables(session))
+
+
+def _on_execute(orm_execute_state: ORMExecuteState) -> None:
+    """Bump the version of the table written by an INSERT/UPDATE/DELETE."""
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        _tables_changed(state.session, [state.statement.table.name])
+
+
+def _after_transaction_end(session: Session) -> None:
+    """Repeat the session's invalidations now its changes are (un)done."""
+    entity_cache = get_entity_cache()
+    for model, entity_id in session.info.pop(_PENDING_KEY, ()):
+        entity_cache.invalidate(model, entity_id)
+    tables = session.info.pop(_PENDING_TABLES_KEY, None)
+    if tables:
+        get_query_cache().bump(tables)
+
+
+def _after_commit(session: Session) -> None:
+    """Repeat the session's invalidations now its changes are visible."""
+    _after_transaction_end(session)
+
+
+def _after_rollback(session: Session, previous_transaction: Any) -> None:
+    """Drop entries that may have been cached from rolled-back writes."""
+    _after_transaction_end(session)
+
+
+def _install_listeners() -> None:
+    """Register the session events that keep the caches current (once)."""
+    global _listeners_installed
+
+    if not _listeners_installed:
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _on_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_soft_rollback", _after_rollback)
+        _listeners_installed = True
+
+
+def get_entity_cache() -> EntityCache:
+    """Get the entity cache singleton, configured from settings."""
+    global _entity_cache
+
+    if _entity_cache is None:
+        with _cache_lock:
+            if _entity_cache is None:
+                config = get_settings().entity_cache
+                if config:
+                    _install_listeners()
+                    logger.info("Entity cache enabled for: %s", ", ".join(config))
+                _entity_cache = EntityCache(config)
+
+    return _entity_cache
+
+
+def get_query_cache() -> QueryCache:
+    """Get the query result cache singleton, configured from settings."""
+    global _query_cache
+
+    if _query_cache is None:
+        with _cache_lock:
+            if _query_cache is None:
+                max_size = get_settings().query_cache_size
+                if max_size:
+                    _install_listeners()
+                    logger.info("Query cache enabled (%d results)", max_size)
+                _query_cache = QueryCache(max_size)
+
+    return _query_cache
@@ -0,0 +1,132 @@
+"""Columnar loaders: query results straight into pandas or Arrow columns.
+
+``BaseRepository.to_dataframe`` and ``to_arrow`` run a Core ``select`` of
+table columns and append each batch of rows to per-column lists, skipping
+ORM entities and ``as_dict``. Column types come from the table definition:
+
+- INTEGER columns become ``int64``, or pandas' nullable ``Int64`` when the
+  column allows NULL (missing values are ``pd.NA`` rather than turning the
+  column into floats)
+- REAL columns become ``float64``
+- columns listed in the repository's ``categorical_columns`` become
+  ``category`` (dictionary-encoded in Arrow)
+- text columns keep pandas' default string handling
+
+pyarrow is optional and only needed for ``to_arrow``.
+"""
+
+from typing import Any, Iterable, Mapping
+
+import pandas as pd
+from sqlalchemy import Boolean, Column, Float, Integer, Numeric, Select, Table, select
+from sqlalchemy.orm import Session
+
+from src.exceptions import ValidationError
+
+
+def _columns(table: Table, names: Iterable[str] | None) -> list[Column]:
+    """Return the named table columns (all if ``names`` is None)."""
+    if names is None:
+        return list(table.columns)
+    unknown = [name for name in names if name not in table.c]
+    if unknown:
+        raise ValidationError(
+            "columns", f"{table.name} has no column {', '.join(map(repr, unknown))}"
+        )
+    return [table.c[name] for name in names]
+
+
+def build_select(
+    table: Table,
+    filters: Mapping[str, Any] | None = None,
+    columns: Iterable[str] | None = None,
+) -> tuple[Select, list[Column]]:
+    """Build a select of ``columns`` matching ``filters``, in primary key order.
+
+    Filters map a column name to a value: equality, ``IS NULL`` for None, or
+    ``IN`` for a list, tuple or set.
+    """
+    selected = _columns(table, columns)
+    stmt = select(*selected)
+    for name, value in (filters or {}).items():
+        if name not in table.c:
+            raise ValidationError("filters", f"{table.name} has no column {name!r}")
+        column = table.c[name]
+        if value is None:
+            stmt = stmt.where(column.is_(None))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stmt = stmt.where(column.in_(value))
+        else:
+            stmt = stmt.where(column == value)
+    return stmt.order_by(*table.primary_key.columns), selected
+
+
+def fetch_columns(
+    session: Session,
+    stmt: Select,
+    width: int,
+    batch_size: int,
+) -> list[list[Any]]:
+    """Run ``stmt`` and return its result as one list per column."""
+    data: list[list[Any]] = [[] for _ in range(width)]
+    result = session.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.tuples().partitions():
+        for values, column in zip(data, zip(*partition)):
+            values.extend(column)
+    return data
+
+
+def _pandas_dtype(column: Column, categorical: bool) -> str | None:
+    """Return the pandas dtype for a table column (None to infer)."""
+    if categorical:
+        return "category"
+    if isinstance(column.type, Boolean):
+        return "boolean"
+    if isinstance(column.type, Integer):
+        return "Int64" if column.nullable else "int64"
+    if isinstance(column.type, (Float, Numeric)):
+        return "float64"
+    return None
+
+
+def to_dataframe(
+    columns: list[Column],
+    data: list[list[Any]],
+    categorical_columns: Iterable[str] = (),
+) -> pd.DataFrame:
+    """Build a DataFrame from per-column lists with the columns' dtypes."""
+    categorical = set(categorical_columns)
+    series = {}
+    for column, values in zip(columns, data):
+        dtype = _pandas_dtype(column, column.name in categorical)
+        series[column.name] = pd.Series(values, dtype=dtype)
+    return pd.DataFrame(series, columns=[column.name for column in columns])
+
+
+def to_arrow(
+    columns: list[Column],
+    data: list[list[Any]],
+    categorical_columns: Iterable[str] = (),
+) -> Any:
+    """Build a ``pyarrow.Table`` from per-column lists."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("to_arrow() requires pyarrow: pip install pyarrow") from e
+
+    categorical = set(categorical_columns)
+    arrays = {}
+    for column, values in zip(columns, data):
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, (Float, Numeric)):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = None
+        array = pa.array(values, type=arrow_type)
+        if column.name in categorical:
+            array = array.dictionary_encode()
+        arrays[column.name] = array
+    return pa.table(arrays)
@@ -1,6 +1,6 @@
 """Course repository using SQLAlchemy ORM."""
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.models.course import Course, CourseMaterial
@@ -11,29 +11,47 @@ from src.models.tables import (
     programme_course,
     student_course,
 )
-from src.repositories.base import BaseRepository
+from src.repositories.base import SEARCH_LIMIT, BaseRepository
+from src.repositories.cache import cached_query
+from src.repositories.loading import LoadSpec
 
 
 class CourseRepository(BaseRepository[Course]):
     """Repository for Course entity operations."""
 
-    def __init__(self, session: Session | None = None) -> None:
-        super().__init__(session)
+    fts_table = "course_fts"
+    trigram_table = "course_trigram"
+    search_columns = ("course_code", "name")
+    categorical_columns = ("level",)
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        read_session: Session | None = None,
+    ) -> None:
+        super().__init__(session, read_session)
 
     @property
     def model_class(self) -> type[Course]:
         return Course
 
-    def get_by_department(self, dept_id: int) -> list[Course]:
+    @cached_query(Course)
+    def get_by_department(self, dept_id: int, *, load: LoadSpec = None) -> list[Course]:
         """Get all courses offered by a department."""
         stmt = (
             select(Course)
             .where(Course.dept_id == dept_id)
             .order_by(Course.course_code)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_by_department_lecturers(self, dept_id: int) -> list[Course]:
+    @cached_query(Course, lecturer_course, Lecturer)
+    def get_by_department_lecturers(
+        self,
+        dept_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Course]:
         """Get courses taught by lecturers in a department."""
         stmt = (
             select(Course)
@@ -43,9 +61,15 @@ class CourseRepository(BaseRepository[Course]):
             .where(Lecturer.dept_id == dept_id)
             .order_by(Course.course_code)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_by_lecturer(self, lecturer_id: int) -> list[Course]:
+    @cached_query(Course, lecturer_course)
+    def get_by_lecturer(
+        self,
+        lecturer_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Course]:
         """Get all courses taught by a lecturer."""
         stmt = (
             select(Course)
@@ -53,9 +77,10 @@ class CourseRepository(BaseRepository[Course]):
             .where(lecturer_course.c.lecturer_id == lecturer_id)
             .order_by(Course.course_code)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_by_student(self, student_id: int) -> list[Course]:
+    @cached_query(Course, student_course)
+    def get_by_student(self, student_id: int, *, load: LoadSpec = None) -> list[Course]:
         """Get all courses a student is enrolled in."""
         stmt = (
             select(Course)
@@ -63,12 +88,15 @@ class CourseRepository(BaseRepository[Course]):
             .where(student_course.c.student_id == student_id)
             .order_by(Course.course_code)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
+    @cached_query(Course, programme_course)
     def get_by_programme(
         self,
         programme_id: int,
         required_only: bool = False,
+        *,
+        load: LoadSpec = None,
     ) -> list[Course]:
         """Get all courses in a programme."""
         stmt = (
@@ -79,18 +107,30 @@ class CourseRepository(BaseRepository[Course]):
         if required_only:
             stmt = stmt.where(programme_course.c.is_required == 1)
         stmt = stmt.order_by(Course.course_code)
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_materials(self, course_id: int) -> list[CourseMaterial]:
+    @cached_query(CourseMaterial)
+    def get_materials(
+        self,
+        course_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[CourseMaterial]:
         """Get all materials for a course."""
         stmt = (
             select(CourseMaterial)
             .where(CourseMaterial.course_id == course_id)
             .order_by(CourseMaterial.title)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_prerequisites(self, course_id: int) -> list[Course]:
+    @cached_query(Course, course_prerequisite)
+    def get_prerequisites(
+        self,
+        course_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Course]:
         """Get all prerequisite courses for a course."""
         stmt = (
             select(Course)
@@ -101,34 +141,37 @@ class CourseRepository(BaseRepository[Course]):
             .where(course_prerequisite.c.course_id == course_id)
             .order_by(Course.course_code)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_by_level(self, level: str) -> list[Course]:
+    @cached_query(Course)
+    def get_by_level(self, level: str, *, load: LoadSpec = None) -> list[Course]:
         """Get all courses at a specific level."""
         stmt = (
             select(Course)
             .where(Course.level == level)
             .order_by(Course.course_code)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
+    @cached_query(Course)
     def get_by_code(self, course_code: str) -> Course | None:
         """Get a course by its course code."""
         stmt = select(Course).where(Course.course_code == course_code)
-        return self._session.scalar(stmt)
+        return self._read_session.scalar(stmt)
 
-    def search(self, term: str) -> list[Course]:
-        """Search courses by name or code."""
-        pattern = f"%{term}%"
-        stmt = (
-            select(Course)
-            .where(
-                func.lower(Course.name).like(func.lower(pattern))
-                | func.lower(Course.course_code).like(func.lower(pattern))
-            )
-            .order_by(Course.course_code)
-        )
-        return list(self._session.scalars(stmt).all())
+    def search(
+        self,
+        term: str,
+        limit: int | None = SEARCH_LIMIT,
+        mode: str = "prefix",
+    ) -> list[Course]:
+        """Search courses by code or name.
+
+        ``"prefix"`` mode matches the start of words, so "CS" finds every
+        CS course and "lin alg" finds "Linear Algebra"; ``"substring"`` mode
+        matches anywhere, e.g. "301" in "CS301" or "base" in "Databases".
+        """
+        return self._search(term, limit, mode)
 
     def add_prerequisite(self, course_id: int, prerequisite_id: int) -> bool:
         """Add a prerequisite to a course."""
@@ -183,13 +226,10 @@ class CourseRepository(BaseRepository[Course]):
         url: str | None = None,
     ) -> CourseMaterial:
         """Add a material to a course."""
-        material = CourseMaterial(
+        return self._insert_returning(
+            CourseMaterial,
             course_id=course_id,
             title=title,
             material_type=material_type,
             url=url,
         )
-        self._session.add(material)
-        self._session.flush()
-        self._session.refresh(material)
-        return material
@@ -4,43 +4,72 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from src.models.department import Department, ResearchArea
-from src.repositories.base import BaseRepository
+from src.repositories.base import SEARCH_LIMIT, BaseRepository
+from src.repositories.cache import cached_query
+from src.repositories.loading import LoadSpec
 
 
 class DepartmentRepository(BaseRepository[Department]):
     """Repository for Department entity operations."""
 
-    def __init__(self, session: Session | None = None) -> None:
-        super().__init__(session)
+    fts_table = "department_fts"
+    trigram_table = "department_trigram"
+    search_columns = ("name",)
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        read_session: Session | None = None,
+    ) -> None:
+        super().__init__(session, read_session)
 
     @property
     def model_class(self) -> type[Department]:
         return Department
 
+    @cached_query(Department)
     def get_by_name(self, name: str) -> Department | None:
         """Get a department by its name."""
         stmt = select(Department).where(Department.name == name)
-        return self._session.scalar(stmt)
+        return self._read_session.scalar(stmt)
 
-    def get_by_faculty(self, faculty: str) -> list[Department]:
+    @cached_query(Department)
+    def get_by_faculty(
+        self,
+        faculty: str,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Department]:
         """Get all departments in a faculty."""
         stmt = (
             select(Department)
             .where(Department.faculty == faculty)
             .order_by(Department.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_research_areas(self, dept_id: int) -> list[ResearchArea]:
+    @cached_query(ResearchArea)
+    def get_research_areas(
+        self,
+        dept_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[ResearchArea]:
         """Get all research areas for a department."""
         stmt = (
             select(ResearchArea)
             .where(ResearchArea.dept_id == dept_id)
             .order_by(ResearchArea.area)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_departments_with_research_area(self, area: str) -> list[Department]:
+    @cached_query(Department, ResearchArea)
+    def get_departments_with_research_area(
+        self,
+        area: str,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Department]:
         """Get departments with a matching research area."""
         stmt = (
             select(Department)
@@ -49,21 +78,22 @@ class DepartmentRepository(BaseRepository[Department]):
             .where(func.lower(ResearchArea.area).like(func.lower(f"%{area}%")))
             .order_by(Department.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def search(self, name: str) -> list[Department]:
-        """Search departments by name."""
-        stmt = (
-            select(Department)
-            .where(func.lower(Department.name).like(func.lower(f"%{name}%")))
-            .order_by(Department.name)
-        )
-        return list(self._session.scalars(stmt).all())
+    def search(
+        self,
+        name: str,
+        limit: int | None = SEARCH_LIMIT,
+        mode: str = "prefix",
+    ) -> list[Department]:
+        """Search departments by name.
+
+        ``"prefix"`` mode matches the start of words, e.g. "comp" finds
+        "Computer Science"; ``"substring"`` mode matches anywhere, e.g.
+        "ysics" in "Physics".
+        """
+        return self._search(name, limit, mode)
 
     def add_research_area(self, dept_id: int, area: str) -> ResearchArea:
         """Add a research area to a department."""
-        research_area = ResearchArea(dept_id=dept_id, area=area)
-        self._session.add(research_area)
-        self._session.flush()
-        self._session.refresh(research_area)
-        return research_area
+        return self._insert_returning(ResearchArea, dept_id=dept_id, area=area)
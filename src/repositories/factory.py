@@ -1,8 +1,9 @@
 """Repository factory for creating repository instances."""
 
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from src.database import get_session
+from src.database import get_engine, get_read_engine, get_read_session, get_session
 from src.repositories.course_repository import CourseRepository
 from src.repositories.department_repository import DepartmentRepository
 from src.repositories.lecturer_repository import LecturerRepository
@@ -13,59 +14,97 @@ from src.repositories.student_repository import StudentRepository
 
 
 class RepositoryFactory:
-    """Factory for creating repository instances with shared sessions."""
-
-    def __init__(self, session: Session | None = None) -> None:
-        """Initialise factory with optional session."""
-        self._session = session or get_session()
+    """Factory for creating repository instances with shared sessions.
+
+    Repositories share one writer session and one read session. If only a
+    writer session is passed in, or the database is in memory (one shared
+    connection), the writer session is used for reads as well.
+    """
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        read_session: Session | None = None,
+    ) -> None:
+        """Initialise factory with optional writer and read sessions."""
+        if session is None:
+            session = get_session()
+            if read_session is None and get_read_engine() is not get_engine():
+                read_session = get_read_session()
+        self._session = session
+        self._read_session = read_session or session
         self._instances: dict[type, object] = {}
 
+        if self._read_session is not self._session:
+            event.listen(self._session, "after_commit", self._refresh_reader)
+
     @property
     def session(self) -> Session:
         """Get the current session."""
         return self._session
 
+    @property
+    def read_session(self) -> Session:
+        """Get the session used for queries."""
+        return self._read_session
+
+    def _refresh_reader(self, session: Session) -> None:
+        """Expire objects loaded by the reader once the writer commits."""
+        self._read_session.rollback()
+
     def get_student_repository(self) -> StudentRepository:
         """Get or create a StudentRepository instance."""
         if StudentRepository not in self._instances:
-            self._instances[StudentRepository] = StudentRepository(self._session)
+            self._instances[StudentRepository] = StudentRepository(
+                self._session, self._read_session
+            )
         return self._instances[StudentRepository]
 
     def get_lecturer_repository(self) -> LecturerRepository:
         """Get or create a LecturerRepository instance."""
         if LecturerRepository not in self._instances:
-            self._instances[LecturerRepository] = LecturerRepository(self._session)
+            self._instances[LecturerRepository] = LecturerRepository(
+                self._session, self._read_session
+            )
         return self._instances[LecturerRepository]
 
     def get_course_repository(self) -> CourseRepository:
         """Get or create a CourseRepository instance."""
         if CourseRepository not in self._instances:
-            self._instances[CourseRepository] = CourseRepository(self._session)
+            self._instances[CourseRepository] = CourseRepository(
+                self._session, self._read_session
+            )
         return self._instances[CourseRepository]
 
     def get_department_repository(self) -> DepartmentRepository:
         """Get or create a DepartmentRepository instance."""
         if DepartmentRepository not in self._instances:
-            self._instances[DepartmentRepository] = DepartmentRepository(self._session)
+            self._instances[DepartmentRepository] = DepartmentRepository(
+                self._session, self._read_session
+            )
         return self._instances[DepartmentRepository]
 
     def get_programme_repository(self) -> ProgrammeRepository:
         """Get or create a ProgrammeRepository instance."""
         if ProgrammeRepository not in self._instances:
-            self._instances[ProgrammeRepository] = ProgrammeRepository(self._session)
+            self._instances[ProgrammeRepository] = ProgrammeRepository(
+                self._session, self._read_session
+            )
         return self._instances[ProgrammeRepository]
 
     def get_staff_repository(self) -> StaffRepository:
         """Get or create a StaffRepository instance."""
         if StaffRepository not in self._instances:
-            self._instances[StaffRepository] = StaffRepository(self._session)
+            self._instances[StaffRepository] = StaffRepository(
+                self._session, self._read_session
+            )
         return self._instances[StaffRepository]
 
     def get_research_project_repository(self) -> ResearchProjectRepository:
         """Get or create a ResearchProjectRepository instance."""
         if ResearchProjectRepository not in self._instances:
             self._instances[ResearchProjectRepository] = ResearchProjectRepository(
-                self._session
+                self._session, self._read_session
             )
         return self._instances[ResearchProjectRepository]
 
@@ -78,5 +117,8 @@ class RepositoryFactory:
         self._session.rollback()
 
     def close(self) -> None:
-        """Close the session."""
+        """Close the sessions."""
+        if self._read_session is not self._session:
+            event.remove(self._session, "after_commit", self._refresh_reader)
+            self._read_session.close()
         self._session.close()
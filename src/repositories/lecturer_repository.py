@@ -1,6 +1,6 @@
 """Lecturer repository using SQLAlchemy ORM."""
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.models.lecturer import (
@@ -12,41 +12,69 @@ from src.models.lecturer import (
 )
 from src.models.research import ResearchProject
 from src.models.tables import lecturer_course
-from src.repositories.base import BaseRepository
+from src.repositories.base import SEARCH_LIMIT, BaseRepository
+from src.repositories.cache import cached_query
+from src.repositories.loading import LoadSpec
 
 
 class LecturerRepository(BaseRepository[Lecturer]):
     """Repository for Lecturer entity operations."""
 
-    def __init__(self, session: Session | None = None) -> None:
-        super().__init__(session)
+    fts_table = "lecturer_fts"
+    trigram_table = "lecturer_trigram"
+    search_columns = ("name",)
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        read_session: Session | None = None,
+    ) -> None:
+        super().__init__(session, read_session)
 
     @property
     def model_class(self) -> type[Lecturer]:
         return Lecturer
 
-    def get_by_expertise(self, area: str) -> list[Lecturer]:
+    @cached_query(Lecturer, LecturerExpertise)
+    def get_by_expertise(self, area: str, *, load: LoadSpec = None) -> list[Lecturer]:
         """Get lecturers with expertise in a specific area."""
-        stmt = (
-            select(Lecturer)
+        return self._scalars_with_fallback(
+            lambda use_index: select(Lecturer)
             .distinct()
             .join(LecturerExpertise)
-            .where(func.lower(LecturerExpertise.area).like(func.lower(f"%{area}%")))
-            .order_by(Lecturer.name)
+            .where(
+                self._contains(
+                    ["area"],
+                    area,
+                    model=LecturerExpertise,
+                    trigram_table="lecturer_expertise_trigram",
+                    use_index=use_index,
+                )
+            )
+            .order_by(Lecturer.name),
+            load,
         )
-        return list(self._session.scalars(stmt).all())
 
-    def get_by_department(self, dept_id: int) -> list[Lecturer]:
+    @cached_query(Lecturer)
+    def get_by_department(
+        self,
+        dept_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Lecturer]:
         """Get all lecturers in a department."""
         stmt = (
             select(Lecturer)
             .where(Lecturer.dept_id == dept_id)
             .order_by(Lecturer.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
+    @cached_query(Lecturer, ResearchProject)
     def get_available_head_lecturers(
-        self, exclude_lecturer_id: int | None = None
+        self, exclude_lecturer_id: int | None = None,
+        *,
+        load: LoadSpec = None,
     ) -> list[Lecturer]:
         """Get lecturers not already heading a research project.
 
@@ -69,38 +97,59 @@ class LecturerRepository(BaseRepository[Lecturer]):
             .where(Lecturer.lecturer_id.not_in(head_lecturer_ids))
             .order_by(Lecturer.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_qualifications(self, lecturer_id: int) -> list[LecturerQualification]:
+    @cached_query(LecturerQualification)
+    def get_qualifications(
+        self,
+        lecturer_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[LecturerQualification]:
         """Get all qualifications for a lecturer."""
         stmt = (
             select(LecturerQualification)
             .where(LecturerQualification.lecturer_id == lecturer_id)
             .order_by(LecturerQualification.year_awarded.desc())
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_expertise(self, lecturer_id: int) -> list[LecturerExpertise]:
+    @cached_query(LecturerExpertise)
+    def get_expertise(
+        self,
+        lecturer_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[LecturerExpertise]:
         """Get all expertise areas for a lecturer."""
         stmt = (
             select(LecturerExpertise)
             .where(LecturerExpertise.lecturer_id == lecturer_id)
             .order_by(LecturerExpertise.area)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_publications(self, lecturer_id: int) -> list[Publication]:
+    @cached_query(Publication)
+    def get_publications(
+        self,
+        lecturer_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Publication]:
         """Get all publications by a lecturer."""
         stmt = (
             select(Publication)
             .where(Publication.lecturer_id == lecturer_id)
             .order_by(Publication.publication_date.desc())
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
+    @cached_query(LecturerResearchInterest)
     def get_research_interests(
         self,
         lecturer_id: int,
+        *,
+        load: LoadSpec = None,
     ) -> list[LecturerResearchInterest]:
         """Get all research interests for a lecturer."""
         stmt = (
@@ -108,16 +157,21 @@ class LecturerRepository(BaseRepository[Lecturer]):
             .where(LecturerResearchInterest.lecturer_id == lecturer_id)
             .order_by(LecturerResearchInterest.interest)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def search(self, name: str) -> list[Lecturer]:
-        """Search lecturers by name."""
-        stmt = (
-            select(Lecturer)
-            .where(func.lower(Lecturer.name).like(func.lower(f"%{name}%")))
-            .order_by(Lecturer.name)
-        )
-        return list(self._session.scalars(stmt).all())
+    def search(
+        self,
+        name: str,
+        limit: int | None = SEARCH_LIMIT,
+        mode: str = "prefix",
+    ) -> list[Lecturer]:
+        """Search lecturers by name.
+
+        ``"prefix"`` mode matches the start of words, e.g. "gin" finds
+        "Dr Gina Moore"; ``"substring"`` mode matches anywhere, e.g. "ore" in
+        "Traore" or "Moore".
+        """
+        return self._search(name, limit, mode)
 
     def assign_to_course(self, lecturer_id: int, course_id: int) -> bool:
         """Assign a lecturer to teach a course."""
@@ -146,24 +200,19 @@ class LecturerRepository(BaseRepository[Lecturer]):
         year_awarded: int | None = None,
     ) -> LecturerQualification:
         """Add a qualification for a lecturer."""
-        qualification = LecturerQualification(
+        return self._insert_returning(
+            LecturerQualification,
             lecturer_id=lecturer_id,
             qualification_name=qualification_name,
             institution=institution,
             year_awarded=year_awarded,
         )
-        self._session.add(qualification)
-        self._session.flush()
-        self._session.refresh(qualification)
-        return qualification
 
     def add_expertise(self, lecturer_id: int, area: str) -> LecturerExpertise:
         """Add an expertise area for a lecturer."""
-        expertise = LecturerExpertise(lecturer_id=lecturer_id, area=area)
-        self._session.add(expertise)
-        self._session.flush()
-        self._session.refresh(expertise)
-        return expertise
+        return self._insert_returning(
+            LecturerExpertise, lecturer_id=lecturer_id, area=area
+        )
 
     def add_publication(
         self,
@@ -173,16 +222,13 @@ class LecturerRepository(BaseRepository[Lecturer]):
         publication_date: str | None = None,
     ) -> Publication:
         """Add a publication for a lecturer."""
-        publication = Publication(
+        return self._insert_returning(
+            Publication,
             lecturer_id=lecturer_id,
             title=title,
             journal=journal,
             publication_date=publication_date,
         )
-        self._session.add(publication)
-        self._session.flush()
-        self._session.refresh(publication)
-        return publication
 
     def add_research_interest(
         self,
@@ -190,10 +236,8 @@ class LecturerRepository(BaseRepository[Lecturer]):
         interest: str,
     ) -> LecturerResearchInterest:
         """Add a research interest for a lecturer."""
-        research_interest = LecturerResearchInterest(
-            lecturer_id=lecturer_id, interest=interest
+        return self._insert_returning(
+            LecturerResearchInterest,
+            lecturer_id=lecturer_id,
+            interest=interest,
         )
-        self._session.add(research_interest)
-        self._session.flush()
-        self._session.refresh(research_interest)
-        return research_interest
@@ -0,0 +1,110 @@
+"""Eager-loading options and lazy-load detection for repository queries.
+
+Relationships are lazy by default, so code that walks them (a table of
+students with their programme, a lecturer's publications and courses)
+issues one query per parent. Repository read methods accept
+``load=[...]``, a list of relationship paths to load up front:
+
+    repo.get_all(load=["programme", "grades.course"])
+
+Collections are loaded with ``selectinload`` (one extra ``IN`` query per
+relationship) and single-valued relationships with ``joinedload`` (a JOIN in
+the same query). Dotted paths continue from the related model.
+
+``Settings.strict_loading`` finds the lazy loads that remain:
+
+- ``"warn"`` logs each lazy load with the attribute that triggered it
+- ``"raise"`` makes any relationship load that would emit SQL and wasn't
+  requested with ``load`` raise ``sqlalchemy.exc.InvalidRequestError``
+"""
+
+import logging
+import threading
+from typing import Any, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import (
+    Load,
+    ORMExecuteState,
+    Session,
+    joinedload,
+    raiseload,
+    selectinload,
+)
+
+from src.config import get_settings
+from src.exceptions import ValidationError
+from src.models.base import Base
+
+logger = logging.getLogger(__name__)
+
+# Relationship paths to eager load, e.g. ["grades", "grades.course"]
+LoadSpec = Iterable[str] | None
+
+_strict_lock = threading.Lock()
+_strict_installed = False
+
+
+def load_options(model: type[Base], load: LoadSpec) -> list[Load]:
+    """Convert relationship paths on ``model`` to loader options.
+
+    Raises:
+        ValidationError: If a path names an attribute that isn't a
+            relationship.
+    """
+    options = []
+    for path in load or ():
+        option = None
+        current = model
+        for name in path.split("."):
+            relationship = current.__mapper__.relationships.get(name)
+            if relationship is None:
+                raise ValidationError(
+                    "load", f"{current.__name__} has no relationship {name!r}"
+                )
+            attribute = getattr(current, name)
+            if relationship.uselist:
+                option = option.selectinload(attribute) if option else selectinload(attribute)
+            else:
+                option = option.joinedload(attribute) if option else joinedload(attribute)
+            current = relationship.mapper.class_
+        options.append(option)
+    return options
+
+
+def _on_execute(orm_execute_state: ORMExecuteState) -> None:
+    """Apply the strict loading mode to ORM queries."""
+    state = orm_execute_state
+    if get_settings().strict_loading == "warn":
+        if state.lazy_loaded_from is not None:
+            path = state.loader_strategy_path
+            logger.warning(
+                "Lazy load of %s.%s",
+                state.lazy_loaded_from.class_.__name__,
+                path[-1].key if path else "?",
+                stack_info=logger.isEnabledFor(logging.DEBUG),
+            )
+        return
+
+    # Eager and lazy loads themselves are left alone; the wildcard only
+    # covers relationships the top-level query didn't ask for
+    if state.is_select and not state.is_relationship_load and not state.is_column_load:
+        state.statement = state.statement.options(raiseload("*", sql_only=True))
+
+
+def install_strict_loading() -> None:
+    """Register the strict loading hook if ``Settings.strict_loading`` is on."""
+    global _strict_installed
+
+    if _strict_installed or get_settings().strict_loading == "off":
+        return
+    with _strict_lock:
+        if not _strict_installed:
+            event.listen(Session, "do_orm_execute", _on_execute)
+            _strict_installed = True
+
+
+def apply_load(statement: Any, model: type[Base], load: LoadSpec) -> Any:
+    """Add the loader options for ``load`` to a select statement."""
+    options = load_options(model, load)
+    return statement.options(*options) if options else statement
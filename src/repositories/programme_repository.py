@@ -5,28 +5,41 @@ from sqlalchemy.orm import Session
 
 from src.models.programme import Programme
 from src.repositories.base import BaseRepository
+from src.repositories.cache import cached_query
+from src.repositories.loading import LoadSpec
 
 
 class ProgrammeRepository(BaseRepository[Programme]):
     """Repository for Programme entity operations."""
 
-    def __init__(self, session: Session | None = None) -> None:
-        super().__init__(session)
+    def __init__(
+        self,
+        session: Session | None = None,
+        read_session: Session | None = None,
+    ) -> None:
+        super().__init__(session, read_session)
 
     @property
     def model_class(self) -> type[Programme]:
         return Programme
 
+    @cached_query(Programme)
     def get_by_name(self, name: str) -> Programme | None:
         """Get a programme by its name."""
         stmt = select(Programme).where(Programme.name == name)
-        return self._session.scalar(stmt)
-
-    def get_by_degree(self, degree_awarded: str) -> list[Programme]:
+        return self._read_session.scalar(stmt)
+
+    @cached_query(Programme)
+    def get_by_degree(
+        self,
+        degree_awarded: str,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Programme]:
         """Get all programmes awarding a specific degree."""
         stmt = (
             select(Programme)
             .where(Programme.degree_awarded == degree_awarded)
             .order_by(Programme.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
@@ -1,65 +1,151 @@
 """Research project repository using SQLAlchemy ORM."""
 
-from sqlalchemy import func, select
+from typing import Iterable
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.models.research import ProjectFunding, ProjectOutcome, ResearchProject
 from src.models.tables import research_project_member
-from src.repositories.base import BaseRepository
+from src.repositories.base import BULK_CHUNK_SIZE, SEARCH_LIMIT, BaseRepository
+from src.repositories.cache import cached_query
+from src.repositories.loading import LoadSpec, apply_load
 
 
 class ResearchProjectRepository(BaseRepository[ResearchProject]):
     """Repository for ResearchProject entity operations."""
 
-    def __init__(self, session: Session | None = None) -> None:
-        super().__init__(session)
+    fts_table = "research_project_fts"
+    trigram_table = "research_project_trigram"
+    search_columns = ("title",)
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        read_session: Session | None = None,
+    ) -> None:
+        super().__init__(session, read_session)
 
     @property
     def model_class(self) -> type[ResearchProject]:
         return ResearchProject
 
-    def get_by_department(self, dept_id: int) -> list[ResearchProject]:
+    @cached_query(ResearchProject)
+    def get_by_department(
+        self,
+        dept_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[ResearchProject]:
         """Get all research projects in a department."""
         stmt = (
             select(ResearchProject)
             .where(ResearchProject.dept_id == dept_id)
             .order_by(ResearchProject.title)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
+    @cached_query(ResearchProject)
     def get_by_head_lecturer(self, lecturer_id: int) -> ResearchProject | None:
         """Get the research project headed by a lecturer."""
         stmt = select(ResearchProject).where(
             ResearchProject.head_lecturer_id == lecturer_id
         )
-        return self._session.scalar(stmt)
+        return self._read_session.scalar(stmt)
+
+    @cached_query(ResearchProject, research_project_member)
+    def get_by_student(
+        self,
+        student_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[ResearchProject]:
+        """Get all research projects a student is a member of."""
+        stmt = (
+            select(ResearchProject)
+            .join(
+                research_project_member,
+                ResearchProject.project_id == research_project_member.c.project_id,
+            )
+            .where(research_project_member.c.student_id == student_id)
+            .order_by(ResearchProject.title)
+        )
+        return self._scalars(stmt, load)
+
+    def get_by_students(
+        self,
+        student_ids: Iterable[int],
+        *,
+        load: LoadSpec = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> dict[int, list[ResearchProject]]:
+        """Get the research projects of several students.
+
+        Returns a dict mapping every requested student ID to their projects,
+        ordered by title (an empty list for students in no project). Uses one
+        query per ``chunk_size`` IDs.
+        """
+        ids = list(dict.fromkeys(student_ids))
+        projects: dict[int, list[ResearchProject]] = {student_id: [] for student_id in ids}
+        member_id = research_project_member.c.student_id
+        for start in range(0, len(ids), chunk_size):
+            stmt = (
+                select(member_id, ResearchProject)
+                .join(
+                    research_project_member,
+                    ResearchProject.project_id == research_project_member.c.project_id,
+                )
+                .where(member_id.in_(ids[start : start + chunk_size]))
+                .order_by(member_id, ResearchProject.title)
+            )
+            stmt = apply_load(stmt, ResearchProject, load)
+            for student_id, project in self._read_session.execute(stmt):
+                projects[student_id].append(project)
+        return projects
 
-    def get_funding(self, project_id: int) -> list[ProjectFunding]:
+    @cached_query(ProjectFunding)
+    def get_funding(
+        self,
+        project_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[ProjectFunding]:
         """Get all funding sources for a project."""
         stmt = (
             select(ProjectFunding)
             .where(ProjectFunding.project_id == project_id)
             .order_by(ProjectFunding.source_name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_outcomes(self, project_id: int) -> list[ProjectOutcome]:
+    @cached_query(ProjectOutcome)
+    def get_outcomes(
+        self,
+        project_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[ProjectOutcome]:
         """Get all outcomes for a project."""
         stmt = (
             select(ProjectOutcome)
             .where(ProjectOutcome.project_id == project_id)
             .order_by(ProjectOutcome.outcome_date.desc())
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def search(self, title: str) -> list[ResearchProject]:
-        """Search projects by title."""
-        stmt = (
-            select(ResearchProject)
-            .where(func.lower(ResearchProject.title).like(func.lower(f"%{title}%")))
-            .order_by(ResearchProject.title)
-        )
-        return list(self._session.scalars(stmt).all())
+    def search(
+        self,
+        title: str,
+        limit: int | None = SEARCH_LIMIT,
+        mode: str = "prefix",
+    ) -> list[ResearchProject]:
+        """Search research projects by title.
+
+        ``"prefix"`` mode matches the start of words, e.g. "neur net" finds
+        "Neural Network Architectures"; ``"substring"`` mode matches anywhere
+        in the title, e.g. "tain" in "Sustainable Computing".
+        """
+        return self._search(title, limit, mode)
 
     def add_member(self, project_id: int, student_id: int) -> bool:
         """Add a student member to a research project."""
@@ -87,15 +173,12 @@ class ResearchProjectRepository(BaseRepository[ResearchProject]):
         amount: float | None = None,
     ) -> ProjectFunding:
         """Add a funding source to a project."""
-        funding = ProjectFunding(
+        return self._insert_returning(
+            ProjectFunding,
             project_id=project_id,
             source_name=source_name,
             amount=amount,
         )
-        self._session.add(funding)
-        self._session.flush()
-        self._session.refresh(funding)
-        return funding
 
     def add_outcome(
         self,
@@ -104,12 +187,9 @@ class ResearchProjectRepository(BaseRepository[ResearchProject]):
         outcome_date: str | None = None,
     ) -> ProjectOutcome:
         """Add an outcome to a project."""
-        outcome = ProjectOutcome(
+        return self._insert_returning(
+            ProjectOutcome,
             project_id=project_id,
             description=description,
             outcome_date=outcome_date,
         )
-        self._session.add(outcome)
-        self._session.flush()
-        self._session.refresh(outcome)
-        return outcome
@@ -1,47 +1,69 @@
 """Staff repository using SQLAlchemy ORM."""
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.models.staff import NonAcademicStaff
-from src.repositories.base import BaseRepository
+from src.repositories.base import SEARCH_LIMIT, BaseRepository
+from src.repositories.cache import cached_query
+from src.repositories.loading import LoadSpec
 
 
 class StaffRepository(BaseRepository[NonAcademicStaff]):
     """Repository for NonAcademicStaff entity operations."""
 
-    def __init__(self, session: Session | None = None) -> None:
-        super().__init__(session)
+    fts_table = "non_academic_staff_fts"
+    trigram_table = "non_academic_staff_trigram"
+    search_columns = ("name",)
+    categorical_columns = ("employment_type",)
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        read_session: Session | None = None,
+    ) -> None:
+        super().__init__(session, read_session)
 
     @property
     def model_class(self) -> type[NonAcademicStaff]:
         return NonAcademicStaff
 
-    def get_by_department(self, dept_id: int) -> list[NonAcademicStaff]:
+    @cached_query(NonAcademicStaff)
+    def get_by_department(
+        self,
+        dept_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[NonAcademicStaff]:
         """Get all staff members in a department."""
         stmt = (
             select(NonAcademicStaff)
             .where(NonAcademicStaff.dept_id == dept_id)
             .order_by(NonAcademicStaff.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_by_job_title(self, job_title: str) -> list[NonAcademicStaff]:
+    @cached_query(NonAcademicStaff)
+    def get_by_job_title(
+        self,
+        job_title: str,
+        *,
+        load: LoadSpec = None,
+    ) -> list[NonAcademicStaff]:
         """Get all staff members with a specific job title."""
-        stmt = (
-            select(NonAcademicStaff)
-            .where(
-                func.lower(NonAcademicStaff.job_title).like(
-                    func.lower(f"%{job_title}%")
-                )
-            )
-            .order_by(NonAcademicStaff.name)
+        return self._scalars_with_fallback(
+            lambda use_index: select(NonAcademicStaff)
+            .where(self._contains(["job_title"], job_title, use_index=use_index))
+            .order_by(NonAcademicStaff.name),
+            load,
         )
-        return list(self._session.scalars(stmt).all())
 
+    @cached_query(NonAcademicStaff)
     def get_by_employment_type(
         self,
         employment_type: str,
+        *,
+        load: LoadSpec = None,
     ) -> list[NonAcademicStaff]:
         """Get all staff members with a specific employment type."""
         stmt = (
@@ -49,13 +71,18 @@ class StaffRepository(BaseRepository[NonAcademicStaff]):
             .where(NonAcademicStaff.employment_type == employment_type)
             .order_by(NonAcademicStaff.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def search(self, name: str) -> list[NonAcademicStaff]:
-        """Search staff by name."""
-        stmt = (
-            select(NonAcademicStaff)
-            .where(func.lower(NonAcademicStaff.name).like(func.lower(f"%{name}%")))
-            .order_by(NonAcademicStaff.name)
-        )
-        return list(self._session.scalars(stmt).all())
+    def search(
+        self,
+        name: str,
+        limit: int | None = SEARCH_LIMIT,
+        mode: str = "prefix",
+    ) -> list[NonAcademicStaff]:
+        """Search non-academic staff by name (not job title).
+
+        ``"prefix"`` mode matches the start of words, e.g. "way ril" finds
+        "Wayne Riley"; ``"substring"`` mode matches anywhere, e.g. "machado"
+        in "Ruben Sanz-Machado".
+        """
+        return self._search(name, limit, mode)
@@ -1,40 +1,128 @@
 """Student repository using SQLAlchemy ORM."""
 
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from src.models.course import Course
+from src.models.department import Department
+from src.models.lecturer import Lecturer
+from src.models.programme import Programme
+from src.models.research import ResearchProject
 from src.models.student import DisciplinaryRecord, Student, StudentGrade
 from src.models.tables import (
     lecturer_course,
     research_project_member,
     student_course,
 )
-from src.repositories.base import BaseRepository
+from src.repositories.base import SEARCH_LIMIT, BaseRepository
+from src.repositories.cache import cached_query
+from src.repositories.loading import LoadSpec
+
+# Final year assumed for students whose programme has no duration
+DEFAULT_PROGRAMME_YEARS = 4
+
+
+class HighPerformingStudent(NamedTuple):
+    """A final-year student with their average grade."""
+
+    student_id: int
+    name: str
+    programme_id: int
+    year_of_study: int
+    average_grade: float
+
+
+class CourseAverage(NamedTuple):
+    """A student's graded assessments and average grade in one course."""
+
+    course: Course
+    assessments: int
+    average_grade: float
+
+
+@dataclass
+class StudentProfile:
+    """Everything shown on a student's profile, loaded together.
+
+    Built by ``StudentRepository.get_profile``; every relationship used here
+    is already loaded, so reading it issues no further queries.
+    """
+
+    student: Student
+    programme: Programme | None
+    advisor: Lecturer | None
+    advisor_department: Department | None
+    grades: list[StudentGrade] = field(default_factory=list)
+    disciplinary_records: list[DisciplinaryRecord] = field(default_factory=list)
+    research_projects: list[ResearchProject] = field(default_factory=list)
+
+    @property
+    def course_averages(self) -> list[CourseAverage]:
+        """Average grade per course, ignoring ungraded assessments."""
+        by_course: dict[int, list[StudentGrade]] = {}
+        for grade in self.grades:
+            if grade.grade is not None:
+                by_course.setdefault(grade.course_id, []).append(grade)
+        return [
+            CourseAverage(
+                grades[0].course,
+                len(grades),
+                sum(g.grade for g in grades) / len(grades),
+            )
+            for grades in by_course.values()
+        ]
+
+    @property
+    def overall_average(self) -> float | None:
+        """Mean of the course averages, or None if nothing is graded."""
+        averages = [course.average_grade for course in self.course_averages]
+        return sum(averages) / len(averages) if averages else None
 
 
 class StudentRepository(BaseRepository[Student]):
     """Repository for Student entity operations."""
 
-    def __init__(self, session: Session | None = None) -> None:
-        super().__init__(session)
+    fts_table = "student_fts"
+    trigram_table = "student_trigram"
+    search_columns = ("name",)
+    categorical_columns = ("graduation_status",)
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        read_session: Session | None = None,
+    ) -> None:
+        super().__init__(session, read_session)
 
     @property
     def model_class(self) -> type[Student]:
         return Student
 
-    def get_by_advisor(self, lecturer_id: int) -> list[Student]:
+    @cached_query(Student)
+    def get_by_advisor(
+        self,
+        lecturer_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Student]:
         """Get all students advised by a lecturer."""
         stmt = (
             select(Student)
             .where(Student.advisor_id == lecturer_id)
             .order_by(Student.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
+    @cached_query(Student, student_course, lecturer_course)
     def get_in_course_by_lecturer(
         self,
         course_id: int,
         lecturer_id: int,
+        *,
+        load: LoadSpec = None,
     ) -> list[Student]:
         """Get students enrolled in a course taught by a specific lecturer."""
         stmt = (
@@ -48,36 +136,95 @@ class StudentRepository(BaseRepository[Student]):
             )
             .order_by(Student.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_grades(self, student_id: int) -> list[StudentGrade]:
+    @cached_query(StudentGrade)
+    def get_grades(
+        self,
+        student_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[StudentGrade]:
         """Get all grades for a student."""
         stmt = (
             select(StudentGrade)
             .where(StudentGrade.student_id == student_id)
             .order_by(StudentGrade.date_recorded.desc())
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_disciplinary_records(self, student_id: int) -> list[DisciplinaryRecord]:
+    def get_profile(self, student_id: int) -> StudentProfile:
+        """Load a student with everything their profile shows.
+
+        The student, programme, advisor and advisor's department come from one
+        joined query; grades with their courses, disciplinary records and
+        research projects with their head lecturers are each loaded with one
+        ``IN`` query, so the statement count doesn't grow with the data.
+
+        Raises:
+            EntityNotFoundError: If the student doesn't exist.
+        """
+        student = self.get_by_id(
+            student_id,
+            load=[
+                "programme",
+                "advisor.department",
+                "grades.course",
+                "disciplinary_records",
+                "research_projects.head_lecturer",
+            ],
+        )
+        advisor = student.advisor
+        return StudentProfile(
+            student=student,
+            programme=student.programme,
+            advisor=advisor,
+            advisor_department=advisor.department if advisor else None,
+            grades=sorted(
+                student.grades,
+                key=lambda g: g.date_recorded or "",
+                reverse=True,
+            ),
+            disciplinary_records=sorted(
+                student.disciplinary_records,
+                key=lambda r: r.incident_date or "",
+                reverse=True,
+            ),
+            research_projects=sorted(student.research_projects, key=lambda p: p.title),
+        )
+
+    @cached_query(DisciplinaryRecord)
+    def get_disciplinary_records(
+        self,
+        student_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[DisciplinaryRecord]:
         """Get all disciplinary records for a student."""
         stmt = (
             select(DisciplinaryRecord)
             .where(DisciplinaryRecord.student_id == student_id)
             .order_by(DisciplinaryRecord.incident_date.desc())
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_by_programme(self, programme_id: int) -> list[Student]:
+    @cached_query(Student)
+    def get_by_programme(
+        self,
+        programme_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Student]:
         """Get all students enrolled in a programme."""
         stmt = (
             select(Student)
             .where(Student.programme_id == programme_id)
             .order_by(Student.year_of_study, Student.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def get_by_course(self, course_id: int) -> list[Student]:
+    @cached_query(Student, student_course)
+    def get_by_course(self, course_id: int, *, load: LoadSpec = None) -> list[Student]:
         """Get all students enrolled in a course."""
         stmt = (
             select(Student)
@@ -85,18 +232,65 @@ class StudentRepository(BaseRepository[Student]):
             .where(student_course.c.course_id == course_id)
             .order_by(Student.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
-    def search(self, name: str) -> list[Student]:
-        """Search students by name."""
+    @cached_query(Student, Programme, StudentGrade)
+    def get_high_performing_final_year(
+        self,
+        threshold: float,
+    ) -> list[HighPerformingStudent]:
+        """Get final-year students whose average grade is at least ``threshold``.
+
+        A student is in their final year when ``year_of_study`` equals their
+        programme's ``duration_years`` (``DEFAULT_PROGRAMME_YEARS`` if the
+        programme has none). Ungraded assessments are ignored and students
+        with no grades are excluded. The join, average and filter run as one
+        aggregate query; rows are ordered by average grade, highest first.
+        """
+        average_grade = func.avg(StudentGrade.grade).label("average_grade")
+        final_year = func.coalesce(Programme.duration_years, DEFAULT_PROGRAMME_YEARS)
         stmt = (
-            select(Student)
-            .where(func.lower(Student.name).like(func.lower(f"%{name}%")))
-            .order_by(Student.name)
+            select(
+                Student.student_id,
+                Student.name,
+                Student.programme_id,
+                Student.year_of_study,
+                average_grade,
+            )
+            .join(StudentGrade, StudentGrade.student_id == Student.student_id)
+            .outerjoin(Programme, Programme.programme_id == Student.programme_id)
+            .where(
+                Student.programme_id.is_not(None),
+                Student.year_of_study == final_year,
+            )
+            .group_by(Student.student_id)
+            .having(average_grade >= threshold)
+            .order_by(average_grade.desc(), Student.student_id)
         )
-        return list(self._session.scalars(stmt).all())
+        result = self._read_session.execute(stmt).tuples()
+        return list(map(HighPerformingStudent._make, result))
+
+    def search(
+        self,
+        name: str,
+        limit: int | None = SEARCH_LIMIT,
+        mode: str = "prefix",
+    ) -> list[Student]:
+        """Search students by name.
+
+        ``"prefix"`` mode matches the start of words, e.g. "amb" finds
+        "Amber Perez"; ``"substring"`` mode matches anywhere, e.g. "simpson"
+        in "Bernard Wilkinson-Simpson".
+        """
+        return self._search(name, limit, mode)
 
-    def get_by_research_project(self, project_id: int) -> list[Student]:
+    @cached_query(Student, research_project_member)
+    def get_by_research_project(
+        self,
+        project_id: int,
+        *,
+        load: LoadSpec = None,
+    ) -> list[Student]:
         """Get all student members of a research project."""
         stmt = (
             select(Student)
@@ -107,7 +301,7 @@ class StudentRepository(BaseRepository[Student]):
             .where(research_project_member.c.project_id == project_id)
             .order_by(Student.name)
         )
-        return list(self._session.scalars(stmt).all())
+        return self._scalars(stmt, load)
 
     def enrol_in_course(self, student_id: int, course_id: int) -> bool:
         """Enrol a student in a course."""
@@ -137,17 +331,14 @@ class StudentRepository(BaseRepository[Student]):
         date_recorded: str | None = None,
     ) -> StudentGrade:
         """Add a grade record for a student."""
-        student_grade = StudentGrade(
+        return self._insert_returning(
+            StudentGrade,
             student_id=student_id,
             course_id=course_id,
             assessment_type=assessment_type,
             grade=grade,
             date_recorded=date_recorded,
         )
-        self._session.add(student_grade)
-        self._session.flush()
-        self._session.refresh(student_grade)
-        return student_grade
 
     def add_disciplinary_record(
         self,
@@ -157,13 +348,10 @@ class StudentRepository(BaseRepository[Student]):
         action_taken: str | None = None,
     ) -> DisciplinaryRecord:
         """Add a disciplinary record for a student."""
-        record = DisciplinaryRecord(
+        return self._insert_returning(
+            DisciplinaryRecord,
             student_id=student_id,
             incident_date=incident_date,
             description=description,
             action_taken=action_taken,
         )
-        self._session.add(record)
-        self._session.flush()
-        self._session.refresh(record)
-        return record
@@ -1,6 +1,5 @@
 """API service providing the main interface for database access."""
 
-from src.database import get_session
 from src.repositories import (
     CourseRepository,
     DepartmentRepository,
@@ -17,7 +16,8 @@ class APIService:
     """Facade providing a single entry point for all data access.
 
     Singleton that exposes repositories as properties for GUI consumption.
-    Uses a shared session for transaction consistency.
+    Uses a shared writer session for transaction consistency and a
+    read-only session for queries (see ``RepositoryFactory``).
 
     Example:
         api = APIService()
@@ -36,7 +36,7 @@ class APIService:
 
     def _initialise(self) -> None:
         """Initialise the service with a factory instance."""
-        self._factory = RepositoryFactory(get_session())
+        self._factory = RepositoryFactory()
 
     @property
     def student_repo(self) -> StudentRepository:
@@ -0,0 +1,57 @@
+"""Shared fixtures: a seeded database file per test."""
+
+import sqlite3
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from src.config.settings import Settings
+from src.database import engine
+from src.repositories import RepositoryFactory, cache
+
+DATABASE_DIR = Path(__file__).parent.parent / "database"
+
+
+@pytest.fixture
+def settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Settings:
+    """Settings for a fresh copy of the schema and seed data in ``tmp_path``."""
+    db_path = tmp_path / "university.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript((DATABASE_DIR / "schema.sql").read_text(encoding="utf-8"))
+    conn.executescript((DATABASE_DIR / "seed_data.sql").read_text(encoding="utf-8"))
+    conn.close()
+
+    settings = Settings(
+        database_path=db_path,
+        encryption_key=None,
+        in_memory=False,
+        entity_cache={"department": (100, None), "student": (100, None)},
+        query_cache_size=100,
+        checkpoint_interval=None,
+        checkpoint_commits=None,
+    )
+    monkeypatch.setattr(Settings, "_instance", settings)
+    # The caches are built from settings on first use
+    monkeypatch.setattr(cache, "_entity_cache", None)
+    monkeypatch.setattr(cache, "_query_cache", None)
+    return settings
+
+
+@pytest.fixture
+def encrypted_settings(settings: Settings) -> Settings:
+    """The test database settings with encryption at rest enabled."""
+    settings.encryption_key = "secret"
+    settings.kdf_iterations = 1000
+    settings.encryption_chunk_size = 4096
+    return settings
+
+
+@pytest.fixture
+def factory(settings: Settings) -> Generator[RepositoryFactory, None, None]:
+    """A repository factory on the test database."""
+    factory = RepositoryFactory()
+    yield factory
+    factory.close()
+    # Without a key this only disposes of the engines
+    engine.encrypt_database()
@@ -0,0 +1,257 @@
+"""Entity and query caches: invalidation on writes, eviction and expiry."""
+
+from typing import Callable, Generator
+
+import pytest
+
+from src.config.settings import Settings
+from src.exceptions import EntityNotFoundError
+from src.repositories import (
+    CacheStats,
+    RepositoryFactory,
+    cache,
+    get_entity_cache,
+    get_query_cache,
+)
+
+SCIENCE = "Science and Engineering"
+
+
+@pytest.fixture
+def new_factory(
+    factory: RepositoryFactory,
+) -> Generator[Callable[[], RepositoryFactory], None, None]:
+    """Open more factories (sessions) on the test database."""
+    factories: list[RepositoryFactory] = []
+
+    def open_factory() -> RepositoryFactory:
+        factories.append(RepositoryFactory())
+        return factories[-1]
+
+    yield open_factory
+    for other in factories:
+        other.close()
+
+
+def _names(entities) -> list[str]:
+    return [entity.name for entity in entities]
+
+
+def test_query_results_are_cached(factory: RepositoryFactory) -> None:
+    departments = factory.get_department_repository()
+    first = _names(departments.get_by_faculty(SCIENCE))
+    hits = get_query_cache().stats().hits
+    assert _names(departments.get_by_faculty(SCIENCE)) == first
+    assert get_query_cache().stats().hits == hits + 1
+
+
+def test_update_invalidates_query_results(
+    factory: RepositoryFactory, new_factory: Callable[[], RepositoryFactory]
+) -> None:
+    departments = factory.get_department_repository()
+    assert "Physics" in _names(departments.get_by_faculty(SCIENCE))
+
+    departments.update(3, faculty="Arts and Humanities")
+    factory.commit()
+
+    assert "Physics" not in _names(departments.get_by_faculty(SCIENCE))
+    other = new_factory().get_department_repository()
+    assert "Physics" in _names(other.get_by_faculty("Arts and Humanities"))
+
+
+def test_association_write_invalidates_query_results(factory: RepositoryFactory) -> None:
+    courses = factory.get_course_repository()
+    assert [c.course_id for c in courses.get_by_lecturer(1)] == [1]
+
+    factory.get_lecturer_repository().assign_to_course(1, 2)
+    factory.commit()
+
+    assert [c.course_id for c in courses.get_by_lecturer(1)] == [1, 2]
+
+
+def test_insert_invalidates_query_results(factory: RepositoryFactory) -> None:
+    departments = factory.get_department_repository()
+    before = [area.area for area in departments.get_research_areas(1)]
+
+    departments.add_research_area(1, "Quantum Computing")
+    factory.commit()
+
+    after = [area.area for area in departments.get_research_areas(1)]
+    assert sorted(after) == sorted([*before, "Quantum Computing"])
+
+
+def test_bulk_update_invalidates_query_results(factory: RepositoryFactory) -> None:
+    courses = factory.get_course_repository()
+    assert [c.course_code for c in courses.get_by_level("Postgraduate")] == ["CS401"]
+
+    courses.bulk_update([{"course_id": 1, "level": "Postgraduate"}])
+    factory.commit()
+
+    assert sorted(c.course_code for c in courses.get_by_level("Postgraduate")) == [
+        "CS101",
+        "CS401",
+    ]
+
+
+def test_uncommitted_writes_are_not_shared(
+    factory: RepositoryFactory, new_factory: Callable[[], RepositoryFactory]
+) -> None:
+    departments = factory.get_department_repository()
+    other = new_factory().get_department_repository()
+    assert "Physics" in _names(other.get_by_faculty(SCIENCE))
+
+    departments.update(3, faculty="Arts and Humanities")
+    # The writer reads its own changes; nobody else sees (or caches) them
+    assert "Physics" not in _names(departments.get_by_faculty(SCIENCE))
+    assert "Physics" in _names(other.get_by_faculty(SCIENCE))
+
+    factory.rollback()
+    assert "Physics" in _names(departments.get_by_faculty(SCIENCE))
+    assert "Physics" in _names(new_factory().get_department_repository().get_by_faculty(SCIENCE))
+
+
+def test_entities_are_served_from_cache(
+    factory: RepositoryFactory, new_factory: Callable[[], RepositoryFactory]
+) -> None:
+    assert factory.get_department_repository().get_by_id(1).name == "Computer Science"
+    hits = get_entity_cache().stats()["department"].hits
+
+    department = new_factory().get_department_repository().get_by_id(1)
+
+    assert department.name == "Computer Science"
+    assert get_entity_cache().stats()["department"].hits == hits + 1
+
+
+def test_update_invalidates_cached_entity(
+    factory: RepositoryFactory, new_factory: Callable[[], RepositoryFactory]
+) -> None:
+    departments = factory.get_department_repository()
+    departments.get_by_id(1)
+
+    departments.update(1, name="Computing")
+    factory.commit()
+
+    assert new_factory().get_department_repository().get_by_id(1).name == "Computing"
+
+
+def test_rollback_leaves_no_uncommitted_entity(
+    factory: RepositoryFactory, new_factory: Callable[[], RepositoryFactory]
+) -> None:
+    departments = factory.get_department_repository()
+    departments.update(1, name="Computing")
+    assert departments.get_by_id(1).name == "Computing"
+
+    factory.rollback()
+
+    assert new_factory().get_department_repository().get_by_id(1).name == "Computer Science"
+
+
+def test_bulk_update_invalidates_cached_entities(
+    factory: RepositoryFactory, new_factory: Callable[[], RepositoryFactory]
+) -> None:
+    students = factory.get_student_repository()
+    students.get_many([1, 2])
+
+    students.bulk_update([{"student_id": 1, "name": "A"}, {"student_id": 2, "name": "B"}])
+    factory.commit()
+
+    reloaded = new_factory().get_student_repository().get_many([1, 2])
+    assert {student_id: s.name for student_id, s in reloaded.items()} == {1: "A", 2: "B"}
+
+
+def test_delete_invalidates_cached_entity(
+    factory: RepositoryFactory, new_factory: Callable[[], RepositoryFactory]
+) -> None:
+    departments = factory.get_department_repository()
+    dept_id = departments.create(name="History", faculty="Arts and Humanities").dept_id
+    factory.commit()
+    departments.get_by_id(dept_id)
+    assert "History" in _names(departments.get_by_faculty("Arts and Humanities"))
+
+    departments.delete(dept_id)
+    factory.commit()
+
+    other = new_factory().get_department_repository()
+    with pytest.raises(EntityNotFoundError):
+        other.get_by_id(dept_id)
+    assert "History" not in _names(other.get_by_faculty("Arts and Humanities"))
+
+
+def test_get_many_uses_cached_entities(
+    factory: RepositoryFactory, new_factory: Callable[[], RepositoryFactory]
+) -> None:
+    factory.get_student_repository().get_many([1, 2, 3])
+    hits = get_entity_cache().stats()["student"].hits
+
+    found = new_factory().get_student_repository().get_many([3, 1, 4])
+
+    assert list(found) == [3, 1, 4]
+    assert get_entity_cache().stats()["student"].hits == hits + 2
+
+
+def test_entity_cache_evicts_least_recently_used(
+    settings: Settings, new_factory: Callable[[], RepositoryFactory]
+) -> None:
+    settings.entity_cache = {"department": (2, None)}
+    departments = new_factory().get_department_repository()
+    for dept_id in (1, 2, 3):
+        departments.get_by_id(dept_id)
+
+    stats = get_entity_cache().stats()["department"]
+    assert (stats.size, stats.evictions) == (2, 1)
+    assert get_entity_cache().get(departments.model_class, 1) is None
+    assert get_entity_cache().get(departments.model_class, 3) is not None
+
+
+def test_entity_cache_entries_expire(
+    settings: Settings,
+    new_factory: Callable[[], RepositoryFactory],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    settings.entity_cache = {"department": (100, 60.0)}
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    departments = new_factory().get_department_repository()
+    departments.get_by_id(1)
+    model = departments.model_class
+
+    now[0] += 59
+    assert get_entity_cache().get(model, 1) is not None
+    now[0] += 2
+    assert get_entity_cache().get(model, 1) is None
+    assert get_entity_cache().stats()["department"].evictions == 1
+
+
+def test_query_cache_evicts_least_recently_used(
+    settings: Settings, factory: RepositoryFactory
+) -> None:
+    settings.query_cache_size = 1
+    departments = factory.get_department_repository()
+    departments.get_by_faculty(SCIENCE)
+    departments.get_by_faculty("Arts and Humanities")
+
+    stats = get_query_cache().stats()
+    assert (stats.size, stats.evictions) == (1, 1)
+    departments.get_by_faculty(SCIENCE)
+    assert get_query_cache().stats().hits == 0
+
+
+def test_query_cache_disabled_at_size_zero(settings: Settings, factory: RepositoryFactory) -> None:
+    settings.query_cache_size = 0
+    departments = factory.get_department_repository()
+    departments.get_by_faculty(SCIENCE)
+    departments.get_by_faculty(SCIENCE)
+
+    assert get_query_cache().stats() == CacheStats()
+
+
+def test_delete_where_invalidates_query_results(factory: RepositoryFactory) -> None:
+    departments = factory.get_department_repository()
+    departments.create(name="History", faculty="Arts and Humanities")
+    factory.commit()
+    assert "History" in _names(departments.get_by_faculty("Arts and Humanities"))
+
+    assert departments.delete_where(name="History") == 1
+    factory.commit()
+
+    assert "History" not in _names(departments.get_by_faculty("Arts and Humanities"))
@@ -0,0 +1,161 @@
+"""Encrypted checkpoints: what they write and when they run."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.config.settings import Settings
+from src.database import Checkpointer, checkpoint, engine
+from src.repositories import RepositoryFactory
+
+
+def _checkpointed_name(encrypted_path: Path, student_id: int) -> str:
+    """Read a student's name from the decrypted checkpoint."""
+    restored = encrypted_path.with_name("restored.db")
+    with restored.open("wb") as destination:
+        engine._read_encrypted(encrypted_path, destination, "secret")
+    conn = sqlite3.connect(restored)
+    try:
+        return conn.execute(
+            "SELECT name FROM student WHERE student_id = ?", (student_id,)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+        restored.unlink()
+
+
+def test_checkpoint_writes_committed_data(
+    encrypted_settings: Settings, factory: RepositoryFactory
+) -> None:
+    encrypted_path = Path(f"{encrypted_settings.database_path}.enc")
+    factory.get_student_repository().update(1, name="Checkpointed")
+    factory.commit()
+
+    assert engine.checkpoint_database()
+
+    assert _checkpointed_name(encrypted_path, 1) == "Checkpointed"
+    # No plaintext snapshot next to the database
+    files = {path.name for path in encrypted_path.parent.iterdir()}
+    assert files <= {
+        "university.db", "university.db-wal", "university.db-shm", "university.db.enc"
+    }
+
+
+def test_checkpoint_writes_no_plaintext_copy(
+    encrypted_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    directory = encrypted_settings.database_path.parent
+    seen: list[set[str]] = []
+
+    # A crash while encrypting must not leave a plaintext copy on disk
+    def crash(*args, **kwargs) -> None:
+        seen.append({path.name for path in directory.iterdir()})
+        raise RuntimeError("crash mid-checkpoint")
+
+    monkeypatch.setattr(engine, "_write_encrypted", crash)
+    with pytest.raises(RuntimeError):
+        engine.checkpoint_database()
+
+    assert seen == [{"university.db"}]
+
+
+def test_checkpoint_updates_container_incrementally(
+    encrypted_settings: Settings, factory: RepositoryFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert engine.checkpoint_database()
+    fresh_writes = []
+    encrypt_stream = engine.encrypt_stream
+    monkeypatch.setattr(
+        engine,
+        "encrypt_stream",
+        lambda *args, **kwargs: fresh_writes.append(1) or encrypt_stream(*args, **kwargs),
+    )
+
+    factory.get_student_repository().update(1, name="Incremental")
+    factory.commit()
+    assert engine.checkpoint_database()
+
+    assert fresh_writes == []
+    encrypted_path = Path(f"{encrypted_settings.database_path}.enc")
+    assert _checkpointed_name(encrypted_path, 1) == "Incremental"
+
+
+def test_leftover_snapshot_is_removed_on_startup(encrypted_settings: Settings) -> None:
+    db_path = encrypted_settings.database_path
+    engine.encrypt_database()
+    snapshot_path = Path(f"{db_path}.snapshot")
+    snapshot_path.write_bytes(b"plaintext left by a crash")
+
+    engine.decrypt_database()
+
+    assert not snapshot_path.exists()
+    assert db_path.exists()
+
+
+class _Recorder:
+    """Stands in for checkpoint_database, counting calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.called = threading.Event()
+
+    def __call__(self) -> bool:
+        self.calls += 1
+        self.called.set()
+        return True
+
+
+@pytest.fixture
+def checkpoints(monkeypatch: pytest.MonkeyPatch) -> _Recorder:
+    """Record checkpoints instead of writing them."""
+    recorder = _Recorder()
+    monkeypatch.setattr(checkpoint, "checkpoint_database", recorder)
+    return recorder
+
+
+def test_commit_threshold_counts_only_writes(
+    encrypted_settings: Settings, factory: RepositoryFactory, checkpoints: _Recorder
+) -> None:
+    checkpointer = Checkpointer(interval=0, commit_threshold=2)
+    checkpointer.start()
+    try:
+        students = factory.get_student_repository()
+        students.update(1, name="First")
+        factory.commit()
+        # Reads and empty commits don't count
+        students.get_all()
+        factory.commit()
+        factory.commit()
+        assert not checkpoints.called.wait(0.3)
+
+        students.update(2, name="Second")
+        factory.commit()
+        assert checkpoints.called.wait(5)
+    finally:
+        checkpointer.stop()
+    assert checkpoints.calls == 1
+
+
+def test_rolled_back_writes_do_not_count(
+    encrypted_settings: Settings, factory: RepositoryFactory, checkpoints: _Recorder
+) -> None:
+    checkpointer = Checkpointer(interval=0, commit_threshold=1)
+    checkpointer.start()
+    try:
+        factory.get_student_repository().update(1, name="Discarded")
+        factory.rollback()
+        factory.commit()
+        assert not checkpoints.called.wait(0.3)
+    finally:
+        checkpointer.stop()
+
+
+def test_interval_trigger(encrypted_settings: Settings, checkpoints: _Recorder) -> None:
+    checkpointer = Checkpointer(interval=0.05, commit_threshold=0)
+    checkpointer.start()
+    try:
+        assert checkpoints.called.wait(5)
+    finally:
+        checkpointer.stop()
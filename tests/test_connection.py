@@ -0,0 +1,136 @@
+"""The raw connection pool: limits, counters and pinned connections."""
+
+import gc
+import threading
+from typing import Generator
+
+import pytest
+
+from src.config.settings import Settings
+from src.database import DatabaseConnection, get_connection
+from src.exceptions import DatabaseError
+
+
+@pytest.fixture
+def pool(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> Generator[DatabaseConnection, None, None]:
+    """A fresh pool of two connections that gives up waiting quickly."""
+    settings.connection_pool_size = 2
+    settings.connection_pool_timeout = 0.1
+    monkeypatch.setattr(DatabaseConnection, "_instance", None)
+    pool = get_connection()
+    yield pool
+    pool.close()
+
+
+def _in_thread(function) -> None:
+    thread = threading.Thread(target=function)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "blocked"
+
+
+def _pin(pool: DatabaseConnection) -> None:
+    with pytest.warns(DeprecationWarning):
+        pool.connection.execute("SELECT 1")
+
+
+def test_nested_blocks_share_a_connection(pool: DatabaseConnection) -> None:
+    with pool.checkout() as outer, pool.cursor() as cursor:
+        assert cursor.connection is outer
+    assert pool.stats.checkouts == 1
+    assert pool.stats.in_use == 0
+
+
+def test_exhausted_pool_times_out(pool: DatabaseConnection) -> None:
+    held = threading.Event()
+    done = threading.Event()
+    errors: list[DatabaseError] = []
+
+    def hold() -> None:
+        with pool.checkout():
+            held.set()
+            done.wait(5)
+
+    def wait_for_slot() -> None:
+        try:
+            with pool.checkout():
+                pass
+        except DatabaseError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    try:
+        assert held.wait(5)
+        with pool.checkout():
+            # Nested blocks don't take another slot
+            with pool.checkout():
+                pass
+            _in_thread(wait_for_slot)
+    finally:
+        done.set()
+        thread.join(5)
+
+    assert len(errors) == 1 and "Timed out" in str(errors[0])
+    stats = pool.stats
+    assert (stats.open, stats.in_use, stats.peak_in_use) == (2, 0, 2)
+    assert (stats.checkouts, stats.waits, stats.timeouts) == (2, 1, 1)
+    # The slots are free again
+    _in_thread(wait_for_slot)
+    assert len(errors) == 1
+
+
+def test_connections_are_reused(pool: DatabaseConnection) -> None:
+    for _ in range(5):
+        pool.execute("SELECT 1")
+    stats = pool.stats
+    assert (stats.open, stats.checkouts, stats.peak_in_use) == (1, 5, 1)
+
+
+def test_uncommitted_cursor_write_is_rolled_back(
+    pool: DatabaseConnection, caplog: pytest.LogCaptureFixture
+) -> None:
+    with pool.cursor() as cursor:
+        cursor.execute("UPDATE student SET name = 'Lost' WHERE student_id = 1")
+    assert "Rolling back" in caplog.text
+
+    pool.execute_write("UPDATE student SET name = 'Kept' WHERE student_id = 1")
+    assert pool.execute_one("SELECT name FROM student WHERE student_id = 1")["name"] == "Kept"
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_close_keeps_other_threads_transactions(pool: DatabaseConnection) -> None:
+    pinned = threading.Event()
+    closed = threading.Event()
+    names: list[str] = []
+
+    def other_thread() -> None:
+        connection = pool.connection
+        connection.execute("UPDATE student SET name = 'Pinned' WHERE student_id = 1")
+        pinned.set()
+        closed.wait(5)
+        # Still the same connection, and the transaction is still open
+        assert pool.connection is connection
+        connection.commit()
+        names.append(pool.execute_one("SELECT name FROM student WHERE student_id = 1")["name"])
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    assert pinned.wait(5)
+    _pin(pool)
+    pool.close()
+    assert pool.stats.in_use == 1
+    closed.set()
+    thread.join(5)
+
+    assert names == ["Pinned"]
+    assert pool.stats.in_use == 0
+
+
+def test_thread_exit_releases_pinned_connection(pool: DatabaseConnection) -> None:
+    _in_thread(lambda: _pin(pool))
+    gc.collect()
+    assert pool.stats.in_use == 0
+    assert pool.stats.open == 1
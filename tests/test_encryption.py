@@ -0,0 +1,239 @@
+"""Encryption container: round trips, incremental updates and tampering."""
+
+import io
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.config.settings import Settings
+from src.database import engine
+from src.database.encryption import (
+    SALT_SIZE,
+    KeyParams,
+    decrypt_stream,
+    derive_key,
+    encrypt_stream,
+    is_container,
+    read_key_params,
+    update_container,
+)
+from src.exceptions import DatabaseError
+
+CHUNK_SIZE = 64
+PARAMS = KeyParams(salt=b"s" * SALT_SIZE, iterations=1000)
+KEY = derive_key("secret", PARAMS)
+
+# Header, then per record: kind (1) + length (4) + nonce (12) + data + tag (16)
+HEADER_SIZE = 6 + 1 + 4 + 4 + SALT_SIZE
+RECORD_SIZE = 1 + 4 + 12 + CHUNK_SIZE + 16
+
+
+def encrypt(data: bytes, workers: int = 1) -> bytes:
+    destination = io.BytesIO()
+    encrypt_stream(io.BytesIO(data), destination, KEY, PARAMS, CHUNK_SIZE, workers)
+    return destination.getvalue()
+
+
+def decrypt(container: bytes, key: bytes = KEY, workers: int = 1) -> bytes:
+    destination = io.BytesIO()
+    decrypt_stream(io.BytesIO(container), destination, key, workers)
+    return destination.getvalue()
+
+
+def update(container: bytes, data: bytes) -> bytes:
+    target = io.BytesIO(container)
+    assert update_container(io.BytesIO(data), target, KEY, CHUNK_SIZE)
+    return target.getvalue()
+
+
+@pytest.mark.parametrize("size", [0, 1, CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE * 5 + 7])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_round_trip(size: int, workers: int) -> None:
+    data = os.urandom(size)
+    assert decrypt(encrypt(data, workers), workers=workers) == data
+
+
+def test_header_records_key_params(tmp_path) -> None:
+    path = tmp_path / "db.enc"
+    path.write_bytes(encrypt(b"data"))
+    assert is_container(path)
+    assert read_key_params(path) == PARAMS
+
+
+def test_wrong_key_fails() -> None:
+    container = encrypt(b"data" * 100)
+    with pytest.raises(DatabaseError):
+        decrypt(container, key=derive_key("other", PARAMS))
+
+
+@pytest.mark.parametrize(
+    "offset",
+    [
+        HEADER_SIZE - 1,  # salt, bound into every record
+        HEADER_SIZE + 20,  # first data record ciphertext
+        HEADER_SIZE + RECORD_SIZE * 2 + 30,  # third data record
+        -1,  # trailer tag
+    ],
+)
+def test_flipped_byte_fails(offset: int) -> None:
+    container = bytearray(encrypt(os.urandom(CHUNK_SIZE * 3 + 10)))
+    container[offset] ^= 0x01
+    with pytest.raises(DatabaseError):
+        decrypt(bytes(container))
+
+
+def test_truncated_container_fails() -> None:
+    container = encrypt(os.urandom(CHUNK_SIZE * 3))
+    for size in (HEADER_SIZE - 1, HEADER_SIZE + RECORD_SIZE, len(container) - 1):
+        with pytest.raises(DatabaseError):
+            decrypt(container[:size])
+
+
+def test_dropped_record_fails() -> None:
+    container = encrypt(os.urandom(CHUNK_SIZE * 3))
+    second = HEADER_SIZE + RECORD_SIZE
+    with pytest.raises(DatabaseError):
+        decrypt(container[:second] + container[second + RECORD_SIZE:])
+
+
+def test_reordered_records_fail() -> None:
+    container = encrypt(os.urandom(CHUNK_SIZE * 3))
+    first = container[HEADER_SIZE:HEADER_SIZE + RECORD_SIZE]
+    second = container[HEADER_SIZE + RECORD_SIZE:HEADER_SIZE + RECORD_SIZE * 2]
+    swapped = (
+        container[:HEADER_SIZE] + second + first + container[HEADER_SIZE + RECORD_SIZE * 2:]
+    )
+    with pytest.raises(DatabaseError):
+        decrypt(swapped)
+
+
+def test_record_from_older_version_fails() -> None:
+    old_data = os.urandom(CHUNK_SIZE * 3)
+    new_data = old_data[:CHUNK_SIZE] + os.urandom(CHUNK_SIZE) + old_data[CHUNK_SIZE * 2:]
+    old = encrypt(old_data)
+    new = update(old, new_data)
+    # Put the old (validly sealed) second record back into the new container
+    start, end = HEADER_SIZE + RECORD_SIZE, HEADER_SIZE + RECORD_SIZE * 2
+    with pytest.raises(DatabaseError):
+        decrypt(new[:start] + old[start:end] + new[end:])
+
+
+def test_trailing_data_fails() -> None:
+    with pytest.raises(DatabaseError):
+        decrypt(encrypt(b"data") + b"x")
+
+
+def test_not_a_container_fails() -> None:
+    with pytest.raises(DatabaseError):
+        decrypt(b"SQLite format 3\x00" + bytes(100))
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda data: data,
+        lambda data: data[:10] + b"X" + data[11:],
+        lambda data: data[:CHUNK_SIZE * 2] + os.urandom(5) + data[CHUNK_SIZE * 2 + 5:],
+        lambda data: data + os.urandom(CHUNK_SIZE * 2 + 3),
+        lambda data: data[:CHUNK_SIZE + 1],
+        lambda data: b"",
+    ],
+    ids=["unchanged", "first-chunk", "middle-chunk", "grown", "shrunk", "emptied"],
+)
+def test_update_round_trip(change) -> None:
+    old_data = os.urandom(CHUNK_SIZE * 4 + 20)
+    new_data = change(old_data)
+    updated = update(encrypt(old_data), new_data)
+    assert decrypt(updated) == new_data
+    assert len(updated) == len(encrypt(new_data))
+
+
+def test_update_rewrites_only_changed_records() -> None:
+    old_data = os.urandom(CHUNK_SIZE * 4)
+    old = encrypt(old_data)
+    new_data = old_data[:CHUNK_SIZE * 2] + os.urandom(CHUNK_SIZE) + old_data[CHUNK_SIZE * 3:]
+    new = update(old, new_data)
+
+    def record(container: bytes, index: int) -> bytes:
+        start = HEADER_SIZE + index * RECORD_SIZE
+        return container[start:start + RECORD_SIZE]
+
+    assert [record(old, i) == record(new, i) for i in range(4)] == [True, True, False, True]
+
+
+def test_update_declines_other_chunk_size() -> None:
+    container = encrypt(os.urandom(CHUNK_SIZE * 2))
+    target = io.BytesIO(container)
+    assert not update_container(io.BytesIO(b"new"), target, KEY, CHUNK_SIZE * 2)
+    assert target.getvalue() == container
+
+
+def test_update_rejects_tampered_container() -> None:
+    container = bytearray(encrypt(os.urandom(CHUNK_SIZE * 2)))
+    container[-1] ^= 0x01
+    with pytest.raises(DatabaseError):
+        update_container(io.BytesIO(b"new"), io.BytesIO(container), KEY, CHUNK_SIZE)
+
+
+def _student_names(db_path: Path) -> list[str]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[0] for row in conn.execute("SELECT name FROM student ORDER BY student_id")]
+    finally:
+        conn.close()
+
+
+def _rename_student(db_path: Path, name: str) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE student SET name = ? WHERE student_id = 1", (name,))
+    conn.commit()
+    conn.close()
+
+
+def test_database_round_trip(encrypted_settings: Settings) -> None:
+    db_path = encrypted_settings.database_path
+    encrypted_path = Path(f"{db_path}.enc")
+    names = _student_names(db_path)
+
+    engine.encrypt_database()
+    assert not db_path.exists() and is_container(encrypted_path)
+    engine.decrypt_database()
+    assert _student_names(db_path) == names
+
+    # The second shutdown updates the existing container in place
+    _rename_student(db_path, "Renamed")
+    engine.encrypt_database()
+    engine.decrypt_database()
+    assert _student_names(db_path) == ["Renamed", *names[1:]]
+    assert not Path(f"{encrypted_path}.tmp").exists()
+
+
+def test_valid_container_replaces_leftover_database(encrypted_settings: Settings) -> None:
+    db_path = encrypted_settings.database_path
+    names = _student_names(db_path)
+    engine.encrypt_database()
+    engine.decrypt_database()
+    # A .db left behind next to a good .enc is stale and is replaced
+    _rename_student(db_path, "Stale")
+
+    engine.decrypt_database()
+    assert _student_names(db_path) == names
+
+
+def test_corrupt_container_keeps_database(encrypted_settings: Settings) -> None:
+    db_path = encrypted_settings.database_path
+    encrypted_path = Path(f"{db_path}.enc")
+    engine.encrypt_database()
+    engine.decrypt_database()
+    _rename_student(db_path, "Unsaved")
+    container = bytearray(encrypted_path.read_bytes())
+    container[-1] ^= 0x01
+    encrypted_path.write_bytes(bytes(container))
+
+    engine.decrypt_database()
+    assert _student_names(db_path)[0] == "Unsaved"
+    assert Path(f"{encrypted_path}.corrupt").read_bytes() == bytes(container)
+    # The .db was re-encrypted into a fresh container
+    assert engine._can_decrypt(encrypted_path, "secret")
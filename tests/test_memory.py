@@ -0,0 +1,222 @@
+"""In-memory mode: isolated transactions, concurrent reads and persistence."""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Generator
+
+import pytest
+from sqlalchemy import select
+
+from src.config.settings import Settings
+from src.database import engine, get_session
+from src.models import Student
+from src.repositories import RepositoryFactory
+
+ORIGINAL = "Bernard Wilkinson-Simpson"
+
+
+@pytest.fixture
+def memory_settings(encrypted_settings: Settings) -> Generator[Settings, None, None]:
+    """The test database encrypted and loaded into memory."""
+    engine.encrypt_database()
+    encrypted_settings.in_memory = True
+    engine.decrypt_database()
+    assert not encrypted_settings.database_path.exists()
+    yield encrypted_settings
+    engine.encrypt_database()
+
+
+def _name(student_id: int = 1) -> str:
+    session = get_session()
+    try:
+        return session.get(Student, student_id).name
+    finally:
+        session.close()
+
+
+def _in_thread(function, timeout: float = 5):
+    """Run ``function`` on another thread and return its result."""
+    result: list = []
+    thread = threading.Thread(target=lambda: result.append(function()))
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "blocked"
+    return result[0]
+
+
+def test_read_during_open_write_transaction(memory_settings: Settings) -> None:
+    writer = get_session()
+    writer.get(Student, 1).name = "Uncommitted"
+    writer.flush()
+
+    # Doesn't wait for the writer, and doesn't see its changes
+    assert _in_thread(_name) == ORIGINAL
+    assert writer.get(Student, 1).name == "Uncommitted"
+
+    writer.commit()
+    writer.close()
+    assert _in_thread(_name) == "Uncommitted"
+
+
+def test_reads_see_the_last_commit_during_a_later_transaction(memory_settings: Settings) -> None:
+    with engine.session_scope() as session:
+        session.get(Student, 1).name = "Committed"
+
+    writer = get_session()
+    writer.get(Student, 2).name = "Uncommitted"
+    writer.flush()
+    try:
+        assert _in_thread(_name) == "Committed"
+        assert _in_thread(lambda: _name(2)) == "Amber Perez"
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+def test_factory_reads_during_another_sessions_write(memory_settings: Settings) -> None:
+    writer = RepositoryFactory()
+    writer.get_student_repository().update(1, name="Uncommitted")
+
+    def read() -> list[str]:
+        reader = RepositoryFactory()
+        try:
+            return [s.name for s in reader.get_student_repository().search("wilkinson")]
+        finally:
+            reader.close()
+
+    assert _in_thread(read) == [ORIGINAL]
+    writer.rollback()
+    writer.close()
+
+
+def test_rows_fetched_later_exclude_a_new_transaction(memory_settings: Settings) -> None:
+    reader = get_session()
+    rows = reader.execute(select(Student.student_id, Student.name).order_by(Student.student_id))
+    first = rows.fetchone()
+
+    writer = get_session()
+    writer.get(Student, 2).name = "Uncommitted"
+    writer.flush()
+
+    assert first.name == ORIGINAL
+    assert rows.fetchone().name == "Amber Perez"
+    writer.rollback()
+    writer.close()
+    reader.close()
+
+
+def test_writers_take_turns(memory_settings: Settings) -> None:
+    first = get_session()
+    first.get(Student, 1).name = "First"
+    first.flush()
+
+    started = threading.Event()
+
+    def second_writer() -> str:
+        with engine.session_scope() as session:
+            started.set()
+            session.get(Student, 2).name = "Second"
+        return "done"
+
+    thread_result: list = []
+    thread = threading.Thread(target=lambda: thread_result.append(second_writer()))
+    thread.start()
+    assert started.wait(5)
+    thread.join(0.3)
+    assert thread.is_alive(), "second writer should wait for the first"
+
+    first.commit()
+    first.close()
+    thread.join(5)
+    assert thread_result == ["done"]
+    assert (_name(1), _name(2)) == ("First", "Second")
+
+
+def test_closing_another_session_keeps_the_transaction(memory_settings: Settings) -> None:
+    writer = get_session()
+    writer.get(Student, 1).name = "Kept"
+    writer.flush()
+
+    other = get_session()
+    other.get(Student, 3)
+    other.rollback()
+    other.close()
+
+    writer.commit()
+    writer.close()
+    assert _name() == "Kept"
+
+
+def test_checkpoint_during_transaction_writes_last_commit(memory_settings: Settings) -> None:
+    with engine.session_scope() as session:
+        session.get(Student, 1).name = "Committed"
+    writer = get_session()
+    writer.get(Student, 1).name = "Uncommitted"
+    writer.flush()
+
+    assert engine.checkpoint_database()
+    writer.rollback()
+    writer.close()
+
+    assert _encrypted_name(memory_settings) == "Committed"
+
+
+def test_round_trip_through_encryption(memory_settings: Settings) -> None:
+    with engine.session_scope() as session:
+        session.get(Student, 1).name = "Persisted"
+
+    engine.encrypt_database()
+    assert not memory_settings.database_path.exists()
+    engine.decrypt_database()
+
+    assert _name() == "Persisted"
+
+
+def _encrypted_name(settings: Settings) -> str:
+    """Student 1's name in the encrypted database on disk."""
+    restored = Path(f"{settings.database_path}.restored")
+    with restored.open("wb") as destination:
+        engine._read_encrypted(Path(f"{settings.database_path}.enc"), destination, "secret")
+    conn = sqlite3.connect(restored)
+    try:
+        return conn.execute("SELECT name FROM student WHERE student_id = 1").fetchone()[0]
+    finally:
+        conn.close()
+        restored.unlink()
+
+
+def test_shutdown_during_transaction_saves_last_commit(
+    memory_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(engine, "_SHUTDOWN_LOCK_TIMEOUT", 0.1)
+    with engine.session_scope() as session:
+        session.get(Student, 1).name = "Committed"
+    writer = get_session()
+    writer.get(Student, 1).name = "Uncommitted"
+    writer.flush()
+
+    engine.encrypt_database()
+    # The connection is gone; drop the session without rolling back
+    writer.invalidate()
+
+    assert _encrypted_name(memory_settings) == "Committed"
+    engine.decrypt_database()
+
+
+def test_shutdown_keeps_container_without_committed_copy(
+    memory_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(engine, "_SHUTDOWN_LOCK_TIMEOUT", 0.1)
+    encrypted_path = Path(f"{memory_settings.database_path}.enc")
+    before = encrypted_path.read_bytes()
+    writer = get_session()
+    writer.get(Student, 1).name = "Uncommitted"
+    writer.flush()
+    monkeypatch.setattr(engine._memory_database, "snapshot", lambda: None)
+
+    engine.encrypt_database()
+    writer.invalidate()
+
+    assert encrypted_path.read_bytes() == before
+    engine.decrypt_database()
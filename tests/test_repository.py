@@ -0,0 +1,154 @@
+"""BaseRepository batch lookups, writes and keyset pagination."""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import DatabaseError
+
+from src.exceptions import EntitiesNotFoundError
+from src.models import Student
+from src.repositories import RepositoryFactory
+
+
+def _department_rows(count: int) -> list[dict[str, str]]:
+    return [{"name": f"Department {i}", "faculty": "Testing"} for i in range(count)]
+
+
+def test_bulk_create_returns_ids_in_row_order(factory: RepositoryFactory) -> None:
+    departments = factory.get_department_repository()
+    rows = _department_rows(7)
+
+    ids = departments.bulk_create(rows, chunk_size=3)
+    factory.commit()
+
+    assert len(set(ids)) == 7
+    created = departments.get_many(ids)
+    assert [created[dept_id].name for dept_id in ids] == [row["name"] for row in rows]
+
+
+def test_bulk_create_without_returning(
+    factory: RepositoryFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    departments = factory.get_department_repository()
+    dialect = departments._session.get_bind().dialect
+    monkeypatch.setattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False)
+    rows = _department_rows(4)
+
+    ids = departments.bulk_create(rows)
+    factory.commit()
+
+    created = departments.get_many(ids)
+    assert [created[dept_id].name for dept_id in ids] == [row["name"] for row in rows]
+
+
+@pytest.mark.parametrize(
+    "bad_row",
+    [{"name": "No key"}, {"dept_id": 2}],
+    ids=["missing-primary-key", "no-fields"],
+)
+def test_bulk_update_validates_every_row_first(
+    factory: RepositoryFactory, bad_row: dict[str, object]
+) -> None:
+    departments = factory.get_department_repository()
+
+    with pytest.raises(ValueError):
+        departments.bulk_update([{"dept_id": 1, "name": "Renamed"}, bad_row])
+    factory.commit()
+
+    assert departments.get_by_id(1).name == "Computer Science"
+
+
+def test_bulk_update_counts_matched_rows(factory: RepositoryFactory) -> None:
+    departments = factory.get_department_repository()
+
+    updated = departments.bulk_update(
+        [
+            {"dept_id": 1, "faculty": "A"},
+            {"dept_id": 2, "name": "Renamed", "faculty": "B"},
+            {"dept_id": 999, "faculty": "C"},
+        ],
+        chunk_size=2,
+    )
+    factory.commit()
+
+    assert updated == 2
+    both = departments.get_many([1, 2])
+    assert (both[1].faculty, both[2].name, both[2].faculty) == ("A", "Renamed", "B")
+
+
+def test_get_many_keeps_the_requested_order(factory: RepositoryFactory) -> None:
+    students = factory.get_student_repository()
+    # Student 7 comes from the session, the rest from one query
+    students.get_by_id(7)
+
+    found = students.get_many([12, 3, 7, 3, 1])
+
+    assert list(found) == [12, 3, 7, 1]
+    assert all(found[student_id].student_id == student_id for student_id in found)
+
+
+def test_get_many_skips_or_reports_missing_ids(factory: RepositoryFactory) -> None:
+    students = factory.get_student_repository()
+
+    assert list(students.get_many([998, 2, 999])) == [2]
+    with pytest.raises(EntitiesNotFoundError) as raised:
+        students.get_many([998, 2, 999], strict=True)
+    assert raised.value.entity_ids == [998, 999]
+
+
+def test_get_many_chunks_past_the_bind_parameter_limit(factory: RepositoryFactory) -> None:
+    students = factory.get_student_repository()
+    connection = students._read_session.connection().connection.driver_connection
+    connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 100)
+    entity_ids = list(range(250, 0, -1))
+
+    with pytest.raises(DatabaseError):
+        students._read_session.scalars(
+            select(Student).where(Student.student_id.in_(entity_ids))
+        ).all()
+    found = students.get_many(entity_ids, chunk_size=100)
+
+    assert list(found) == list(range(20, 0, -1))
+
+
+def _page_ids(students, **kwargs) -> list[int]:
+    return [student.student_id for student in students.get_page(**kwargs)]
+
+
+def test_get_page_walks_every_row_once(factory: RepositoryFactory) -> None:
+    students = factory.get_student_repository()
+
+    pages: list[list[int]] = []
+    after_id = None
+    while page := _page_ids(students, after_id=after_id, limit=6):
+        pages.append(page)
+        after_id = page[-1]
+
+    assert [len(page) for page in pages] == [6, 6, 6, 2]
+    assert sum(pages, []) == list(range(1, 21))
+    assert _page_ids(students, after_id=20) == []
+
+
+def test_get_page_breaks_ties_on_the_primary_key(factory: RepositoryFactory) -> None:
+    students = factory.get_student_repository()
+    # Five students per year: a page boundary falls inside each year
+    years = {student.student_id: student.year_of_study for student in students.get_all()}
+    expected = sorted(years, key=lambda student_id: (years[student_id], student_id))
+
+    pages: list[int] = []
+    after_id = None
+    while page := _page_ids(students, after_id=after_id, limit=3, order_by="year_of_study"):
+        pages.extend(page)
+        after_id = page[-1]
+
+    assert pages == expected
+
+
+def test_get_page_rejects_bad_arguments(factory: RepositoryFactory) -> None:
+    students = factory.get_student_repository()
+
+    with pytest.raises(ValueError):
+        students.get_page(limit=0)
+    with pytest.raises(ValueError):
+        students.get_page(order_by="no_such_column")
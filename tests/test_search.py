@@ -0,0 +1,81 @@
+"""Search: the trigram index and the LIKE fallback must agree."""
+
+import pytest
+from sqlalchemy import select
+
+from src.exceptions import ValidationError
+from src.models import LecturerExpertise
+from src.repositories import RepositoryFactory
+
+REPOSITORIES = [
+    "get_student_repository",
+    "get_lecturer_repository",
+    "get_course_repository",
+    "get_department_repository",
+    "get_staff_repository",
+    "get_research_project_repository",
+]
+
+# Short terms, mixed case, punctuation, LIKE wildcards and FTS5 syntax
+TERMS = ["a", "ore", "SON", "simpson", "Wilkinson-S", "cs1", "101", "base", "ysics",
+         "é", "a_e", "n%s", "50%", "a\\b", 'a"b', "AND", "name:x", "*", "zzz"]
+
+
+def _matches(repository, term: str, use_index: bool) -> list[int]:
+    model = repository.model_class
+    stmt = select(model).where(
+        repository._contains(repository.search_columns, term, use_index=use_index)
+    )
+    pk = model.__mapper__.primary_key[0].key
+    return sorted(getattr(entity, pk) for entity in repository._scalars(stmt))
+
+
+@pytest.mark.parametrize("getter", REPOSITORIES)
+def test_trigram_matches_like(factory: RepositoryFactory, getter: str) -> None:
+    repository = getattr(factory, getter)()
+    for term in TERMS:
+        indexed = _matches(repository, term, use_index=True)
+        assert indexed == _matches(repository, term, use_index=False), term
+
+
+def test_expertise_trigram_matches_like(factory: RepositoryFactory) -> None:
+    repository = factory.get_lecturer_repository()
+
+    def matches(term: str, use_index: bool) -> list[int]:
+        condition = repository._contains(
+            ["area"],
+            term,
+            model=LecturerExpertise,
+            trigram_table="lecturer_expertise_trigram",
+            use_index=use_index,
+        )
+        stmt = select(LecturerExpertise).where(condition)
+        return sorted(e.expertise_id for e in repository._read_session.scalars(stmt))
+
+    for term in ["learn", "DATA", "ai", "a_b", "zzz"]:
+        assert matches(term, True) == matches(term, False), term
+
+
+def test_substring_search_without_index(
+    factory: RepositoryFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repository = factory.get_student_repository()
+    indexed = repository.search("son", limit=None, mode="substring")
+    monkeypatch.setattr(type(repository), "trigram_table", None)
+    assert repository.search("son", limit=None, mode="substring") == indexed
+    assert indexed
+
+
+def test_prefix_search_without_index(
+    factory: RepositoryFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repository = factory.get_course_repository()
+    assert [c.name for c in repository.search("lin alg")] == ["Linear Algebra"]
+    monkeypatch.setattr(type(repository), "fts_table", None)
+    # Without FTS the whole term must appear in a column
+    assert [c.name for c in repository.search("linear alg")] == ["Linear Algebra"]
+
+
+def test_search_rejects_unknown_mode(factory: RepositoryFactory) -> None:
+    with pytest.raises(ValidationError):
+        factory.get_student_repository().search("son", mode="fuzzy")